@@ -12,11 +12,43 @@ app_dir = os.path.dirname(os.path.abspath(__file__))
 if app_dir not in sys.path:
     sys.path.insert(0, app_dir)
 
-from flask import Flask, render_template, request, session, redirect, url_for, Response, flash
+from flask import Flask, render_template, request, session, redirect, url_for, Response, flash, stream_with_context, abort, send_from_directory, make_response
+import asyncio
+import io
+import contextvars
+import functools
 import json
+import sqlite3
+import subprocess
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+import click
+from werkzeug.wsgi import wrap_file
 
 from config import Config
-from utils import extract_text_from_file, ClaudeClient, markdown_to_html, prepare_download, markdown_to_docx
+from utils import extract_text_from_file, ClaudeClient, CircuitOpenError, markdown_to_html, prepare_download, markdown_to_docx_bytes
+from utils.cache import LRUCache, artifact_hash
+from utils.store import get_store
+from utils.skill_matcher import match_skills
+from utils.similarity import get_similarity_index, save_similarity_index, placement_text, placement_group
+from utils.bulk_export import (
+    stream_bulk_export, write_bulk_export, normalize_formats, validate_export_entry, get_export_executor
+)
+from utils.template_cache import configure_template_caching, precompile_templates
+from utils.assets import build_assets, get_asset_manifest, negotiate_encoding
+from utils.compression import configure_compression
+from utils.curriculum_assembler import get_curriculum_assembler
+from utils.week_details import get_week_detail_cache, week_detail_key
+from utils.json_patch import JsonPatchError, apply_patch, validate_artifact, VALIDATORS
+from utils.metrics import get_metrics
+from utils.single_flight import fresh_calls, get_single_flight
+from utils.hedging import get_hedge_policy
+from utils.circuit_breaker import get_circuit_breaker
+from utils.budget import BudgetExceededError, current_account, get_budget
+from utils.scheduler import get_scheduler, current_tenant, current_priority, PRIORITIES
+from utils.progress import get_progress_broker, progress_scope, publish, valid_token, current_token
 from prompts import (
     build_resume_extraction_prompt,
     build_project_extraction_prompt,
@@ -30,10 +62,39 @@ app = Flask(__name__,
             static_folder=os.path.join(app_dir, 'static'))
 app.config.from_object(Config)
 app.config['MAX_CONTENT_LENGTH'] = Config.MAX_CONTENT_LENGTH
+configure_template_caching(app)
+configure_compression(app)
+assets = get_asset_manifest(app.static_folder)
+
+
+@app.template_global()
+def asset_url(filename: str) -> str:
+    """URL of a static file's fingerprinted build, or its plain static URL if unbuilt."""
+    built = assets.built_path(filename, check_sources=app.debug)
+    if built is None:
+        return url_for('static', filename=filename)
+    return url_for('fingerprinted_asset', filename=built)
+
+
+# Rendered inside the result page's fragment cache, so a cache hit skips it
+app.add_template_filter(markdown_to_html, 'markdown')
 
 # Initialize Claude client
 claude_client = None
 
+# Blocking Claude calls made from async views run here, so an ASGI server
+# can keep many generation requests waiting on the API at once
+llm_executor = ThreadPoolExecutor(max_workers=Config.LLM_MAX_CONCURRENCY,
+                                  thread_name_prefix='llm')
+
+# Week details are written in the background, WEEK_DETAIL_CONCURRENCY at a time;
+# each worker waits on an llm_executor thread for the Claude call itself
+week_executor = ThreadPoolExecutor(max_workers=Config.WEEK_DETAIL_CONCURRENCY,
+                                   thread_name_prefix='weeks')
+
+# Bulk export workers are shared by all requests; processes start on first use
+export_executor = get_export_executor()
+
 
 def get_claude_client():
     """Get or initialize Claude client."""
@@ -44,6 +105,65 @@ def get_claude_client():
     return claude_client
 
 
+def request_tenant() -> str:
+    """Institution the current request's Claude calls are charged to."""
+    if request.form.get('institution_name'):
+        return request.form['institution_name']
+    data = session.get('confirmed_data') or session.get('raw_inputs') or {}
+    return data.get('institution', {}).get('institution_name', '')
+
+
+@app.before_request
+def assign_scheduling_class():
+    """Tag this request's Claude calls with its institution and priority class."""
+    priority = request.headers.get('X-Request-Priority', '').lower()
+    current_priority.set(priority if priority in PRIORITIES else 'interactive')
+    current_tenant.set(request_tenant())
+    # Regenerate handlers opt out of coalescing per request (see fresh_calls)
+    fresh_calls.set(False)
+
+
+def request_user() -> str:
+    """User named by the authenticating proxy, or '' for anonymous requests."""
+    return request.remote_user or request.headers.get(Config.BUDGET_USER_HEADER, '')
+
+
+def request_owner() -> str:
+    """Owner of the stored projects this request may see: its user, or else its session."""
+    user = request_user()
+    if user:
+        return f"user:{user}"
+    return f"session:{session.setdefault('session_id', uuid.uuid4().hex)}"
+
+
+@app.before_request
+def assign_budget_account():
+    """Charge this request's Claude calls to its session, user and institution."""
+    if request.endpoint in ('static', 'fingerprinted_asset'):
+        return
+    current_account.set({
+        'session_id': session.setdefault('session_id', uuid.uuid4().hex),
+        'user': request_user(),
+        'institution': current_tenant.get(),
+    })
+
+
+async def run_llm(func, *args, **kwargs):
+    """
+    Await a blocking Claude client call without holding the event loop.
+
+    Args:
+        func: ClaudeClient method (or any blocking callable)
+        *args, **kwargs: Arguments for func
+
+    Returns:
+        The callable's return value
+    """
+    loop = asyncio.get_running_loop()
+    call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+    return await loop.run_in_executor(llm_executor, call)
+
+
 def safe_json_loads(value: str, default=None):
     """Safely parse JSON, returning default on failure."""
     if default is None:
@@ -56,6 +176,411 @@ def safe_json_loads(value: str, default=None):
         return default
 
 
+def store_artifact(name: str, value):
+    """Store a pipeline artifact in the session and record its content hash."""
+    session[name] = value
+    hashes = dict(session.get('artifact_hashes', {}))
+    hashes[name] = artifact_hash(value) if value is not None else None
+    session['artifact_hashes'] = hashes
+    session.modified = True
+    persist_artifact(name, value)
+
+
+def persist_artifact(name: str, value):
+    """Save an artifact to the persistent store under the session's project."""
+    store = get_store()
+    project_id = session.get('project_id')
+    if store is None or project_id is None or value is None:
+        return
+    try:
+        store.save_artifact(project_id, name, value)
+    except sqlite3.Error as e:
+        # The store is an optimization; never fail the request over it
+        print(f"Curriculum store write failed for {name}: {e}")
+
+
+# Final curricula by content hash; the cookie session only carries the hash
+curricula = LRUCache(Config.CURRICULUM_CACHE_SIZE)
+
+
+def save_curriculum(markdown_text: str):
+    """Keep the finalized curriculum server-side and reference it from the session by hash."""
+    curriculum_id = artifact_hash(markdown_text)
+    curricula.set(curriculum_id, markdown_text)
+    # Sessions from before the curriculum moved out of the cookie
+    session.pop('curriculum', None)
+    session['curriculum_id'] = curriculum_id
+    hashes = dict(session.get('artifact_hashes', {}))
+    hashes['curriculum'] = curriculum_id
+    session['artifact_hashes'] = hashes
+    persist_artifact('curriculum', markdown_text)
+
+
+def session_curriculum():
+    """
+    Return the session's finalized curriculum Markdown.
+
+    It is looked up by the hash in the session, first in this process's
+    cache and then under the session's project in the curriculum store
+    (another worker, or a restart).
+
+    Returns:
+        The curriculum, or None if none was built or it is no longer available
+    """
+    curriculum_id = session.get('curriculum_id')
+    if not curriculum_id:
+        return None
+    markdown_text = curricula.get(curriculum_id)
+    if markdown_text is None:
+        markdown_text = project_artifact('curriculum', curriculum_id)
+        if markdown_text is not None:
+            curricula.set(curriculum_id, markdown_text)
+    return markdown_text
+
+
+def project_artifact(name: str, artifact_id: str):
+    """Return the session project's stored artifact of a kind, if its hash is artifact_id."""
+    store = get_store()
+    project_id = session.get('project_id')
+    if not artifact_id or store is None or project_id is None:
+        return None
+    try:
+        value = store.get_artifact(project_id, name)
+    except sqlite3.Error as e:
+        print(f"Curriculum store lookup failed for {name}: {e}")
+        return None
+    if value is None or artifact_hash(value) != artifact_id:
+        return None
+    return value
+
+
+# Bulky artifacts (raw inputs hold the full resume text) that a forked
+# project leaves in the store; the session keeps only their hash
+STORE_ONLY_ARTIFACTS = ('raw_inputs', 'learner_extraction', 'project_extraction', 'gap_analysis')
+
+
+def reference_artifact(name: str, value):
+    """Record an artifact's hash in the session without copying it there (see session_artifact)."""
+    session.pop(name, None)
+    hashes = dict(session.get('artifact_hashes', {}))
+    hashes[name] = artifact_hash(value)
+    session['artifact_hashes'] = hashes
+
+
+def session_artifact(name: str):
+    """Return a session artifact, loading it from the store if the session only references it."""
+    value = session.get(name)
+    if value is None:
+        value = project_artifact(name, artifact_hashes().get(name))
+    return value
+
+
+def start_stored_project():
+    """Begin a new persistent project for this session."""
+    store = get_store()
+    session['project_id'] = None
+    session.pop('week_feedback', None)
+    if store is None:
+        return
+    try:
+        session['project_id'] = store.create_project(owner=request_owner())
+    except sqlite3.Error as e:
+        print(f"Curriculum store unavailable: {e}")
+
+
+def artifact_hashes() -> dict:
+    """Return content hashes for the artifacts currently in the session."""
+    return session.get('artifact_hashes', {})
+
+
+# Form fields older pages used to post artifacts back as inline JSON
+LEGACY_ARTIFACT_FIELDS = {
+    'objectives': 'objectives_data',
+    'assessment_strategy': 'assessment_data',
+    'outline': 'outline_data',
+}
+
+
+def resolve_artifact(name: str, artifact_id: str):
+    """
+    Return the artifact a client refers to by ID (its content hash).
+
+    The session copy is used when its hash matches, so no JSON is parsed;
+    otherwise the curriculum store is searched, which covers requests
+    served by a worker that has not seen this session's latest state.
+
+    Args:
+        name: Artifact kind (e.g. 'objectives')
+        artifact_id: Content hash handed out with the artifact
+
+    Returns:
+        The artifact, or None if the ID is unknown
+    """
+    if not artifact_id:
+        return None
+    if artifact_hashes().get(name) == artifact_id:
+        return session.get(name)
+    store = get_store()
+    if store is None:
+        return None
+    try:
+        return store.find_artifact(name, artifact_id)
+    except sqlite3.Error as e:
+        print(f"Curriculum store lookup failed for {name}: {e}")
+        return None
+
+
+def requested_artifact(name: str, fields: dict):
+    """
+    Resolve an artifact a request sends as ``<name>_id``, inline, or in a legacy field.
+
+    An artifact that differs from the session copy is saved to the session.
+
+    Args:
+        name: Artifact kind
+        fields: Request form or JSON body
+
+    Returns:
+        Tuple of (artifact or None, whether an ID was sent but could not be resolved)
+    """
+    artifact_id = fields.get(f'{name}_id')
+    value = resolve_artifact(name, artifact_id)
+    if value is None:
+        value = fields.get(name)
+        legacy = fields.get(LEGACY_ARTIFACT_FIELDS.get(name, ''))
+        if value is None and legacy:
+            value = safe_json_loads(legacy, {}) or None
+    if value is None:
+        return None, bool(artifact_id)
+    if artifact_hashes().get(name) != (artifact_id or artifact_hash(value)):
+        store_artifact(name, value)
+    return value, False
+
+
+def form_artifact(name: str):
+    """
+    Resolve an artifact a page form refers to.
+
+    Forms send the ID plus the artifact inline in its older ``*_data`` field,
+    which is only parsed when the ID cannot be resolved (another worker, a
+    restarted instance, a per-instance store). The session copy is the last
+    resort.
+
+    Args:
+        name: Artifact kind
+
+    Returns:
+        The artifact, or None if none is available
+    """
+    value, unresolved = requested_artifact(name, request.form)
+    if value is None and unresolved:
+        print(f"Could not resolve {name}_id and no inline copy was sent; using the session copy")
+    return value if value is not None else session.get(name)
+
+
+def record_artifact_change(name: str, base_id: str, artifact_id: str, paths: list):
+    """Append an edit to the session's change log for an artifact."""
+    changes = dict(session.get('artifact_changes', {}))
+    log = list(changes.get(name, []))
+    log.append({'from': base_id, 'to': artifact_id, 'paths': paths})
+    changes[name] = log[-Config.ARTIFACT_CHANGE_LOG_SIZE:]
+    session['artifact_changes'] = changes
+
+
+def artifact_changes_since(name: str, artifact_id: str):
+    """
+    Return the JSON pointers edited since an artifact version.
+
+    Args:
+        name: Artifact kind
+        artifact_id: Version the caller last saw
+
+    Returns:
+        Sorted list of changed pointers ([] if current), or None when the
+        version is not in the log and everything must be treated as changed
+    """
+    if artifact_hashes().get(name) == artifact_id:
+        return []
+    log = session.get('artifact_changes', {}).get(name, [])
+    for start, entry in enumerate(log):
+        if entry['from'] == artifact_id:
+            # Only a contiguous run of edits up to the current version is usable
+            if log[-1]['to'] != artifact_hashes().get(name):
+                return None
+            return sorted({path for change in log[start:] for path in change['paths']})
+    return None
+
+
+def missing_artifacts_response(names: list):
+    """409 asking the client to resend artifacts whose IDs this server cannot resolve."""
+    return json.dumps({'error': 'Unknown artifact IDs', 'missing_artifacts': names}), 409
+
+
+_page_version = None
+
+
+def page_version() -> str:
+    """Hash of the deployed templates and static assets, for page ETags."""
+    global _page_version
+    if _page_version is None:
+        files = []
+        for folder in (app.template_folder, app.static_folder):
+            for root, _dirs, names in os.walk(folder):
+                for name in names:
+                    stat = os.stat(os.path.join(root, name))
+                    files.append((os.path.relpath(os.path.join(root, name), app_dir), stat.st_mtime, stat.st_size))
+        _page_version = artifact_hash(sorted(files))
+    return _page_version
+
+
+def render_conditional(template: str, artifacts: tuple, build_context):
+    """
+    Render a page whose content depends only on session artifacts, with an ETag.
+
+    The ETag combines the artifacts' content hashes with the deployed
+    templates, so a revisit with unchanged artifacts gets a 304 without
+    rendering. Pages showing flashed messages are not tagged.
+
+    Args:
+        template: Template name
+        artifacts: Names of the session artifacts the page displays
+        build_context: Callable returning the template context (only called when rendering)
+
+    Returns:
+        Flask response
+    """
+    hashes = artifact_hashes()
+    etag = None
+    if Config.PAGE_ETAGS_ENABLED and not app.debug and not session.get('_flashes'):
+        etag = artifact_hash([page_version(), request.path, [hashes.get(name) for name in artifacts]])
+        # Compressed responses carry the weak form of the tag
+        if request.method == 'GET' and request.if_none_match.contains_weak(etag):
+            response = make_response('', 304)
+            response.set_etag(etag)
+            return response
+
+    response = make_response(render_template(template, hashes=hashes, **build_context()))
+    if etag:
+        response.set_etag(etag)
+        # Revalidate on every visit; the 304 keeps that cheap
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+    return response
+
+
+def find_similar_project(confirmed_data: dict, required_kinds: tuple, threshold: float = None):
+    """
+    Find a stored placement close enough to reuse its generated artifacts.
+
+    Only placements of the same owner (see request_owner) with the same
+    institution settings (term length, credit hours, grading scale, fixed
+    objectives, ...) are candidates.
+
+    Args:
+        confirmed_data: Confirmed data for the current session
+        required_kinds: Artifact kinds the neighbor must have
+        threshold: Minimum similarity (defaults to Config.SIMILARITY_REUSE_THRESHOLD)
+
+    Returns:
+        Tuple of (project_id, similarity, artifacts) or None
+    """
+    store = get_store()
+    if not Config.SIMILARITY_REUSE_ENABLED or store is None:
+        return None
+
+    index = get_similarity_index(store)
+    text = placement_text(confirmed_data, session_artifact('project_extraction'))
+    owner = request_owner()
+    group = placement_group(confirmed_data, owner)
+    for project_id, score in index.query(text, k=3, exclude=session.get('project_id'), group=group):
+        if score < (threshold or Config.SIMILARITY_REUSE_THRESHOLD):
+            break
+        # Never seed one owner's generation from another owner's project
+        artifacts = store.get_artifacts(project_id, owner=owner) or {}
+        # The stored settings may have changed since the project was indexed
+        if placement_group(artifacts.get('confirmed_data') or {}, owner) != group:
+            continue
+        if all(artifacts.get(kind) for kind in required_kinds):
+            return project_id, score, artifacts
+    return None
+
+
+# Objectives prefetch futures by session and confirmed data, taken by the page's request
+objectives_prefetches = LRUCache(Config.PREFETCH_CACHE_SIZE)
+
+
+def prefetch_key(confirmed_data: dict) -> str:
+    """Key of this session's objectives prefetch for the given confirmed data."""
+    return f"{session.get('session_id', '')}:{artifact_hash(confirmed_data)}"
+
+
+def prefetch_objectives(confirmed_data: dict):
+    """
+    Start objectives generation while the browser loads the objectives page.
+
+    The future is kept under prefetch_key, and the page's request awaits it,
+    whether it is still running or already finished, instead of generating
+    again. The prefetch runs on a background thread of this process, so it
+    only helps when the page's request reaches the same process, and it does
+    not survive on serverless hosts that stop the instance after responding.
+    """
+    if not Config.PREFETCH_OBJECTIVES:
+        return
+    if find_similar_project(confirmed_data, ('objectives', 'assessment_strategy')):
+        return
+    try:
+        client = get_claude_client()
+    except ValueError:
+        return
+
+    # Match the key order the page's request will see after the session round trip
+    normalized = json.loads(json.dumps(confirmed_data, sort_keys=True))
+    # A fresh context keeps the prefetch off this request's progress stream;
+    # it stays interactive because the page's request will join it
+    context = contextvars.Context()
+    context.run(current_tenant.set, current_tenant.get())
+    context.run(current_account.set, current_account.get())
+    future = llm_executor.submit(context.run, client.generate_objectives_and_assessment, normalized)
+    future.add_done_callback(
+        lambda f: f.exception() and print(f"Objectives prefetch failed: {f.exception()}")
+    )
+    objectives_prefetches.set(prefetch_key(normalized), future)
+
+
+async def prefetched_objectives(confirmed_data: dict):
+    """Await and consume this session's objectives prefetch; None if there is none or it failed."""
+    future = objectives_prefetches.pop(prefetch_key(confirmed_data))
+    if future is None:
+        return None
+    try:
+        return await asyncio.wrap_future(future)
+    except Exception:
+        # Already reported by the prefetch; generate normally instead
+        return None
+
+
+def unavailable_response(error: CircuitOpenError):
+    """Build the JSON response for an API call rejected by the circuit breaker or a token budget."""
+    if isinstance(error, BudgetExceededError):
+        message, status = str(error), 429
+    else:
+        message, status = 'Claude is temporarily unavailable. Please try again shortly.', 503
+    return json.dumps({
+        'error': message,
+        'retry_after': round(error.retry_after, 1)
+    }), status, {'Retry-After': str(int(error.retry_after) + 1)}
+
+
+def index_current_project(confirmed_data: dict):
+    """Add the session's project to the similarity index once it has objectives."""
+    store = get_store()
+    project_id = session.get('project_id')
+    if not Config.SIMILARITY_REUSE_ENABLED or store is None or project_id is None:
+        return
+    text = placement_text(confirmed_data, session_artifact('project_extraction'))
+    get_similarity_index(store).add(project_id, text, placement_group(confirmed_data, request_owner()))
+
+
 def merge_user_project_inputs(ai_extraction: dict, user_inputs: dict) -> dict:
     """
     Merge user-provided optional fields with AI extraction results.
@@ -91,8 +616,15 @@ def intake_form():
 
 
 @app.route('/extract', methods=['POST'])
-def extract_and_confirm():
+async def extract_and_confirm():
     """Step 1 → Step 2: Process inputs and show confirmation."""
+    # Stage events are streamed to the browser on /api/progress/<token>
+    with progress_scope(request.form.get('progress_token')):
+        return await run_extraction()
+
+
+async def run_extraction():
+    """Run extraction and gap analysis for /extract."""
     try:
         # Handle resume - file upload or text paste
         resume_text = ''
@@ -165,27 +697,39 @@ def extract_and_confirm():
         # Get Claude client and call extraction APIs
         client = get_claude_client()
 
-        learner_extraction = client.extract_from_resume(raw_inputs['learner'])
-        project_extraction = client.extract_from_narrative(raw_inputs['project'])
+        # The two extractions are independent, so run them concurrently
+        learner_extraction, project_extraction = await asyncio.gather(
+            run_llm(client.extract_from_resume, raw_inputs['learner']),
+            run_llm(client.extract_from_narrative, raw_inputs['project'])
+        )
 
         # Merge user-provided optional fields with AI extraction
         project_extraction = merge_user_project_inputs(project_extraction, raw_inputs['project'])
 
-        gap_analysis = client.analyze_gaps(learner_extraction, project_extraction)
+        gap_analysis = await run_llm(client.analyze_gaps, learner_extraction, project_extraction)
+        publish('done', next='confirm')
 
-        # Store in session
-        session['raw_inputs'] = raw_inputs
-        session['learner_extraction'] = learner_extraction
-        session['project_extraction'] = project_extraction
-        session['gap_analysis'] = gap_analysis
+        # Store in session and persist under a new project
+        start_stored_project()
+        store_artifact('raw_inputs', raw_inputs)
+        store_artifact('learner_extraction', learner_extraction)
+        store_artifact('project_extraction', project_extraction)
+        store_artifact('gap_analysis', gap_analysis)
 
         return render_template('confirm.html',
             raw=raw_inputs,
             learner=learner_extraction,
             project=project_extraction,
-            gaps=gap_analysis
+            gaps=gap_analysis,
+            hashes=artifact_hashes()
         )
 
+    except BudgetExceededError as e:
+        flash(str(e), 'error')
+        return redirect(url_for('intake_form'))
+    except CircuitOpenError as e:
+        flash(f'Claude is temporarily unavailable. Please try again in {int(e.retry_after) + 1} seconds.', 'error')
+        return redirect(url_for('intake_form'))
     except ValueError as e:
         flash(f'Configuration error: {str(e)}', 'error')
         return redirect(url_for('intake_form'))
@@ -230,7 +774,7 @@ def generate_curriculum():
                 'overall_fit': request.form.get('overall_fit', 'good')
             },
             'institution': {
-                **session.get('raw_inputs', {}).get('institution', {
+                **(session_artifact('raw_inputs') or {}).get('institution', {
                     'credit_hours': '3',
                     'term_length_weeks': '14',
                     'hours_per_week': '9',
@@ -247,11 +791,11 @@ def generate_curriculum():
         }
 
         # Store confirmed data
-        session['confirmed_data'] = confirmed_data
-        session['objectives'] = None
-        session['assessment_strategy'] = None
-        session['outline'] = None
-        session.modified = True
+        store_artifact('confirmed_data', confirmed_data)
+        store_artifact('objectives', None)
+        store_artifact('assessment_strategy', None)
+        store_artifact('outline', None)
+        prefetch_objectives(confirmed_data)
 
         # Redirect to objectives page
         return redirect(url_for('objectives_page'))
@@ -264,25 +808,28 @@ def generate_curriculum():
 @app.route('/download', methods=['GET'])
 def download_curriculum():
     """Download generated curriculum as markdown file."""
-    curriculum = session.get('curriculum', '')
+    curriculum = session_curriculum()
     if not curriculum:
         flash('No curriculum to download. Please generate one first.', 'error')
         return redirect(url_for('intake_form'))
 
     data = session.get('confirmed_data', {})
     filename = prepare_download(data)
+    body = curriculum.encode('utf-8')
 
-    return Response(
-        curriculum,
+    response = Response(
+        body,
         mimetype='text/markdown',
         headers={'Content-Disposition': f'attachment;filename={filename}'}
     )
+    response.set_etag(f"{artifact_hash(curriculum)}-md")
+    return response.make_conditional(request, accept_ranges=True, complete_length=len(body))
 
 
 @app.route('/download/word', methods=['GET'])
 def download_word():
     """Download generated curriculum as Word document."""
-    curriculum = session.get('curriculum', '')
+    curriculum = session_curriculum()
     if not curriculum:
         flash('No curriculum to download. Please generate one first.', 'error')
         return redirect(url_for('intake_form'))
@@ -292,23 +839,79 @@ def download_word():
     # Change extension from .md to .docx
     filename = base_filename.replace('.md', '.docx')
 
-    # Convert markdown to Word document
-    docx_buffer = markdown_to_docx(curriculum)
+    # Convert markdown to Word document (cached per curriculum hash)
+    docx_bytes = markdown_to_docx_bytes(curriculum)
 
-    return Response(
-        docx_buffer.getvalue(),
+    response = Response(
+        wrap_file(request.environ, io.BytesIO(docx_bytes)),
         mimetype='application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-        headers={'Content-Disposition': f'attachment;filename={filename}'}
+        headers={
+            'Content-Disposition': f'attachment;filename={filename}',
+            'Content-Length': str(len(docx_bytes))
+        },
+        direct_passthrough=True
+    )
+    response.set_etag(f"{artifact_hash(curriculum)}-docx")
+    return response.make_conditional(request, accept_ranges=True, complete_length=len(docx_bytes))
+
+
+def load_stored_curricula(project_ids, owner: str = None) -> list:
+    """Load final curricula for bulk export from the persistent store (only the owner's, if given)."""
+    store = get_store()
+    curricula = []
+    for project_id in project_ids:
+        owned = store is not None and store.get_project(project_id, owner=owner) is not None
+        markdown_text = store.get_artifact(project_id, 'curriculum') if owned else None
+        if markdown_text is None:
+            raise KeyError(project_id)
+        curricula.append({
+            'markdown': markdown_text,
+            'confirmed_data': store.get_artifact(project_id, 'confirmed_data', {})
+        })
+    return curricula
+
+
+@app.route('/download/bulk', methods=['POST'])
+def download_bulk():
+    """Download many curricula as a streamed ZIP of Markdown, Word and HTML files."""
+    request_data = request.get_json(silent=True) or {}
+    curricula = request_data.get('curricula') or []
+    project_ids = request_data.get('project_ids') or []
+    if not isinstance(curricula, list) or not isinstance(project_ids, list):
+        return json.dumps({'error': 'curricula and project_ids must be lists'}), 400
+
+    if project_ids:
+        try:
+            curricula = curricula + load_stored_curricula(project_ids, owner=request_owner())
+        except KeyError as e:
+            return json.dumps({'error': f'No stored curriculum for project {e.args[0]}'}), 404
+
+    if not curricula:
+        return json.dumps({'error': 'No curricula provided'}), 400
+    if len(curricula) > Config.BULK_EXPORT_MAX_CURRICULA:
+        return json.dumps({'error': f'At most {Config.BULK_EXPORT_MAX_CURRICULA} curricula per export'}), 400
+
+    try:
+        for curriculum in curricula:
+            validate_export_entry(curriculum)
+        formats = normalize_formats(request_data.get('formats'))
+    except ValueError as e:
+        return json.dumps({'error': str(e)}), 400
+
+    return Response(
+        stream_bulk_export(curricula, formats),
+        mimetype='application/zip',
+        headers={'Content-Disposition': 'attachment;filename=curricula_export.zip'}
     )
 
 
 @app.route('/back-to-confirm', methods=['GET'])
 def back_to_confirm():
     """Return to confirmation page with preserved data."""
-    raw = session.get('raw_inputs')
-    learner = session.get('learner_extraction')
-    project = session.get('project_extraction')
-    gaps = session.get('gap_analysis')
+    raw = session_artifact('raw_inputs')
+    learner = session_artifact('learner_extraction')
+    project = session_artifact('project_extraction')
+    gaps = session_artifact('gap_analysis')
 
     if not all([raw, learner, project, gaps]):
         flash('Session expired. Please start over.', 'error')
@@ -318,10 +921,277 @@ def back_to_confirm():
         raw=raw,
         learner=learner,
         project=project,
-        gaps=gaps
+        gaps=gaps,
+        hashes=artifact_hashes()
     )
 
 
+@app.route('/api/skills/preview', methods=['POST'])
+def api_skills_preview():
+    """API: Instant local skill-match preview for the confirmation page."""
+    request_data = request.get_json(silent=True) or {}
+    result = match_skills(
+        request_data.get('learner_skills') or [],
+        request_data.get('project_skills') or []
+    )
+    return json.dumps({'status': 'success', **result})
+
+
+@app.route('/api/warmup', methods=['GET', 'POST'])
+def api_warmup():
+    """API: Import the Claude client and open its connection pool ahead of traffic."""
+    start = time.perf_counter()
+    try:
+        client = get_claude_client()
+    except ValueError as e:
+        return json.dumps({'status': 'error', 'message': str(e)}), 500
+    import_ms = round((time.perf_counter() - start) * 1000, 1)
+    return json.dumps({'status': 'success', 'client_init_ms': import_ms, **client.warm_up()})
+
+
+@app.route('/api/progress/<token>', methods=['GET'])
+def api_progress(token):
+    """API: Server-sent stream of pipeline stage events for a client token."""
+    if not valid_token(token):
+        return json.dumps({'error': 'Invalid progress token'}), 400
+
+    last_id = request.headers.get('Last-Event-ID', '0')
+    last_id = int(last_id) if last_id.isdigit() else 0
+
+    def events():
+        yield 'retry: 2000\n\n'
+        for event in get_progress_broker().subscribe(token, last_id):
+            if event is None:
+                yield ': keep-alive\n\n'
+            else:
+                yield f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+        # Tell the browser not to reconnect
+        yield 'event: end\ndata: {}\n\n'
+
+    return Response(stream_with_context(events()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+
+@app.route('/assets/<path:filename>', methods=['GET'])
+def fingerprinted_asset(filename):
+    """Serve a fingerprinted static file, precompressed when the client allows."""
+    entry = assets.entry_for_path(filename)
+    if entry is None:
+        abort(404)
+
+    encoding, suffix = negotiate_encoding(entry, request.accept_encodings)
+    response = send_from_directory(
+        assets.out_dir, filename + suffix,
+        mimetype=entry['mimetype'],
+        etag=f"{entry['digest'][:16]}-{encoding or 'identity'}",
+        max_age=Config.ASSET_MAX_AGE
+    )
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    # The URL changes whenever the content does
+    response.cache_control.immutable = True
+    response.cache_control.public = True
+    return response
+
+
+@app.route('/health', methods=['GET'])
+def health():
+    """Health check including the Claude circuit breaker state."""
+    breaker = get_circuit_breaker()
+    upstream = breaker.status() if breaker else {'state': 'disabled'}
+    return json.dumps({
+        'status': 'degraded' if upstream['state'] != 'closed' and breaker else 'ok',
+        'upstream': upstream
+    })
+
+
+@app.route('/api/metrics', methods=['GET'])
+def api_metrics():
+    """API: Per-stage model routing outcomes and latency for this process."""
+    single_flight = get_single_flight()
+    return json.dumps({
+        'status': 'success',
+        **get_metrics().snapshot(),
+        'single_flight': {'calls': single_flight.calls, 'coalesced': single_flight.coalesced},
+        'hedging': get_hedge_policy().stats(),
+        'scheduler': get_scheduler().snapshot() if get_scheduler() else None
+    })
+
+
+@app.route('/api/usage', methods=['GET'])
+def api_usage():
+    """
+    API: Token usage and remaining budget.
+
+    Query: scope=session|user|institution|all (default session), group_by=stage,model,...
+    and hours (default: the budget window).
+    """
+    budget = get_budget()
+    if budget is None:
+        return json.dumps({'error': 'Token budgets are disabled'}), 404
+    account = current_account.get()
+    scope = request.args.get('scope', 'session')
+    column = {'session': 'session_id', 'user': 'user', 'institution': 'institution'}.get(scope)
+    if column is None and scope != 'all':
+        return json.dumps({'error': f'Unknown scope: {scope}'}), 400
+    filters = {column: account.get(column, '')} if column else {}
+    hours = request.args.get('hours', type=float)
+    since = time.time() - (hours * 3600 if hours else Config.BUDGET_WINDOW_SECONDS)
+    group_by = tuple(c for c in request.args.get('group_by', 'stage,model').split(',') if c)
+
+    return json.dumps({
+        'status': 'success',
+        'scope': scope,
+        'usage': budget.ledger.token_usage(since=since, group_by=group_by, **filters),
+        'budgets': budget.usage()
+    })
+
+
+@app.route('/api/artifacts/<name>', methods=['PATCH'])
+def api_patch_artifact(name):
+    """
+    API: Apply a JSON Patch (RFC 6902) to the session's objectives, assessment or outline.
+
+    Body: {"base_id": "<artifact id the edit was made against>", "patch": [operations]}
+    """
+    if name not in VALIDATORS:
+        return json.dumps({'error': f"Artifact '{name}' cannot be edited"}), 404
+    current = session.get(name)
+    if current is None:
+        return json.dumps({'error': f'No {name} in session'}), 404
+
+    body = request.get_json(silent=True) or {}
+    current_id = artifact_hashes().get(name)
+    base_id = body.get('base_id')
+    if base_id and base_id != current_id:
+        # Edited against an older version; the client must rebase
+        return json.dumps({'error': 'Artifact has changed', 'artifact_id': current_id}), 409
+
+    try:
+        patched, changed = apply_patch(current, body.get('patch'))
+        validate_artifact(name, patched)
+    except JsonPatchError as e:
+        return json.dumps({'error': str(e)}), 422
+
+    store_artifact(name, patched)
+    artifact_id = artifact_hashes()[name]
+    if artifact_id != current_id:
+        record_artifact_change(name, current_id, artifact_id, changed)
+
+    return json.dumps({'status': 'success', 'artifact_id': artifact_id, 'changed': changed})
+
+
+@app.route('/api/artifacts/<name>/changes', methods=['GET'])
+def api_artifact_changes(name):
+    """API: JSON pointers edited since the artifact version given as ?since=<artifact id>."""
+    changed = artifact_changes_since(name, request.args.get('since', ''))
+    return json.dumps({
+        'artifact_id': artifact_hashes().get(name),
+        'changed': changed,
+        'complete': changed is not None
+    })
+
+
+# --- Curriculum Store Routes ---
+
+# Uploaded source text kept in stored artifacts but never sent back by the API
+PRIVATE_ARTIFACT_FIELDS = {
+    'raw_inputs': (('learner', 'resume_text'), ('project', 'project_narrative')),
+}
+
+
+def public_artifacts(artifacts: dict) -> dict:
+    """Return stored artifacts without the raw résumé and project text."""
+    artifacts = dict(artifacts)
+    for kind, fields in PRIVATE_ARTIFACT_FIELDS.items():
+        if not isinstance(artifacts.get(kind), dict):
+            continue
+        value = {key: dict(section) if isinstance(section, dict) else section
+                 for key, section in artifacts[kind].items()}
+        for section, field in fields:
+            if isinstance(value.get(section), dict):
+                value[section].pop(field, None)
+        artifacts[kind] = value
+    return artifacts
+
+
+@app.route('/api/store/search', methods=['GET'])
+def api_store_search():
+    """API: Search this session's or user's stored projects by free text, learner, institution, project or skill."""
+    store = get_store()
+    if store is None:
+        return json.dumps({'error': 'Curriculum store is disabled'}), 404
+
+    results = store.search(
+        query=request.args.get('q'),
+        learner=request.args.get('learner'),
+        institution=request.args.get('institution'),
+        project=request.args.get('project'),
+        skill=request.args.get('skill'),
+        owner=request_owner(),
+        limit=min(request.args.get('limit', 20, type=int), 100)
+    )
+    return json.dumps({'status': 'success', 'projects': results})
+
+
+@app.route('/api/store/<project_id>', methods=['GET'])
+def api_store_project(project_id):
+    """API: Return one of this session's or user's stored projects and the latest version of each artifact."""
+    store = get_store()
+    owner = request_owner()
+    project = store.get_project(project_id, owner=owner) if store else None
+    if project is None:
+        return json.dumps({'error': 'Project not found'}), 404
+
+    return json.dumps({
+        'status': 'success',
+        'project': project,
+        'artifacts': public_artifacts(store.get_artifacts(project_id, owner=owner))
+    })
+
+
+@app.route('/api/store/<project_id>/fork', methods=['POST'])
+def api_store_fork(project_id):
+    """API: Fork one of this session's or user's stored projects so it can be edited and re-finalized."""
+    store = get_store()
+    try:
+        new_id = store.fork(project_id, owner=request_owner()) if store else None
+    except KeyError:
+        new_id = None
+    if new_id is None:
+        return json.dumps({'error': 'Project not found'}), 404
+
+    session['project_id'] = new_id
+    session.pop('week_feedback', None)
+    session.pop('curriculum_id', None)
+    session.pop('seeded_from', None)
+    # Drop the previous project's artifacts, which the fork may not have
+    for name in ('confirmed_data', 'objectives', 'assessment_strategy', 'outline') + STORE_ONLY_ARTIFACTS:
+        session.pop(name, None)
+    session['artifact_hashes'] = {}
+    # Only what the later steps read goes into the cookie; the rest is referenced by hash
+    for name, value in store.get_artifacts(new_id).items():
+        if name == 'curriculum':
+            save_curriculum(value)
+        elif name in STORE_ONLY_ARTIFACTS:
+            reference_artifact(name, value)
+        else:
+            store_artifact(name, value)
+
+    # Send the user to the furthest step the stored project reached
+    if session.get('outline'):
+        next_url = url_for('outline_page')
+    elif session.get('objectives'):
+        next_url = url_for('objectives_page')
+    else:
+        next_url = url_for('back_to_confirm')
+
+    return json.dumps({'status': 'success', 'project_id': new_id, 'next_url': next_url})
+
+
 # --- Step 3: Objectives Page Routes ---
 
 @app.route('/objectives', methods=['GET'])
@@ -332,36 +1202,71 @@ def objectives_page():
         flash('Please complete the confirmation step first.', 'error')
         return redirect(url_for('intake_form'))
 
-    return render_template('objectives.html',
+    return render_conditional('objectives.html', ('confirmed_data', 'objectives', 'assessment_strategy'), lambda: dict(
         data=confirmed_data,
         objectives=session.get('objectives'),
         assessment_strategy=session.get('assessment_strategy')
-    )
+    ))
 
 
 @app.route('/api/objectives/generate', methods=['POST'])
-def api_objectives_generate():
+async def api_objectives_generate():
     """API: Generate learning objectives and assessment strategy."""
+    with progress_scope((request.get_json(silent=True) or {}).get('progress_token')):
+        return await generate_objectives()
+
+
+async def generate_objectives():
+    """Generate or reuse objectives and assessment for the session."""
     try:
         confirmed_data = session.get('confirmed_data')
         if not confirmed_data:
             return json.dumps({'error': 'No confirmed data in session'}), 400
 
-        client = get_claude_client()
-        result = client.generate_objectives_and_assessment(confirmed_data)
+        request_data = request.get_json(silent=True) or {}
+        fresh_calls.set(bool(request_data.get('regenerate')))
+
+        # Seed from a near-identical stored placement unless the user asked to regenerate
+        neighbor = None if request_data.get('regenerate') else find_similar_project(
+            confirmed_data, ('objectives', 'assessment_strategy')
+        )
+        if neighbor:
+            project_id, similarity, artifacts = neighbor
+            result = {**artifacts['objectives'], 'assessment_strategy': artifacts['assessment_strategy']}
+            session['seeded_from'] = {'project_id': project_id, 'similarity': round(similarity, 3)}
+        else:
+            client = get_claude_client()
+            try:
+                result = None if request_data.get('regenerate') else await prefetched_objectives(confirmed_data)
+                if result is None:
+                    result = await run_llm(client.generate_objectives_and_assessment, confirmed_data)
+                session['seeded_from'] = None
+            except CircuitOpenError as e:
+                # Claude is down: fall back to a looser stored match, else fail fast
+                neighbor = find_similar_project(
+                    confirmed_data, ('objectives', 'assessment_strategy'), Config.CIRCUIT_FALLBACK_SIMILARITY
+                )
+                if not neighbor:
+                    return unavailable_response(e)
+                project_id, similarity, artifacts = neighbor
+                result = {**artifacts['objectives'], 'assessment_strategy': artifacts['assessment_strategy']}
+                session['seeded_from'] = {'project_id': project_id, 'similarity': round(similarity, 3),
+                                          'degraded': True}
 
         # Store in session
-        session['objectives'] = {
+        store_artifact('objectives', {
             'fixed_objectives': result.get('fixed_objectives', []),
             'variable_objectives': result.get('variable_objectives', [])
-        }
-        session['assessment_strategy'] = result.get('assessment_strategy', {})
-        session.modified = True
+        })
+        store_artifact('assessment_strategy', result.get('assessment_strategy', {}))
+        index_current_project(confirmed_data)
 
         return json.dumps({
             'status': 'success',
             'objectives': session['objectives'],
-            'assessment_strategy': session['assessment_strategy']
+            'assessment_strategy': session['assessment_strategy'],
+            'artifact_ids': artifact_hashes(),
+            'seeded_from': session.get('seeded_from')
         })
 
     except Exception as e:
@@ -381,14 +1286,9 @@ def outline_page():
 
     # Process POST data FIRST (before checking if objectives exist)
     if request.method == 'POST':
-        # Save objectives data from form if provided
-        objectives_data = request.form.get('objectives_data')
-        assessment_data = request.form.get('assessment_data')
-        if objectives_data:
-            session['objectives'] = safe_json_loads(objectives_data, session.get('objectives', {}))
-        if assessment_data:
-            session['assessment_strategy'] = safe_json_loads(assessment_data, session.get('assessment_strategy', {}))
-        session.modified = True
+        # Adopt the objectives the page referred to, if they differ from the session's
+        for name in ('objectives', 'assessment_strategy'):
+            form_artifact(name)
 
     # Now check if objectives exist (after POST data has been processed)
     objectives = session.get('objectives')
@@ -396,45 +1296,74 @@ def outline_page():
         flash('Please complete the objectives step first.', 'error')
         return redirect(url_for('objectives_page'))
 
-    return render_template('outline.html',
+    artifacts = ('confirmed_data', 'objectives', 'assessment_strategy', 'outline')
+    return render_conditional('outline.html', artifacts, lambda: dict(
         data=confirmed_data,
         objectives=objectives,
         assessment_strategy=session.get('assessment_strategy', {}),
         outline=session.get('outline')
-    )
+    ))
 
 
 @app.route('/api/outline/generate', methods=['POST'])
-def api_outline_generate():
+async def api_outline_generate():
     """API: Generate course outline."""
+    with progress_scope((request.get_json(silent=True) or {}).get('progress_token')):
+        return await generate_outline()
+
+
+async def generate_outline():
+    """Generate or reuse the course outline for the session."""
     try:
         confirmed_data = session.get('confirmed_data')
 
-        # Try to get objectives from request body first (for serverless compatibility)
-        # Fall back to session if not provided in request
-        request_data = request.get_json() or {}
-        objectives = request_data.get('objectives') or session.get('objectives')
-
         if not confirmed_data:
             return json.dumps({'error': 'No confirmed data in session'}), 400
+
+        # Objectives are referenced by ID; the full JSON is only sent when this
+        # server could not resolve the ID (for serverless compatibility)
+        request_data = request.get_json() or {}
+        fresh_calls.set(bool(request_data.get('regenerate')))
+        objectives, unresolved = requested_artifact('objectives', request_data)
+        if unresolved:
+            return missing_artifacts_response(['objectives'])
+        objectives = objectives or session.get('objectives')
         if not objectives:
             return json.dumps({'error': 'Objectives not generated yet'}), 400
 
-        # Also save to session if we got them from request
-        if request_data.get('objectives'):
-            session['objectives'] = objectives
-            session.modified = True
-
-        client = get_claude_client()
-        result = client.generate_course_outline(confirmed_data, objectives)
+        # Reuse the seed placement's outline if its objectives were kept unchanged
+        result = None
+        seed = session.get('seeded_from')
+        store = get_store()
+        if seed and store and not request_data.get('regenerate'):
+            seed_objectives = store.get_artifact(seed['project_id'], 'objectives')
+            if seed_objectives and artifact_hash(seed_objectives) == artifact_hash(objectives):
+                result = store.get_artifact(seed['project_id'], 'outline')
+        outline_seeded = bool(result)
+
+        if not result:
+            client = get_claude_client()
+            try:
+                result = await run_llm(client.generate_course_outline, confirmed_data, objectives)
+            except CircuitOpenError as e:
+                # Claude is down: keep the current outline or borrow a stored one, else fail fast
+                result = session.get('outline')
+                if not result:
+                    neighbor = find_similar_project(confirmed_data, ('outline',), Config.CIRCUIT_FALLBACK_SIMILARITY)
+                    if not neighbor:
+                        return unavailable_response(e)
+                    seed = {'project_id': neighbor[0], 'similarity': round(neighbor[1], 3), 'degraded': True}
+                    result = neighbor[2]['outline']
+                    outline_seeded = True
 
         # Store in session
-        session['outline'] = result
-        session.modified = True
+        store_artifact('outline', result)
 
         return json.dumps({
             'status': 'success',
-            'outline': result
+            'outline': result,
+            'artifact_ids': artifact_hashes(),
+            'seeded_from': seed if outline_seeded else None
         })
 
     except Exception as e:
@@ -443,9 +1372,139 @@ def api_outline_generate():
 
 # --- Step 5: Finalize and Result ---
 
-@app.route('/finalize', methods=['POST'])
+def week_detail_keys(confirmed_data: dict, objectives: dict, outline: dict) -> dict:
+    """Map each outline week number to its week detail cache key."""
+    feedback = session.get('week_feedback', {})
+    return {
+        week['week']: week_detail_key(confirmed_data, objectives, week, feedback.get(str(week['week'])))
+        for week in outline.get('weeks', [])
+        if isinstance(week, dict) and 'week' in week
+    }
+
+
+def cached_week_details(confirmed_data: dict, objectives: dict, outline: dict) -> dict:
+    """
+    Return the outline's weeks already generated from the same inputs.
+
+    Args:
+        confirmed_data: Confirmed placement data
+        objectives: Finalized objectives
+        outline: Course outline
+
+    Returns:
+        Dict of week number -> week Markdown (weeks not generated yet are left out)
+    """
+    if not Config.WEEK_DETAILS_ENABLED:
+        return {}
+    keys = week_detail_keys(confirmed_data, objectives, outline)
+    cached = get_week_detail_cache().get_many(list(keys.values()))
+    return {week_num: cached[key] for week_num, key in keys.items() if key in cached}
+
+
+# Weeks being written in the background, by week detail key, so requests
+# for the same inputs join one generation instead of starting another
+week_generations = {}
+week_generations_lock = threading.Lock()
+
+
+def close_progress_when_done(futures: list, token: str):
+    """End a progress token's stream once every future has finished."""
+    remaining = len(futures)
+    lock = threading.Lock()
+
+    def finished(_future):
+        nonlocal remaining
+        with lock:
+            remaining -= 1
+            done = remaining == 0
+        if done:
+            get_progress_broker().close(token)
+
+    for future in futures:
+        future.add_done_callback(finished)
+
+
+def start_week_details(confirmed_data: dict, objectives: dict, outline: dict, progress_token: str = None) -> list:
+    """
+    Start writing the outline's uncached weeks on background threads.
+
+    Each week is saved to the week detail cache as it finishes, so the next
+    /finalize picks it up. A week already being written for the same inputs
+    is joined rather than started again. Stage events go to progress_token,
+    whose stream ends when the last of these weeks has finished.
+
+    Args:
+        confirmed_data: Confirmed placement data
+        objectives: Finalized objectives
+        outline: Course outline
+        progress_token: Client progress token, if the page is listening
+
+    Returns:
+        Week numbers still being written
+
+    Raises:
+        ValueError: If the Claude client is not configured
+    """
+    keys = week_detail_keys(confirmed_data, objectives, outline)
+    cache = get_week_detail_cache()
+    cached = cache.get_many(list(keys.values()))
+    missing = [week_num for week_num, key in keys.items() if key not in cached]
+    if not missing:
+        return []
+
+    client = get_claude_client()
+    feedback = session.get('week_feedback', {})
+    # Keeps the request's budget account, tenant and priority
+    context = contextvars.copy_context()
+    context.run(current_token.set, progress_token if valid_token(progress_token) else None)
+
+    def generate(week_num):
+        key = keys[week_num]
+        try:
+            markdown = llm_executor.submit(
+                contextvars.copy_context().run, client.generate_week_detail,
+                confirmed_data, objectives, outline, week_num, feedback.get(str(week_num))
+            ).result()
+            cache.put(key, week_num, markdown)
+            return markdown
+        finally:
+            with week_generations_lock:
+                week_generations.pop(key, None)
+
+    futures = []
+    with week_generations_lock:
+        for week_num in missing:
+            future = week_generations.get(keys[week_num])
+            if future is None:
+                future = week_executor.submit(context.copy().run, generate, week_num)
+                week_generations[keys[week_num]] = future
+                future.add_done_callback(
+                    lambda f, n=week_num: f.exception() and print(f"Week {n} detail generation failed: {f.exception()}")
+                )
+            futures.append(future)
+    if valid_token(progress_token):
+        close_progress_when_done(futures, progress_token)
+    return missing
+
+
+def render_result(confirmed_data: dict, curriculum_markdown: str):
+    """Render the final curriculum page (304 on a revisit with the same curriculum)."""
+    return render_conditional('result.html', ('confirmed_data', 'curriculum'), lambda: dict(
+        curriculum_markdown=curriculum_markdown,
+        data=confirmed_data
+    ))
+
+
+@app.route('/finalize', methods=['GET', 'POST'])
 def finalize_curriculum():
-    """Combine all generated sections into final curriculum document."""
+    """
+    Combine all generated sections into final curriculum document.
+
+    Only weeks already in the week detail cache are included; the outline
+    page writes them beforehand through /api/weeks/generate. Any still
+    missing are started in the background and shown as their outline entry
+    until the document is generated again.
+    """
     try:
         confirmed_data = session.get('confirmed_data')
 
@@ -453,97 +1512,256 @@ def finalize_curriculum():
             flash('Session expired. Please start over.', 'error')
             return redirect(url_for('intake_form'))
 
-        # Get data from form first (serverless compatible), fallback to session
-        outline_data = request.form.get('outline_data')
-        objectives_data = request.form.get('objectives_data')
-        assessment_data = request.form.get('assessment_data')
-
-        outline = safe_json_loads(outline_data, {}) if outline_data else session.get('outline', {})
-        objectives = safe_json_loads(objectives_data, {}) if objectives_data else session.get('objectives', {})
-        assessment = safe_json_loads(assessment_data, {}) if assessment_data else session.get('assessment_strategy', {})
-
-        # Build the final curriculum markdown
-        curriculum_parts = []
-
-        # Course header
-        header = outline.get('course_header', {})
-        curriculum_parts.append(f"# {header.get('title', 'Experiential Learning Course')}")
-        curriculum_parts.append(f"\n**Credits:** {header.get('credits', '3')}")
-        curriculum_parts.append(f"\n## Course Description\n{header.get('description', '')}")
-
-        # Grading breakdown
-        grading = assessment.get('grading_breakdown', {})
-        if grading:
-            curriculum_parts.append("\n## Grading Breakdown")
-            for key, value in grading.items():
-                if isinstance(value, dict):
-                    curriculum_parts.append(f"- **{key.replace('_', ' ').title()}**: {value.get('weight', 0)}% - {value.get('description', '')}")
-                else:
-                    curriculum_parts.append(f"- **{key.replace('_', ' ').title()}**: {value}")
-
-        # Learning objectives
-        curriculum_parts.append("\n## Learning Objectives")
-        curriculum_parts.append("\n### Professional Skills Objectives")
-        for obj in objectives.get('fixed_objectives', []):
-            text = obj.get('text', obj) if isinstance(obj, dict) else obj
-            curriculum_parts.append(f"- {text}")
-
-        curriculum_parts.append("\n### Project-Specific Objectives")
-        for obj in objectives.get('variable_objectives', []):
-            text = obj.get('text', obj) if isinstance(obj, dict) else obj
-            bloom = obj.get('bloom_level', '') if isinstance(obj, dict) else ''
-            bloom_str = f" ({bloom})" if bloom else ""
-            curriculum_parts.append(f"- {text}{bloom_str}")
-
-        # Weekly schedule (high-level outline only)
-        curriculum_parts.append("\n## Weekly Schedule")
-        weeks = outline.get('weeks', [])
-        for week in weeks:
-            week_num = week.get('week', '?')
-            theme = week.get('theme', f'Week {week_num}')
-            milestone = week.get('milestone', '')
-            deliverables = week.get('deliverables', [])
-
-            curriculum_parts.append(f"\n### Week {week_num}: {theme}")
-            if milestone:
-                curriculum_parts.append(f"**Milestone:** {milestone}")
-            if deliverables:
-                curriculum_parts.append("**Deliverables:**")
-                for d in deliverables:
-                    curriculum_parts.append(f"- {d}")
-
-        # Final Deliverable
-        final_deliverable = assessment.get('final_deliverable', {})
-        if final_deliverable:
-            curriculum_parts.append("\n## Final Deliverable")
-            curriculum_parts.append(f"\n### {final_deliverable.get('title', 'Project Deliverable')}")
-            curriculum_parts.append(f"\n{final_deliverable.get('description', '')}")
-            components = final_deliverable.get('components', [])
-            if components:
-                curriculum_parts.append("\n**Components:**")
-                for comp in components:
-                    curriculum_parts.append(f"- {comp}")
-
-        # Combine all parts
-        curriculum_markdown = "\n".join(curriculum_parts)
-
-        # Store for download
-        session['curriculum'] = curriculum_markdown
-        session.modified = True
-
-        # Convert to HTML for display
-        curriculum_html = markdown_to_html(curriculum_markdown)
-
-        return render_template('result.html',
-            curriculum_html=curriculum_html,
-            curriculum_markdown=curriculum_markdown,
-            data=confirmed_data
-        )
+        # Revisiting the result page shows the curriculum already built
+        if request.method == 'GET':
+            curriculum_markdown = session_curriculum()
+            if not curriculum_markdown:
+                return redirect(url_for('outline_page'))
+            return render_result(confirmed_data, curriculum_markdown)
+
+        # Resolve the artifacts the page referred to
+        objectives = form_artifact('objectives')
+        if not objectives:
+            flash('Your objectives are no longer available. Please generate them again.', 'error')
+            return redirect(url_for('objectives_page'))
+        outline = form_artifact('outline')
+        if not outline:
+            flash('Your outline is no longer available. Please generate it again.', 'error')
+            return redirect(url_for('outline_page'))
+        assessment = form_artifact('assessment_strategy') or {}
+
+        week_details = cached_week_details(confirmed_data, objectives, outline)
+        if Config.WEEK_DETAILS_ENABLED:
+            try:
+                pending = start_week_details(confirmed_data, objectives, outline)
+            except ValueError as e:
+                print(f"Skipping week details: {e}")
+                pending = []
+            if pending:
+                flash(f"Week {', '.join(map(str, pending))} details are still being written. "
+                      'Generate the document again in a minute to include them.', 'info')
+
+        # Only sections whose inputs changed since the last finalize are re-rendered
+        curriculum_markdown = get_curriculum_assembler().assemble(outline, objectives, assessment, week_details)
+
+        # Kept server-side for the result page and downloads
+        save_curriculum(curriculum_markdown)
+
+        return render_result(confirmed_data, curriculum_markdown)
 
     except Exception as e:
         flash(f'Error finalizing curriculum: {str(e)}', 'error')
         return redirect(url_for('outline_page'))
 
 
+@app.route('/api/weeks/generate', methods=['POST'])
+def api_generate_weeks():
+    """
+    API: Start writing every outline week that is not cached yet.
+
+    Body: {"objectives_id", "outline_id", "progress_token"}, with the full
+    artifacts only after a 409. Returns at once with the weeks still being
+    written; their stage events stream on /api/progress/<token>, which ends
+    when the last one finishes.
+    """
+    confirmed_data = session.get('confirmed_data')
+    if not confirmed_data:
+        return json.dumps({'error': 'No confirmed data in session'}), 400
+
+    request_data = request.get_json(silent=True) or {}
+    artifacts = {}
+    missing = []
+    for name in ('objectives', 'outline'):
+        value, unresolved = requested_artifact(name, request_data)
+        if unresolved:
+            missing.append(name)
+        artifacts[name] = value or session.get(name)
+    if missing:
+        return missing_artifacts_response(missing)
+    if not (artifacts['objectives'] and artifacts['outline']):
+        return json.dumps({'error': 'No outline in session'}), 400
+    if not Config.WEEK_DETAILS_ENABLED:
+        return json.dumps({'pending': []})
+
+    try:
+        pending = start_week_details(confirmed_data, artifacts['objectives'], artifacts['outline'],
+                                     request_data.get('progress_token'))
+    except ValueError as e:
+        return json.dumps({'error': str(e)}), 500
+    return json.dumps({'pending': pending}), 202 if pending else 200
+
+
+@app.route('/api/weeks/<int:week_num>/regenerate', methods=['POST'])
+async def api_regenerate_week(week_num):
+    """
+    API: Regenerate one week's detail, optionally guided by feedback.
+
+    Body: {"feedback": "..."}. The new week is cached under the feedback,
+    so the next /finalize uses it without regenerating anything else.
+    """
+    confirmed_data = session.get('confirmed_data')
+    objectives = session.get('objectives')
+    outline = session.get('outline')
+    if not (confirmed_data and objectives and outline):
+        return json.dumps({'error': 'No outline in session'}), 400
+    week = next((w for w in outline.get('weeks', []) if isinstance(w, dict) and w.get('week') == week_num), None)
+    if week is None:
+        return json.dumps({'error': f'Week {week_num} is not in the outline'}), 404
+
+    request_data = request.get_json(silent=True) or {}
+    feedback = (request_data.get('feedback') or '').strip() or None
+    cache = get_week_detail_cache()
+    current_key = week_detail_keys(confirmed_data, objectives, outline)[week_num]
+    current = cache.get_many([current_key]).get(current_key)
+    fresh_calls.set(True)
+
+    try:
+        with progress_scope(request_data.get('progress_token')):
+            markdown = await run_llm(get_claude_client().regenerate_week, confirmed_data, objectives, outline,
+                                     week_num, feedback, current)
+    except CircuitOpenError as e:
+        return unavailable_response(e)
+    except Exception as e:
+        return json.dumps({'error': str(e)}), 500
+
+    cache.put(week_detail_key(confirmed_data, objectives, week, feedback), week_num, markdown)
+    week_feedback = dict(session.get('week_feedback', {}))
+    if feedback:
+        week_feedback[str(week_num)] = feedback
+    else:
+        week_feedback.pop(str(week_num), None)
+    session['week_feedback'] = week_feedback
+
+    return json.dumps({'status': 'success', 'week': week_num, 'markdown': markdown})
+
+
+@app.cli.command('build-similarity-index')
+def build_similarity_index_command():
+    """Index every stored placement with objectives and save the index to disk."""
+    index = get_similarity_index(get_store())
+    save_similarity_index()
+    print(f"Indexed {len(index)} placements into {Config.SIMILARITY_INDEX_PATH}")
+
+
+def load_export_inputs(paths) -> list:
+    """Load curricula for bulk export from markdown or JSON files."""
+    curricula = []
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            content = f.read()
+        if path.endswith('.json'):
+            loaded = json.loads(content)
+            curricula.extend(loaded if isinstance(loaded, list) else [loaded])
+        else:
+            title = os.path.splitext(os.path.basename(path))[0]
+            curricula.append({'markdown': content, 'confirmed_data': {'project': {'project_title': title}}})
+    return curricula
+
+
+@app.cli.command('export-bulk')
+@click.argument('paths', nargs=-1, type=click.Path(exists=True, dir_okay=False))
+@click.option('--project-id', '-p', 'project_ids', multiple=True, help='Stored project to include (repeatable).')
+@click.option('--output', '-o', default='curricula_export.zip', help='Destination ZIP file.')
+@click.option('--formats', '-f', default='md,docx,html', help='Comma-separated formats: md, docx, html.')
+@click.option('--workers', '-w', type=int, default=None, help='Worker processes (default: BULK_EXPORT_WORKERS).')
+def export_bulk_command(paths, project_ids, output, formats, workers):
+    """Export curricula from .md/.json files or the curriculum store into a ZIP archive."""
+    curricula = load_export_inputs(paths) + load_stored_curricula(project_ids)
+    if not curricula:
+        raise click.UsageError('Provide files or --project-id values to export.')
+    try:
+        written = write_bulk_export(curricula, output, normalize_formats(formats.split(',')), workers)
+    except ValueError as e:
+        raise click.UsageError(str(e))
+    print(f"Exported {len(curricula)} curricula to {output} ({written} bytes)")
+
+
+def profile_imports(module: str = 'app') -> list:
+    """
+    Measure per-module import cost in a fresh interpreter.
+
+    Args:
+        module: Module to import under ``python -X importtime``
+
+    Returns:
+        List of (module, depth, self_us, cumulative_us) tuples in import order;
+        depth 0 is the profiled module and depth 1 its direct imports
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=app_dir, capture_output=True, text=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        parts = line[len('import time:'):].split('|') if line.startswith('import time:') else []
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        name = parts[2]
+        depth = (len(name) - len(name.lstrip(' ')) - 1) // 2
+        rows.append((name.strip(), depth, int(parts[0]), int(parts[1])))
+    return rows
+
+
+@app.cli.command('import-profile')
+@click.option('--module', '-m', default='app', help='Module to profile.')
+@click.option('--depth', '-d', default=1, help='Deepest import level to list.')
+@click.option('--top', '-n', default=20, help='Number of modules to show.')
+def import_profile_command(module, depth, top):
+    """Report the import cost of a module and its heaviest dependencies."""
+    rows = [row for row in profile_imports(module) if row[1] <= depth]
+    if not rows:
+        raise click.ClickException(f'Could not profile {module}')
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for name, level, self_us, cumulative_us in sorted(rows, key=lambda r: r[3], reverse=True)[:top]:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {'  ' * level}{name}")
+
+
+@app.cli.command('routing-report')
+@click.option('--days', '-d', default=7.0, help='How many days of recorded calls to include.')
+def routing_report_command(days):
+    """Summarize recorded Claude calls by stage, model and outcome."""
+    store = get_store()
+    if store is None:
+        raise click.ClickException('The curriculum store is disabled (STORE_ENABLED=false).')
+    rows = store.llm_call_stats(since=time.time() - days * 86400)
+    print(f"{'stage':<20}{'model':<32}{'outcome':<13}{'calls':>7}{'escal.':>8}{'avg ms':>10}{'max ms':>10}")
+    for row in rows:
+        print(f"{row['stage']:<20}{row['model']:<32}{row['outcome']:<13}{row['calls']:>7}"
+              f"{row['escalations']:>8}{row['avg_latency_ms']:>10.0f}{row['max_latency_ms']:>10.0f}")
+
+
+@app.cli.command('usage-report')
+@click.option('--days', '-d', default=1.0, help='How many days of recorded usage to include.')
+@click.option('--by', 'group_by', default='institution,stage',
+              help='Comma-separated columns: session_id, user, institution, stage, model.')
+def usage_report_command(days, group_by):
+    """Summarize recorded token usage."""
+    store = get_store()
+    if store is None:
+        raise click.ClickException('The curriculum store is disabled (STORE_ENABLED=false).')
+    columns = tuple(c.strip() for c in group_by.split(',') if c.strip())
+    rows = store.token_usage(since=time.time() - days * 86400, group_by=columns)
+    print(''.join(f'{c:<32}' for c in columns) + f"{'calls':>7}{'input':>12}{'output':>12}")
+    for row in rows:
+        print(''.join(f'{str(row.get(c) or "-"):<32}' for c in columns)
+              + f"{row['calls']:>7}{row['input_tokens']:>12}{row['output_tokens']:>12}")
+
+
+@app.cli.command('build-assets')
+def build_assets_command():
+    """Fingerprint and precompress static files into the asset build directory."""
+    manifest = build_assets(app.static_folder, Config.ASSET_BUILD_DIR)
+    for name, entry in manifest.items():
+        print(f"{name:<24} -> {entry['path']:<40} {entry['size']:>8} B  {','.join(entry['encodings']) or '-'}")
+    print(f"Built {len(manifest)} assets into {Config.ASSET_BUILD_DIR}")
+
+
+@app.cli.command('compile-templates')
+def compile_templates_command():
+    """Precompile all templates into the Jinja bytecode cache."""
+    count = precompile_templates(app)
+    print(f"Compiled {count} templates into {Config.TEMPLATE_CACHE_DIR}")
+
+
 if __name__ == '__main__':
     app.run(debug=True, port=5000)
@@ -0,0 +1,50 @@
+"""
+ASGI entry point for the Adaptive Learning Design Engine.
+
+Serve with an ASGI server, for example:
+
+    uvicorn asgi:application --workers 2
+
+The generation routes are async views that await Claude calls on a shared
+thread pool (Config.LLM_MAX_CONCURRENCY), so one process can hold hundreds
+of generation requests in flight. Each request still occupies a thread, so
+this is comparable to a threaded WSGI server (gunicorn --threads), not to
+forked single-threaded workers.
+"""
+
+from asgiref.sync import ThreadSensitiveContext
+from asgiref.wsgi import WsgiToAsgi
+
+from app import app, llm_executor
+
+
+class FlaskASGI(WsgiToAsgi):
+    """
+    WSGI-to-ASGI adapter that gives every request its own worker thread.
+
+    asgiref's adapter otherwise runs all requests on one shared thread, which
+    would serialize them. Entering a ThreadSensitiveContext per request keeps
+    requests independent while async views still run their awaits on the
+    server's event loop.
+    """
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+            return
+        async with ThreadSensitiveContext():
+            await super().__call__(scope, receive, send)
+
+    async def lifespan(self, receive, send):
+        """Acknowledge startup and release the Claude thread pool on shutdown."""
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                llm_executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+
+application = FlaskASGI(app)
@@ -0,0 +1,85 @@
+"""
+Cold-start benchmark for the Flask app.
+
+Each run starts a fresh interpreter, imports the app, serves ``GET /`` and
+then initializes the Claude client, timing every step. Results are printed
+as JSON and, with ``--record``, appended to a history file so regressions
+in cold-start latency show up between commits.
+
+Usage:
+    python benchmarks/cold_start.py --runs 5 --record
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HISTORY_PATH = os.path.join(APP_DIR, 'benchmarks', 'cold_start_history.jsonl')
+
+# Runs inside the fresh interpreter and prints one JSON line of timings
+PROBE = """
+import json, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+response = app.app.test_client().get('/')
+served = time.perf_counter()
+app.Config.ANTHROPIC_API_KEY = app.Config.ANTHROPIC_API_KEY or 'benchmark'
+app.get_claude_client()
+client_ready = time.perf_counter()
+print(json.dumps({
+    'import_ms': (imported - start) * 1000,
+    'first_request_ms': (served - imported) * 1000,
+    'client_init_ms': (client_ready - served) * 1000,
+    'status': response.status_code,
+}))
+"""
+
+
+def run_once() -> dict:
+    """Time one cold start in a fresh interpreter."""
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-c', PROBE], cwd=APP_DIR,
+                            capture_output=True, text=True, check=True)
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    timings['process_ms'] = (time.perf_counter() - start) * 1000
+    return timings
+
+
+def summarize(samples: list) -> dict:
+    """Reduce samples to median timings per step."""
+    keys = ('process_ms', 'import_ms', 'first_request_ms', 'client_init_ms')
+    return {key: round(statistics.median(s[key] for s in samples), 1) for key in keys}
+
+
+def git_revision() -> str:
+    """Return the current short commit hash, if available."""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=APP_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5, help='Number of cold starts to time.')
+    parser.add_argument('--record', action='store_true', help=f'Append results to {HISTORY_PATH}.')
+    args = parser.parse_args()
+
+    samples = [run_once() for _ in range(args.runs)]
+    summary = {'revision': git_revision(), 'runs': args.runs, **summarize(samples)}
+    print(json.dumps(summary, indent=2))
+
+    if args.record:
+        with open(HISTORY_PATH, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({'timestamp': int(time.time()), **summary}) + '\n')
+
+
+if __name__ == '__main__':
+    main()
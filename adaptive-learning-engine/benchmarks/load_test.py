@@ -0,0 +1,243 @@
+"""
+Load test comparing the WSGI and ASGI deployments of the generation API.
+
+Only the Anthropic SDK object is replaced, by one whose messages.create
+sleeps for a fixed latency; every request still goes through ClaudeClient's
+routing, circuit breaker, fair scheduler and parsing. The test measures how
+many generation requests one deployment can keep in flight rather than API
+speed. Each mode is started as a separate server process and hit with
+concurrent ``POST /api/objectives/generate`` requests.
+
+Modes:
+    wsgi-threads  one process with a fixed pool of request threads, like
+                  ``gunicorn --worker-class gthread --threads N``
+    wsgi          forked single-threaded workers, like gunicorn's sync workers
+    asgi          asgi.py under uvicorn
+
+Under asgi.py each in-flight request still holds a request thread and an
+``llm_executor`` thread, so the fair baseline is wsgi-threads with as many
+threads as LLM_MAX_CONCURRENCY.
+
+Usage:
+    python benchmarks/load_test.py --concurrency 10 50 200 --latency 2
+    python benchmarks/load_test.py --modes wsgi wsgi-threads asgi --wsgi-threads 64
+    python benchmarks/load_test.py --scheduler-slots 16
+"""
+
+import argparse
+import http.client
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+MODES = ('wsgi-threads', 'wsgi', 'asgi')
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SECRET_KEY = 'load-test-secret'
+
+SERVER_ENV = {
+    'FLASK_SECRET_KEY': SECRET_KEY,
+    'ANTHROPIC_API_KEY': 'load-test',
+    'STORE_ENABLED': 'false',
+    'SIMILARITY_REUSE_ENABLED': 'false',
+    'PREFETCH_OBJECTIVES': 'false',
+    # Every load request is identical and shares one session, so coalescing
+    # and the session budget would otherwise hide the concurrency under test
+    'SINGLE_FLIGHT_ENABLED': 'false',
+    'BUDGETS_ENABLED': 'false',
+}
+
+CONFIRMED_DATA = {
+    'learner': {'learner_name': 'Load Test', 'confirmed_skills': ['Python']},
+    'project': {'project_title': 'Load Test Project', 'company_name': 'Acme'},
+    'gaps': {'skill_gaps': []},
+    'institution': {'term_length_weeks': '14', 'credit_hours': '3'},
+}
+
+
+OBJECTIVES_RESPONSE = json.dumps({
+    'fixed_objectives': [{'text': 'Manage project timelines'}],
+    'variable_objectives': [{'text': 'Apply SQL to project data', 'bloom_level': 'Apply'}],
+    'assessment_strategy': {'grading_breakdown': {'deliverables': {'weight': 100}}},
+})
+
+
+class SimulatedMessages:
+    """Stands in for the SDK's messages API with a fixed response latency."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def create(self, model: str, max_tokens: int, messages: list, **kwargs):
+        time.sleep(self.latency)
+        return SimpleNamespace(
+            content=[SimpleNamespace(type='text', text=OBJECTIVES_RESPONSE)],
+            stop_reason='end_turn',
+            usage=SimpleNamespace(input_tokens=1000, output_tokens=len(OBJECTIVES_RESPONSE) // 4),
+        )
+
+
+def make_pooled_server(port: int, application, threads: int):
+    """Werkzeug server that handles each connection on a fixed-size thread pool."""
+    from werkzeug.serving import BaseWSGIServer
+
+    class PooledWSGIServer(BaseWSGIServer):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self._pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='request')
+
+        def process_request(self, request, client_address):
+            self._pool.submit(self._handle, request, client_address)
+
+        def _handle(self, request, client_address):
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+
+    return PooledWSGIServer('127.0.0.1', port, application)
+
+
+def serve(mode: str, port: int, latency: float, workers: int, threads: int, scheduler_slots: int = None):
+    """Run one server process with the simulated SDK installed in the real client."""
+    os.environ.update(SERVER_ENV)
+    if scheduler_slots:
+        os.environ['SCHEDULER_SLOTS'] = str(scheduler_slots)
+    sys.path.insert(0, APP_DIR)
+    import app as app_module
+    app_module.get_claude_client().client.messages = SimulatedMessages(latency)
+
+    if mode == 'asgi':
+        import uvicorn
+        from asgi import application
+        uvicorn.run(application, host='127.0.0.1', port=port, log_level='warning')
+        return
+
+    import logging
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+    if mode == 'wsgi-threads':
+        make_pooled_server(port, app_module.app, threads).serve_forever()
+    else:
+        # Forking server with a fixed number of workers, like gunicorn's sync workers
+        from werkzeug.serving import make_server
+        make_server('127.0.0.1', port, app_module.app, processes=workers).serve_forever()
+
+
+def session_cookie() -> str:
+    """Build a signed Flask session cookie holding confirmed data."""
+    os.environ.update(SERVER_ENV)
+    sys.path.insert(0, APP_DIR)
+    from app import app
+    serializer = app.session_interface.get_signing_serializer(app)
+    return serializer.dumps({'confirmed_data': CONFIRMED_DATA})
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port: int, timeout: float = 30.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f'Server on port {port} did not start')
+
+
+def timed_request(port: int, cookie: str) -> tuple:
+    """Send one generation request; return (latency seconds, status)."""
+    start = time.perf_counter()
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=600)
+    try:
+        conn.request('POST', '/api/objectives/generate', body=json.dumps({'regenerate': True}),
+                     headers={'Content-Type': 'application/json', 'Cookie': f'session={cookie}'})
+        status = conn.getresponse().status
+    except OSError:
+        status = 0
+    finally:
+        conn.close()
+    return time.perf_counter() - start, status
+
+
+def run_load(port: int, cookie: str, concurrency: int, total: int) -> dict:
+    """Drive total requests at the given concurrency and summarize latencies."""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda _: timed_request(port, cookie), range(total)))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for latency, status in results if status == 200)
+    errors = sum(1 for _, status in results if status != 200)
+    if not latencies:
+        return {'concurrency': concurrency, 'requests': total, 'errors': errors}
+    return {
+        'concurrency': concurrency,
+        'requests': total,
+        'errors': errors,
+        'throughput_rps': round(len(latencies) / elapsed, 1),
+        'p50_s': round(statistics.median(latencies), 2),
+        'p95_s': round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 2),
+    }
+
+
+def benchmark(mode: str, args) -> list:
+    """Start a server in the given mode and run every concurrency level against it."""
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, __file__, '--serve', mode, '--port', str(port),
+         '--latency', str(args.latency), '--wsgi-workers', str(args.wsgi_workers),
+         '--wsgi-threads', str(args.wsgi_threads), '--scheduler-slots', str(args.scheduler_slots or 0)],
+        cwd=APP_DIR
+    )
+    try:
+        wait_for_port(port)
+        cookie = session_cookie()
+        return [{'mode': mode, **run_load(port, cookie, c, args.requests or c * 2)}
+                for c in args.concurrency]
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--modes', nargs='+', default=['wsgi-threads', 'asgi'], choices=MODES)
+    parser.add_argument('--concurrency', nargs='+', type=int, default=[10, 50, 200])
+    parser.add_argument('--requests', type=int, default=None,
+                        help='Requests per level (default: twice the concurrency).')
+    parser.add_argument('--latency', type=float, default=2.0, help='Simulated Claude latency in seconds.')
+    parser.add_argument('--wsgi-workers', type=int, default=8, help='Worker processes for the wsgi mode.')
+    parser.add_argument('--wsgi-threads', type=int, default=256,
+                        help='Request threads for the wsgi-threads mode (default: LLM_MAX_CONCURRENCY).')
+    parser.add_argument('--scheduler-slots', type=int, default=None,
+                        help='Override SCHEDULER_SLOTS in the servers (default: the configured value).')
+    parser.add_argument('--serve', choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument('--port', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.port, args.latency, args.wsgi_workers, args.wsgi_threads, args.scheduler_slots)
+        return
+
+    rows = [row for mode in args.modes for row in benchmark(mode, args)]
+    print(f"{'mode':<14}{'conc':>6}{'reqs':>6}{'errors':>8}{'rps':>8}{'p50 s':>8}{'p95 s':>8}")
+    for row in rows:
+        print(f"{row['mode']:<14}{row['concurrency']:>6}{row['requests']:>6}{row['errors']:>8}"
+              f"{row.get('throughput_rps', '-'):>8}{row.get('p50_s', '-'):>8}{row.get('p95_s', '-'):>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,7 @@
 """Configuration management for the Adaptive Learning Design Engine."""
 
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -15,10 +16,98 @@ class Config:
     # Anthropic API settings
     ANTHROPIC_API_KEY = os.getenv('ANTHROPIC_API_KEY')
     CLAUDE_MODEL = os.getenv('CLAUDE_MODEL', 'claude-sonnet-4-5-20250929')
+    CLAUDE_FAST_MODEL = os.getenv('CLAUDE_FAST_MODEL', 'claude-haiku-4-5-20251001')
+
+    # Per-stage model routing: 'fast' stages escalate to 'large' on parse
+    # failure or low-quality output. Override with e.g.
+    # STAGE_MODEL_TIERS="gap_analysis=large,outline=fast"
+    MODEL_ROUTING_ENABLED = os.getenv('MODEL_ROUTING_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    STAGE_MODEL_TIERS = {
+        'resume_extraction': 'fast',
+        'project_extraction': 'fast',
+        'gap_analysis': 'fast',
+        'objectives': 'large',
+        'outline': 'large',
+        'outline_plan': 'large',
+        'outline_chunk': 'large',
+        'week_detail': 'large',
+        'week_revision': 'large',
+        'curriculum': 'large',
+        **dict(pair.strip().split('=', 1) for pair in os.getenv('STAGE_MODEL_TIERS', '').split(',') if '=' in pair)
+    }
 
     # API call settings
     MAX_RETRIES = 3
     RETRY_DELAY = 1  # seconds
+    # Threads available to async views for in-flight Claude calls
+    LLM_MAX_CONCURRENCY = int(os.getenv('LLM_MAX_CONCURRENCY', '256'))
+    # Identical concurrent Claude calls share one request; set a directory to
+    # also coalesce across processes via lock files
+    SINGLE_FLIGHT_ENABLED = os.getenv('SINGLE_FLIGHT_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    SINGLE_FLIGHT_SHARED_DIR = os.getenv('SINGLE_FLIGHT_SHARED_DIR', '')
+
+    # Hedged requests: if no token has arrived within the HEDGE_PERCENTILE of
+    # recent time-to-first-byte, send a duplicate and keep the faster one
+    HEDGING_ENABLED = os.getenv('HEDGING_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+    HEDGE_PERCENTILE = float(os.getenv('HEDGE_PERCENTILE', '0.95'))
+    HEDGE_BUDGET_RATIO = float(os.getenv('HEDGE_BUDGET_RATIO', '0.1'))  # Max share of calls hedged
+    HEDGE_DEFAULT_DELAY = 3.0         # Seconds, until enough samples are collected
+    HEDGE_MIN_DELAY = 0.5             # Seconds; never hedge sooner than this
+    HEDGE_MIN_SAMPLES = 20            # Time-to-first-byte samples needed per model
+    HEDGE_RATE_LIMIT_COOLDOWN = 60    # Seconds without hedging after a rate limit
+
+    # Fair scheduling of Claude requests: interactive before batch (requests
+    # sent with "X-Request-Priority: batch"), and weighted fair shares per
+    # institution, e.g. TENANT_WEIGHTS="State University=2,Community College=1".
+    # Slots cap outbound requests (hedges included); LLM_MAX_CONCURRENCY caps
+    # the threads waiting on them. Set SCHEDULER_SLOTS below it to match an
+    # API rate limit; it only orders requests when slots run out
+    SCHEDULER_ENABLED = os.getenv('SCHEDULER_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    SCHEDULER_SLOTS = int(os.getenv('SCHEDULER_SLOTS', str(LLM_MAX_CONCURRENCY)))  # Concurrent Claude requests per process
+    SCHEDULER_INTERACTIVE_RESERVED = int(os.getenv('SCHEDULER_INTERACTIVE_RESERVED', '4'))  # Slots batch can't use
+    TENANT_WEIGHTS = {
+        name.strip(): float(weight)
+        for name, weight in (pair.split('=', 1) for pair in os.getenv('TENANT_WEIGHTS', '').split(',') if '=' in pair)
+    }
+
+    # Token budgets over a sliding window (0 = unlimited). Over budget, stages
+    # run on the fast model ('fast') up to BUDGET_HARD_LIMIT_RATIO x budget,
+    # then only cached/stored artifacts are served ('cache' skips straight there)
+    BUDGETS_ENABLED = os.getenv('BUDGETS_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    SESSION_TOKEN_BUDGET = int(os.getenv('SESSION_TOKEN_BUDGET', '200000'))
+    USER_TOKEN_BUDGET = int(os.getenv('USER_TOKEN_BUDGET', '0'))
+    INSTITUTION_TOKEN_BUDGET = int(os.getenv('INSTITUTION_TOKEN_BUDGET', '0'))
+    BUDGET_WINDOW_SECONDS = int(os.getenv('BUDGET_WINDOW_SECONDS', str(24 * 3600)))
+    BUDGET_DEGRADE_MODE = os.getenv('BUDGET_DEGRADE_MODE', 'fast')
+    BUDGET_HARD_LIMIT_RATIO = float(os.getenv('BUDGET_HARD_LIMIT_RATIO', '1.5'))
+    # Header an authenticating proxy sets to the signed-in user (for per-user budgets)
+    BUDGET_USER_HEADER = os.getenv('BUDGET_USER_HEADER', 'X-Forwarded-User')
+
+    # Edits made through PATCH /api/artifacts/<name> kept per artifact in the session
+    ARTIFACT_CHANGE_LOG_SIZE = 20
+
+    # Server-sent progress events for the pipeline
+    PROGRESS_TTL_SECONDS = 600      # Idle time before a progress channel is discarded
+    PROGRESS_STREAM_TIMEOUT = 300   # Maximum lifetime of one /api/progress stream
+    PROGRESS_FIRST_EVENT_TIMEOUT = 20  # Close streams that receive no events this long
+    # Start objectives generation at /generate; the objectives page's request
+    # waits on the prefetch (running or finished) instead of calling again.
+    # Runs on a background thread, so it is lost on serverless hosts that
+    # freeze or discard the instance once /generate has responded
+    PREFETCH_OBJECTIVES = os.getenv('PREFETCH_OBJECTIVES', 'true').lower() in ('1', 'true', 'yes')
+    PREFETCH_CACHE_SIZE = 256       # Prefetches kept until their page asks for them
+
+    # Circuit breaker around Claude calls, shared by workers through SQLite
+    CIRCUIT_BREAKER_ENABLED = os.getenv('CIRCUIT_BREAKER_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    CIRCUIT_BREAKER_PATH = os.getenv('CIRCUIT_BREAKER_PATH', os.path.join(tempfile.gettempdir(), 'ale_circuit.db'))
+    CIRCUIT_WINDOW_SECONDS = 60      # Rolling window for error and latency rates
+    CIRCUIT_MIN_CALLS = 5            # Calls in the window before the breaker may open
+    CIRCUIT_FAILURE_RATE = 0.5       # Share of failed calls that opens the breaker
+    CIRCUIT_SLOW_CALL_SECONDS = 90   # Calls slower than this count as slow
+    CIRCUIT_SLOW_CALL_RATE = 0.8     # Share of slow calls that opens the breaker
+    CIRCUIT_OPEN_SECONDS = 30        # Time to fail fast before trial calls
+    CIRCUIT_HALF_OPEN_CALLS = 1      # Concurrent trial calls while half-open
+    CIRCUIT_FALLBACK_SIMILARITY = 0.75  # Looser reuse threshold while Claude is unavailable
 
     # Token limits
     EXTRACTION_MAX_TOKENS = 2000
@@ -29,6 +118,87 @@ class Config:
     OBJECTIVES_ASSESSMENT_MAX_TOKENS = 2000  # Step 1: Objectives + assessment strategy
     COURSE_OUTLINE_MAX_TOKENS = 2000         # Step 2: High-level syllabus outline
     WEEK_DETAIL_MAX_TOKENS = 800             # Step 3: Detailed week content (per week)
+    WEEK_REVISION_MAX_TOKENS = 500           # Step 3: Targeted edits to an existing week
+    OUTLINE_PLAN_MAX_TOKENS = 1000           # Step 2, long terms: phase plan
+    OUTLINE_CHUNK_MAX_TOKENS = 1000          # Step 2, long terms: weeks of one phase
+
+    # Terms of OUTLINE_CHUNK_MIN_WEEKS or more get a phase plan first, then
+    # each phase's weeks are generated in parallel
+    OUTLINE_CHUNKING_ENABLED = os.getenv('OUTLINE_CHUNKING_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    OUTLINE_CHUNK_MIN_WEEKS = int(os.getenv('OUTLINE_CHUNK_MIN_WEEKS', '16'))
+    OUTLINE_CHUNK_WEEKS = int(os.getenv('OUTLINE_CHUNK_WEEKS', '5'))
+
+    # Stages sized from their expected output instead of the limits above:
+    # (base tokens, tokens per unit) priors, where units are weeks for the
+    # outline and objectives + deliverables for objectives. Once
+    # SIZING_MIN_SAMPLES responses are recorded, the per-unit figure is
+    # calibrated from their actual output tokens.
+    SIZING_ENABLED = os.getenv('SIZING_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    STAGE_OUTPUT_PRIORS = {
+        'outline': (250, 130),
+        'outline_plan': (200, 120),   # per phase
+        'outline_chunk': (60, 130),
+        'objectives': (500, 110),
+    }
+    SIZING_PERCENTILE = 0.9
+    SIZING_MARGIN = 0.2       # Headroom over the estimate
+    SIZING_MIN_SAMPLES = 20
+    SIZING_MIN_TOKENS = 512
+    SIZING_MAX_TOKENS = 8000
+    # Responses cut off at max_tokens are continued this many times
+    CONTINUATION_MAX_ROUNDS = int(os.getenv('CONTINUATION_MAX_ROUNDS', '2'))
+
+    # Regenerate-with-feedback asks for a patch to the current week and falls
+    # back to full regeneration if the patch cannot be applied
+    WEEK_PATCH_ENABLED = os.getenv('WEEK_PATCH_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+
+    # /finalize includes full Kolb/DEAL content for every week. Weeks are
+    # written in the background (POST /api/weeks/generate) and cached by input
+    WEEK_DETAILS_ENABLED = os.getenv('WEEK_DETAILS_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    WEEK_DETAIL_CONCURRENCY = int(os.getenv('WEEK_DETAIL_CONCURRENCY', '6'))  # Weeks written at once per process
+    WEEK_DETAIL_CACHE_SIZE = 1024  # Generated weeks kept in memory when the store is disabled
+    CURRICULUM_CACHE_SIZE = 256    # Finalized curricula kept in memory; the session holds only their hash
+
+    # Local skill-matching pre-pass before gap analysis
+    SKILL_PREPASS_ENABLED = os.getenv('SKILL_PREPASS_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    SKILL_MATCH_STRONG_THRESHOLD = 0.9      # Trigram cosine similarity treated as the same skill
+    SKILL_MATCH_CANDIDATE_THRESHOLD = 0.55  # Trigram cosine similarity passed to the LLM as a hint only
+    SKILL_MATCH_DIMENSIONS = 512          # Hashed character trigram buckets
+
+    # Template caching
+    # Directory for compiled Jinja bytecode; precompile with `flask compile-templates`
+    TEMPLATE_CACHE_DIR = os.getenv('TEMPLATE_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'ale_jinja_cache'))
+    FRAGMENT_CACHE_SIZE = 256  # Rendered template fragments kept in memory
+    MARKDOWN_POOL_SIZE = 8     # Idle markdown.Markdown instances kept for reuse
+    MARKDOWN_CACHE_SIZE = 512  # Rendered markdown sections kept in memory
+    DOCX_CACHE_SIZE = 32       # Generated .docx exports kept in memory
+    ASSEMBLER_CACHE_SIZE = 512 # Rendered curriculum sections kept in memory
+
+    # Response compression and page ETags
+    COMPRESSION_ENABLED = os.getenv('COMPRESSION_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    COMPRESSION_MIN_SIZE = 500  # Bytes; smaller bodies are sent as-is
+    GZIP_LEVEL = 6
+    BROTLI_QUALITY = 5          # Dynamic responses; prebuilt assets use the maximum
+    PAGE_ETAGS_ENABLED = os.getenv('PAGE_ETAGS_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+
+    # Static asset pipeline
+    # Fingerprinted, precompressed copies of static/; prebuild with `flask build-assets`
+    ASSET_BUILD_DIR = os.getenv('ASSET_BUILD_DIR', os.path.join(tempfile.gettempdir(), 'ale_assets'))
+    ASSET_MAX_AGE = 31536000  # Seconds; fingerprinted URLs change with their content
+
+    # Persistent curriculum store (SQLite + FTS5)
+    STORE_ENABLED = os.getenv('STORE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    STORE_PATH = os.getenv('STORE_PATH', os.path.join(tempfile.gettempdir(), 'ale_curricula.db'))
+
+    # Near-duplicate reuse of stored curricula
+    SIMILARITY_REUSE_ENABLED = os.getenv('SIMILARITY_REUSE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    SIMILARITY_REUSE_THRESHOLD = float(os.getenv('SIMILARITY_REUSE_THRESHOLD', '0.92'))  # Cosine similarity
+    SIMILARITY_DIMENSIONS = 256  # Hashed TF-IDF buckets per placement
+    SIMILARITY_INDEX_PATH = os.getenv('SIMILARITY_INDEX_PATH', os.path.join(tempfile.gettempdir(), 'ale_similarity.npz'))
+
+    # Bulk export
+    BULK_EXPORT_WORKERS = int(os.getenv('BULK_EXPORT_WORKERS', os.cpu_count() or 2))
+    BULK_EXPORT_MAX_CURRICULA = 500  # Per request to /download/bulk
 
     # File upload settings
     MAX_CONTENT_LENGTH = 10 * 1024 * 1024  # 10MB max file size
@@ -8,6 +8,8 @@ from .curriculum_legacy import build_curriculum_prompt
 from .curriculum.objectives_and_assessment import build_objectives_and_assessment_prompt
 from .curriculum.course_outline import build_course_outline_prompt
 from .curriculum.week_detail import build_week_detail_prompt
+from .curriculum.week_revision import build_week_revision_prompt
+from .curriculum.outline_chunks import build_outline_plan_prompt, build_outline_chunk_prompt
 
 __all__ = [
     'build_resume_extraction_prompt',
@@ -18,4 +20,7 @@ __all__ = [
     'build_objectives_and_assessment_prompt',
     'build_course_outline_prompt',
     'build_week_detail_prompt',
+    'build_week_revision_prompt',
+    'build_outline_plan_prompt',
+    'build_outline_chunk_prompt',
 ]
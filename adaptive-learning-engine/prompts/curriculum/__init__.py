@@ -3,9 +3,14 @@
 from .objectives_and_assessment import build_objectives_and_assessment_prompt
 from .course_outline import build_course_outline_prompt
 from .week_detail import build_week_detail_prompt
+from .week_revision import build_week_revision_prompt
+from .outline_chunks import build_outline_plan_prompt, build_outline_chunk_prompt
 
 __all__ = [
     'build_objectives_and_assessment_prompt',
     'build_course_outline_prompt',
     'build_week_detail_prompt',
+    'build_week_revision_prompt',
+    'build_outline_plan_prompt',
+    'build_outline_chunk_prompt',
 ]
@@ -0,0 +1,153 @@
+"""Step 2 for long terms: a phase plan, then the weeks of each phase in parallel."""
+
+import json
+from .shared_context import (
+    format_project_context,
+    format_institution_context,
+    format_objectives_for_downstream,
+)
+
+
+def build_outline_plan_prompt(confirmed_data: dict, objectives: dict, ranges: list) -> str:
+    """
+    Build prompt for the compact phase plan of a long course outline.
+
+    Each phase covers one of the given week ranges. Its weeks are then
+    generated separately (see build_outline_chunk_prompt).
+
+    Args:
+        confirmed_data: Dict with learner, project, gaps, and institution data
+        objectives: Finalized objectives from Step 1
+        ranges: List of (first week, last week) tuples covering the term
+
+    Returns:
+        Prompt string for Claude
+    """
+    project = confirmed_data.get('project', {})
+    institution = confirmed_data.get('institution', {})
+
+    project_context = format_project_context(project)
+    institution_context = format_institution_context(institution)
+    objectives_context = format_objectives_for_downstream(objectives)
+
+    term_length = ranges[-1][1]
+    deliverables = project.get('confirmed_deliverables', [])
+    deliverables_text = json.dumps(deliverables, indent=2) if deliverables else "Not specified"
+    phases_text = "\n".join(f"- Phase {i}: weeks {start}-{end}" for i, (start, end) in enumerate(ranges, 1))
+
+    prompt = f"""You are an expert instructional designer specializing in experiential learning curriculum.
+
+Plan a {term_length}-week experiential learning course as a sequence of phases.
+
+{project_context}
+
+{institution_context}
+
+{objectives_context}
+
+## PROJECT DELIVERABLES
+{deliverables_text}
+
+## PHASES
+{phases_text}
+
+## TASK
+
+Return ONLY valid JSON, no other text. Give the course header and, for each phase above:
+- start and end (the week numbers above, unchanged)
+- focus: what the phase is about (one sentence)
+- milestone: the checkpoint reached at the end of the phase
+- deliverables: the project deliverables due during the phase (every project deliverable belongs to exactly one phase)
+
+**Pacing:** the first phase covers onboarding and planning, middle phases core project work, the last phase synthesis and presentation.
+
+## OUTPUT FORMAT
+
+```json
+{{
+  "course_header": {{
+    "title": "EXP 495: [Title]",
+    "credits": "{institution.get('credit_hours', '3')}",
+    "description": "Brief course description."
+  }},
+  "phases": [
+    {{"start": 1, "end": 5, "focus": "Onboarding and project planning", "milestone": "Project plan approved", "deliverables": ["Project plan"]}}
+  ]
+}}
+```"""
+
+    return prompt
+
+
+def build_outline_chunk_prompt(
+    confirmed_data: dict,
+    objectives: dict,
+    plan: dict,
+    phase_index: int
+) -> str:
+    """
+    Build prompt for the weeks of one phase of a long course outline.
+
+    Args:
+        confirmed_data: Dict with learner, project, gaps, and institution data
+        objectives: Finalized objectives from Step 1
+        plan: Phase plan from build_outline_plan_prompt
+        phase_index: Index of the phase to write weeks for
+
+    Returns:
+        Prompt string for Claude
+    """
+    project = confirmed_data.get('project', {})
+    project_context = format_project_context(project)
+    objectives_context = format_objectives_for_downstream(objectives)
+
+    phases = plan.get('phases', [])
+    phase = phases[phase_index]
+    start, end = phase['start'], phase['end']
+    plan_text = "\n".join(
+        f"- Weeks {p['start']}-{p['end']}: {p.get('focus', '')} | Milestone: {p.get('milestone', 'None')}"
+        f" | Deliverables: {', '.join(p.get('deliverables', [])) or 'None'}"
+        for p in phases
+    )
+    previous_context = (f"The previous phase ends with: {phases[phase_index - 1].get('milestone', 'N/A')}"
+                        if phase_index > 0 else "This is the first phase of the course")
+    next_context = (f"The next phase begins with: {phases[phase_index + 1].get('focus', 'N/A')}"
+                    if phase_index + 1 < len(phases) else "This is the final phase of the course")
+    deliverables_text = "\n".join(f"- {d}" for d in phase.get('deliverables', [])) or "- None"
+
+    prompt = f"""You are an expert instructional designer specializing in experiential learning curriculum.
+
+You are writing part of the weekly outline for the course "{plan.get('course_header', {}).get('title', 'Experiential Learning Course')}".
+
+{project_context}
+
+{objectives_context}
+
+## COURSE PHASE PLAN
+{plan_text}
+
+## THIS PHASE: WEEKS {start}-{end}
+- Focus: {phase.get('focus', '')}
+- {previous_context}
+- {next_context}
+
+## DELIVERABLES DUE IN THIS PHASE
+{deliverables_text}
+
+## TASK
+
+Return ONLY valid JSON, no other text, with one entry for each of weeks {start} through {end}:
+- week: the week number
+- theme: 3-6 words summarizing the focus
+- milestone: brief checkpoint (optional for some weeks); week {end} ends with "{phase.get('milestone', '')}"
+- deliverables: deliverables due that week (every deliverable above is due in exactly one week)
+
+```json
+{{
+  "weeks": [
+    {{"week": {start}, "theme": "...", "milestone": "...", "deliverables": []}}
+  ]
+}}
+```"""
+
+    return prompt
@@ -0,0 +1,57 @@
+"""Step 3 revision: targeted edits to an existing week instead of a full rewrite."""
+
+
+def build_week_revision_prompt(week_markdown: str, feedback: str, week_num: int) -> str:
+    """
+    Build prompt asking for a small patch to one week's content.
+
+    The response is a list of section replacements or exact text
+    replacements, applied locally by utils.week_patch, so a small revision
+    costs a few hundred output tokens instead of the whole week.
+
+    Args:
+        week_markdown: Current Markdown for the week (as generated in Step 3)
+        feedback: User feedback describing the change
+        week_num: Which week is being revised (1-indexed)
+
+    Returns:
+        Prompt string for Claude
+    """
+    prompt = f"""You are an expert instructional designer revising one week of an experiential learning course built on Kolb's Experiential Learning Cycle and the DEAL reflection model.
+
+Here is the current content for Week {week_num}:
+
+<week>
+{week_markdown}
+</week>
+
+## USER FEEDBACK
+{feedback}
+
+## TASK
+
+Make the SMALLEST change to the week that fully addresses the feedback. Leave everything the feedback does not mention exactly as it is.
+
+Return your edits as a JSON object. Each edit is one of:
+
+1. Replace a whole section (the text under a "####" heading, not including the heading):
+   {{"section": "Reflective Observation", "content": "new Markdown for the section"}}
+
+2. Replace an exact passage that appears once in the week:
+   {{"find": "exact text copied from the week", "replace": "new text"}}
+
+Prefer "find"/"replace" for changes to a sentence or prompt, and "section" only when most of a section changes. Keep every "####" heading, the Kolb cycle structure and the DEAL reflection format.
+
+## OUTPUT FORMAT
+
+Return ONLY valid JSON in this exact structure:
+
+```json
+{{
+  "edits": [
+    {{"find": "...", "replace": "..."}}
+  ]
+}}
+```"""
+
+    return prompt
@@ -3,19 +3,58 @@
 import json
 
 
-def build_gap_analysis_prompt(learner_extraction: dict, project_extraction: dict) -> str:
+def format_local_matches(local_matches: dict) -> str:
+    """
+    Format skill matches resolved before the LLM call, plus candidate hints.
+
+    Args:
+        local_matches: Dict with strong_matches and candidate_matches lists
+
+    Returns:
+        Formatted string for prompt inclusion
+    """
+    lines = ["## ALREADY MATCHED (resolved locally - do not repeat these in your output)"]
+    for match in local_matches.get('strong_matches', []):
+        lines.append(f"- Strong: {match['learner_skill']} -> {match['project_need']}")
+    if len(lines) == 1:
+        lines.append("- None")
+    lines.append("")
+    lines.append("The PROJECT REQUIREMENTS above list ONLY the skills still to be analyzed. "
+                 "Report matches and gaps for those skills only, but base fit_assessment on the "
+                 "full picture including the matches above.")
+
+    candidates = local_matches.get('candidate_matches', [])
+    if candidates:
+        lines.append("")
+        lines.append("## SIMILAR NAMES (hints only - similar spelling does not mean the same skill)")
+        for match in candidates:
+            lines.append(f"- {match['project_need']} <-> learner's {match['learner_skill']}")
+        lines.append("")
+        lines.append("Judge each of these yourself: a strong match, a partial match or a skill gap "
+                     "(e.g. Project Management is not Product Management).")
+    return "\n".join(lines)
+
+
+def build_gap_analysis_prompt(
+    learner_extraction: dict,
+    project_extraction: dict,
+    local_matches: dict = None
+) -> str:
     """
     Build the prompt for analyzing skill gaps between learner and project.
 
     Args:
         learner_extraction: Extracted learner data from resume
         project_extraction: Extracted project data from narrative
+        local_matches: Optional matches already resolved by the local skill
+            matcher; project_extraction should then hold only the residue
 
     Returns:
         Complete prompt string for Claude
     """
     learner_json = json.dumps(learner_extraction, indent=2)
     project_json = json.dumps(project_extraction, indent=2)
+    local_section = f"\n{format_local_matches(local_matches)}\n" if local_matches else ""
 
     prompt = f"""You are an expert at matching learner capabilities to project requirements and identifying development opportunities.
 
@@ -26,7 +65,7 @@ Compare the learner's current skills to the project requirements and produce a g
 
 ## PROJECT REQUIREMENTS (extracted from narrative)
 {project_json}
-
+{local_section}
 ## TASK
 Analyze the match between learner and project and return as JSON:
 
@@ -0,0 +1,66 @@
+/*
+ * Artifact references: the server hands out a content-hash ID with every
+ * artifact (objectives, assessment_strategy, outline), and pages send the ID
+ * back instead of the JSON. A server that cannot resolve an ID answers 409
+ * with `missing_artifacts`, and only those are resent in full. Plain form
+ * posts cannot be retried that way, so forms also carry each artifact in
+ * its inline field, which the server only parses when the ID is unknown.
+ */
+
+const INLINE_ARTIFACT_FIELDS = {
+    objectives: 'objectives_data',
+    assessment_strategy: 'assessment_data',
+    outline: 'outline_data'
+};
+
+function setArtifactInputs(ids, values) {
+    Object.keys(ids).forEach(function(name) {
+        const input = document.querySelector(`input[name="${name}_id"]`);
+        if (input && ids[name]) {
+            input.value = ids[name];
+        }
+    });
+    Object.keys(values || {}).forEach(function(name) {
+        const input = document.querySelector(`input[name="${INLINE_ARTIFACT_FIELDS[name]}"]`);
+        if (input && values[name]) {
+            input.value = JSON.stringify(values[name]);
+        }
+    });
+}
+
+async function postWithArtifacts(url, body, artifacts) {
+    // artifacts: {name: {id, value}}
+    const refs = {};
+    Object.keys(artifacts).forEach(function(name) {
+        refs[name + '_id'] = artifacts[name].id;
+    });
+
+    const send = (extra) => fetch(url, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(Object.assign({}, body, refs, extra))
+    });
+
+    let response = await send({});
+    if (response.status === 409) {
+        const data = await response.json();
+        const full = {};
+        (data.missing_artifacts || []).forEach(function(name) {
+            if (artifacts[name]) {
+                full[name] = artifacts[name].value;
+            }
+        });
+        response = await send(full);
+    }
+    return response;
+}
+
+async function patchArtifact(name, baseId, operations) {
+    // operations: JSON Patch, e.g. [{op: 'replace', path: '/weeks/3/theme', value: '...'}]
+    const response = await fetch(`/api/artifacts/${name}`, {
+        method: 'PATCH',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ base_id: baseId, patch: operations })
+    });
+    return response.json();
+}
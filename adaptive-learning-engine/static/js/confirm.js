@@ -0,0 +1,170 @@
+// Collect tags from a container
+function collectTags(containerId) {
+    const container = document.getElementById(containerId);
+    const tags = container.querySelectorAll('.skill-tag');
+    return Array.from(tags).map(tag => {
+        // Get text content excluding the remove button
+        const text = tag.childNodes[0].textContent.trim();
+        return text;
+    });
+}
+
+// Collect deliverables
+function collectDeliverables() {
+    const items = document.querySelectorAll('#deliverables-list .deliverable-item input');
+    return Array.from(items).map(input => input.value.trim()).filter(v => v);
+}
+
+// Collect checked skill gaps
+function collectSkillGaps() {
+    const gaps = [];
+    document.querySelectorAll('#skill-gaps > div').forEach(div => {
+        const checkbox = div.querySelector('input[type="checkbox"]');
+        if (checkbox && checkbox.checked) {
+            const skillName = div.querySelector('.font-medium').textContent.trim();
+            const importanceBadge = div.querySelector('[class*="rounded flex-shrink-0"]');
+            const importance = importanceBadge ? importanceBadge.textContent.trim() : 'important';
+            const descEl = div.querySelector('.text-xs.mt-1');
+            const description = descEl ? descEl.textContent.trim() : '';
+            gaps.push({
+                project_need: skillName,
+                importance: importance,
+                description: description
+            });
+        }
+    });
+    return gaps;
+}
+
+// Collect strong matches
+function collectStrongMatches() {
+    const matches = [];
+    document.querySelectorAll('#strong-matches > div').forEach(div => {
+        const spans = div.querySelectorAll('span');
+        if (spans.length >= 2) {
+            matches.push({
+                learner_skill: spans[0].textContent.trim(),
+                project_need: spans[1].textContent.trim()
+            });
+        }
+    });
+    return matches;
+}
+
+// Remove tag
+function removeTag(button) {
+    button.parentElement.remove();
+    refreshSkillPreview();
+}
+
+// Re-run the local skill matcher against the edited skill lists
+let previewTimer = null;
+function refreshSkillPreview() {
+    clearTimeout(previewTimer);
+    previewTimer = setTimeout(async () => {
+        const learnerSkills = collectTags('technical-skills').concat(collectTags('professional-skills'));
+        const projectSkills = collectTags('project-technical-skills');
+        try {
+            const response = await fetch('/api/skills/preview', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ learner_skills: learnerSkills, project_skills: projectSkills })
+            });
+            const data = await response.json();
+            if (data.error) return;
+
+            const names = items => items.length ? items.join(', ') : 'None';
+            document.getElementById('preview-strong').textContent = names(data.strong_matches.map(m => m.project_need));
+            // Candidates stay unresolved; the gap analysis decides whether they match
+            const candidates = data.candidate_matches.map(m => m.project_need);
+            document.getElementById('preview-partial').textContent = names(data.candidate_matches.map(m => `${m.project_need} (${m.learner_skill})`));
+            document.getElementById('preview-unresolved').textContent = names(data.unresolved_project_skills.filter(s => !candidates.includes(s)));
+            document.getElementById('skill-match-preview').classList.remove('hidden');
+        } catch (error) {
+            // Preview is best-effort; the full gap analysis is unaffected
+        }
+    }, 200);
+}
+
+// Add new tag
+function addTag(containerId, color) {
+    const container = document.getElementById(containerId);
+    const addBtn = container.querySelector('.add-tag-btn');
+
+    const newTag = document.createElement('span');
+    newTag.className = `skill-tag inline-flex items-center px-3 py-1 rounded-full text-sm bg-${color}-100 text-${color}-800 border border-${color}-200`;
+    newTag.innerHTML = `
+        <input type="text" class="bg-transparent border-none outline-none w-24 text-sm" placeholder="New skill..." autofocus>
+        <button type="button" class="ml-2 text-${color}-600 hover:text-${color}-800" onclick="removeTag(this)">&times;</button>
+    `;
+
+    container.insertBefore(newTag, addBtn);
+
+    const input = newTag.querySelector('input');
+    input.focus();
+
+    input.addEventListener('blur', function() {
+        if (this.value.trim()) {
+            const textNode = document.createTextNode(this.value.trim());
+            newTag.insertBefore(textNode, newTag.firstChild);
+            this.remove();
+            refreshSkillPreview();
+        } else {
+            newTag.remove();
+        }
+    });
+
+    input.addEventListener('keypress', function(e) {
+        if (e.key === 'Enter') {
+            e.preventDefault();
+            this.blur();
+        }
+    });
+}
+
+// Remove deliverable
+function removeDeliverable(button) {
+    button.parentElement.remove();
+}
+
+// Add deliverable
+function addDeliverable() {
+    const list = document.getElementById('deliverables-list');
+    const newItem = document.createElement('div');
+    newItem.className = 'deliverable-item flex items-center gap-2 bg-gray-50 p-2 rounded-lg';
+    newItem.innerHTML = `
+        <span class="text-gray-400 cursor-move">&#9776;</span>
+        <input type="text" class="flex-1 px-2 py-1 border border-gray-300 rounded text-sm focus:ring-2 focus:ring-primary focus:border-transparent" placeholder="New deliverable...">
+        <button type="button" class="text-red-500 hover:text-red-700" onclick="removeDeliverable(this)">&times;</button>
+    `;
+    list.appendChild(newItem);
+    newItem.querySelector('input').focus();
+}
+
+// Form submission
+document.getElementById('confirmForm').addEventListener('submit', function(e) {
+    // Collect all data and set hidden inputs
+    const technicalSkills = collectTags('technical-skills');
+    const professionalSkills = collectTags('professional-skills');
+    const allSkills = technicalSkills.map(s => ({skill: s, type: 'technical'}))
+        .concat(professionalSkills.map(s => ({skill: s, type: 'professional'})));
+
+    document.getElementById('confirmed_skills_input').value = JSON.stringify(allSkills);
+    document.getElementById('confirmed_coursework_input').value = JSON.stringify(collectTags('coursework'));
+    document.getElementById('confirmed_deliverables_input').value = JSON.stringify(collectDeliverables());
+    document.getElementById('confirmed_technical_skills_input').value = JSON.stringify(collectTags('project-technical-skills'));
+    document.getElementById('confirmed_professional_skills_input').value = JSON.stringify([]);
+    document.getElementById('confirmed_domain_knowledge_input').value = JSON.stringify([]);
+    document.getElementById('confirmed_success_criteria_input').value = JSON.stringify(collectTags('success-criteria'));
+    document.getElementById('strong_matches_input').value = JSON.stringify(collectStrongMatches());
+    document.getElementById('skill_gaps_input').value = JSON.stringify(collectSkillGaps());
+
+    // Show loading state
+    const btn = document.getElementById('generateBtn');
+    const generateText = document.getElementById('generateText');
+    const generatingText = document.getElementById('generatingText');
+
+    btn.disabled = true;
+    generateText.classList.add('hidden');
+    generatingText.classList.remove('hidden');
+});
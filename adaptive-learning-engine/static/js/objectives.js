@@ -0,0 +1,187 @@
+let objectivesData = null;
+let assessmentData = null;
+let artifactIds = {};
+
+// Generate objectives on page load
+document.addEventListener('DOMContentLoaded', function() {
+    // Check if we already have data in session (coming back from later step)
+    const saved = document.getElementById('objectives-page-data');
+    if (saved) {
+        const data = JSON.parse(saved.textContent);
+        objectivesData = data.objectives;
+        assessmentData = data.assessment_strategy;
+        artifactIds = data.ids;
+        renderContent();
+    } else {
+        generateObjectives();
+    }
+});
+
+async function generateObjectives(regenerate = false) {
+    showLoading();
+    const progress = openProgressStream(document.getElementById('progress-stages'));
+
+    try {
+        const response = await fetch('/api/objectives/generate', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ regenerate: regenerate, progress_token: progress.token })
+        });
+
+        const data = await response.json();
+
+        if (data.error) {
+            showError(data.error);
+            return;
+        }
+
+        objectivesData = data.objectives;
+        assessmentData = data.assessment_strategy;
+        artifactIds = data.artifact_ids || {};
+        renderContent();
+
+    } catch (error) {
+        showError('Network error: ' + error.message);
+    } finally {
+        progress.close();
+    }
+}
+
+async function regenerateObjectives() {
+    const btn = document.getElementById('regenerate-btn');
+    btn.disabled = true;
+    btn.textContent = 'Regenerating...';
+
+    await generateObjectives(true);
+
+    btn.disabled = false;
+    btn.textContent = 'Regenerate';
+}
+
+function showLoading() {
+    document.getElementById('loading-state').classList.remove('hidden');
+    document.getElementById('error-state').classList.add('hidden');
+    document.getElementById('content-state').classList.add('hidden');
+}
+
+function showError(message) {
+    document.getElementById('loading-state').classList.add('hidden');
+    document.getElementById('error-state').classList.remove('hidden');
+    document.getElementById('content-state').classList.add('hidden');
+    document.getElementById('error-message').textContent = message;
+}
+
+// Bloom level color mapping
+const bloomColors = {
+    'Remember': 'bg-slate-100 text-slate-700',
+    'Understand': 'bg-blue-100 text-blue-700',
+    'Apply': 'bg-green-100 text-green-700',
+    'Analyze': 'bg-purple-100 text-purple-700',
+    'Evaluate': 'bg-amber-100 text-amber-700',
+    'Create': 'bg-rose-100 text-rose-700'
+};
+
+function getBloomTagClass(bloomLevel) {
+    return bloomColors[bloomLevel] || 'bg-gray-100 text-gray-700';
+}
+
+// Remove parenthetical Bloom level from text, e.g., "Do something (Apply)" -> "Do something"
+function cleanObjectiveText(text) {
+    return text.replace(/\s*\((Remember|Understand|Apply|Analyze|Evaluate|Create)\)\s*$/i, '').trim();
+}
+
+function renderContent() {
+    document.getElementById('loading-state').classList.add('hidden');
+    document.getElementById('error-state').classList.add('hidden');
+    document.getElementById('content-state').classList.remove('hidden');
+
+    // Render fixed objectives
+    const fixedContainer = document.getElementById('fixed-objectives');
+    fixedContainer.innerHTML = '';
+    (objectivesData.fixed_objectives || []).forEach((obj, index) => {
+        const rawText = typeof obj === 'string' ? obj : obj.text;
+        const text = cleanObjectiveText(rawText);
+        const bloom = typeof obj === 'object' ? obj.bloom_level : '';
+        const bloomClass = getBloomTagClass(bloom);
+        const div = document.createElement('div');
+        div.className = 'flex items-start p-3 bg-gray-50 rounded-lg';
+        div.innerHTML = `
+            <span class="flex-shrink-0 w-6 h-6 bg-primary text-white rounded-full flex items-center justify-center text-xs mr-3">${index + 1}</span>
+            <div class="flex-1">
+                <span class="text-gray-700">${text}</span>
+                ${bloom ? `<span class="ml-2 text-xs px-2 py-0.5 ${bloomClass} rounded">${bloom}</span>` : ''}
+            </div>
+        `;
+        fixedContainer.appendChild(div);
+    });
+
+    // Render variable objectives
+    const varContainer = document.getElementById('variable-objectives');
+    varContainer.innerHTML = '';
+    (objectivesData.variable_objectives || []).forEach((obj, index) => {
+        const rawText = typeof obj === 'string' ? obj : obj.text;
+        const text = cleanObjectiveText(rawText);
+        const bloom = typeof obj === 'object' ? obj.bloom_level : '';
+        const bloomClass = getBloomTagClass(bloom);
+        const div = document.createElement('div');
+        div.className = 'flex items-start p-3 bg-gray-50 rounded-lg';
+        div.innerHTML = `
+            <span class="flex-shrink-0 w-6 h-6 bg-secondary text-white rounded-full flex items-center justify-center text-xs mr-3">${index + 1}</span>
+            <div class="flex-1">
+                <span class="text-gray-700">${text}</span>
+                ${bloom ? `<span class="ml-2 text-xs px-2 py-0.5 ${bloomClass} rounded">${bloom}</span>` : ''}
+            </div>
+        `;
+        varContainer.appendChild(div);
+    });
+
+    // Render final deliverable
+    const deliverableContainer = document.getElementById('final-deliverable');
+    const deliverable = assessmentData.final_deliverable || {};
+    if (deliverable.title) {
+        deliverableContainer.innerHTML = `
+            <h5 class="font-semibold text-gray-900 text-lg">${deliverable.title}</h5>
+            <p class="text-gray-600 mt-2">${deliverable.description || ''}</p>
+            ${deliverable.components && deliverable.components.length > 0 ? `
+                <div class="mt-4">
+                    <p class="text-sm font-medium text-gray-700 mb-2">Components:</p>
+                    <ul class="space-y-1">
+                        ${deliverable.components.map(c => `
+                            <li class="flex items-center text-sm text-gray-600">
+                                <svg class="w-4 h-4 text-primary mr-2 flex-shrink-0" fill="none" stroke="currentColor" viewBox="0 0 24 24">
+                                    <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M9 12l2 2 4-4m6 2a9 9 0 11-18 0 9 9 0 0118 0z"></path>
+                                </svg>
+                                ${c}
+                            </li>
+                        `).join('')}
+                    </ul>
+                </div>
+            ` : ''}
+        `;
+    } else {
+        deliverableContainer.innerHTML = '<p class="text-gray-500 italic">No deliverable specified</p>';
+    }
+
+    // Render grading breakdown
+    const gradingContainer = document.getElementById('grading-breakdown');
+    gradingContainer.innerHTML = '';
+    const grading = assessmentData.grading_breakdown || {};
+    for (const [key, value] of Object.entries(grading)) {
+        const label = key.replace(/_/g, ' ').replace(/\b\w/g, c => c.toUpperCase());
+        const weight = typeof value === 'object' ? value.weight : value;
+        const desc = typeof value === 'object' ? value.description : '';
+        const div = document.createElement('div');
+        div.className = 'flex items-center justify-between p-3 bg-gray-50 rounded-lg';
+        div.innerHTML = `
+            <div>
+                <span class="font-medium text-gray-900">${label}</span>
+                ${desc ? `<p class="text-sm text-gray-500">${desc}</p>` : ''}
+            </div>
+            <span class="text-lg font-bold text-primary">${weight}%</span>
+        `;
+        gradingContainer.appendChild(div);
+    }
+
+    // The outline step looks the objectives up by ID, or reads the inline copy
+    setArtifactInputs(artifactIds, { objectives: objectivesData, assessment_strategy: assessmentData });
+}
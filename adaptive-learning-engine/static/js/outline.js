@@ -0,0 +1,164 @@
+let outlineData = null;
+
+// Data passed from server (needed for form submission and API call)
+const pageData = JSON.parse(document.getElementById('outline-page-data').textContent);
+const objectivesData = pageData.objectives;
+const assessmentData = pageData.assessment_strategy;
+let artifactIds = Object.assign({}, pageData.ids, { outline: JSON.parse(document.getElementById('outline-saved-id').textContent) });
+
+// Generate outline on page load
+document.addEventListener('DOMContentLoaded', function() {
+    // Check if we already have data in session (coming back from later step)
+    const saved = document.getElementById('outline-saved-data');
+    if (saved) {
+        outlineData = JSON.parse(saved.textContent);
+        renderContent();
+    } else {
+        generateOutline();
+    }
+
+    document.getElementById('continue-form').addEventListener('submit', writeWeeksThenFinalize);
+});
+
+// Write the missing weeks in the background, showing progress, then finalize
+async function writeWeeksThenFinalize(event) {
+    const form = event.target;
+    if (!window.EventSource) {
+        return;
+    }
+    event.preventDefault();
+
+    const button = form.querySelector('button[type="submit"]');
+    button.disabled = true;
+    button.textContent = 'Writing weeks...';
+
+    let submitted = false;
+    const finalize = function() {
+        if (!submitted) {
+            submitted = true;
+            form.submit();
+        }
+    };
+    const progress = openProgressStream(document.getElementById('week-progress'), finalize);
+
+    try {
+        const response = await postWithArtifacts(
+            '/api/weeks/generate',
+            { progress_token: progress.token },
+            {
+                objectives: { id: artifactIds.objectives, value: objectivesData },
+                outline: { id: artifactIds.outline, value: outlineData }
+            }
+        );
+        const data = await response.json();
+        if (data.error || !(data.pending && data.pending.length)) {
+            // Nothing to wait for; /finalize reports weeks it could not include
+            progress.close();
+            finalize();
+        }
+    } catch (error) {
+        progress.close();
+        finalize();
+    }
+}
+
+async function generateOutline(regenerate = false) {
+    showLoading();
+    const progress = openProgressStream(document.getElementById('progress-stages'));
+
+    try {
+        const response = await postWithArtifacts(
+            '/api/outline/generate',
+            { regenerate: regenerate, progress_token: progress.token },
+            { objectives: { id: artifactIds.objectives, value: objectivesData } }
+        );
+
+        const data = await response.json();
+
+        if (data.error) {
+            showError(data.error);
+            return;
+        }
+
+        outlineData = data.outline;
+        artifactIds = Object.assign(artifactIds, data.artifact_ids);
+        renderContent();
+
+    } catch (error) {
+        showError('Network error: ' + error.message);
+    } finally {
+        progress.close();
+    }
+}
+
+async function regenerateOutline() {
+    const btn = document.getElementById('regenerate-btn');
+    btn.disabled = true;
+    btn.textContent = 'Regenerating...';
+
+    await generateOutline(true);
+
+    btn.disabled = false;
+    btn.textContent = 'Regenerate';
+}
+
+function showLoading() {
+    document.getElementById('loading-state').classList.remove('hidden');
+    document.getElementById('error-state').classList.add('hidden');
+    document.getElementById('content-state').classList.add('hidden');
+}
+
+function showError(message) {
+    document.getElementById('loading-state').classList.add('hidden');
+    document.getElementById('error-state').classList.remove('hidden');
+    document.getElementById('content-state').classList.add('hidden');
+    document.getElementById('error-message').textContent = message;
+}
+
+function renderContent() {
+    document.getElementById('loading-state').classList.add('hidden');
+    document.getElementById('error-state').classList.add('hidden');
+    document.getElementById('content-state').classList.remove('hidden');
+
+    // Render course header
+    const header = outlineData.course_header || {};
+    document.getElementById('course-title').textContent = header.title || 'Experiential Learning Course';
+    document.getElementById('course-credits').textContent = header.credits || '3';
+    document.getElementById('course-description').textContent = header.description || '';
+
+    // Render weeks
+    const weeksContainer = document.getElementById('weeks-container');
+    weeksContainer.innerHTML = '';
+
+    const weeks = outlineData.weeks || [];
+    weeks.forEach(week => {
+        const div = document.createElement('div');
+        div.className = 'p-4 hover:bg-gray-50';
+        div.innerHTML = `
+            <div class="flex items-start justify-between">
+                <div class="flex items-start">
+                    <span class="flex-shrink-0 w-10 h-10 bg-primary/10 text-primary rounded-lg flex items-center justify-center font-bold mr-4">
+                        ${week.week}
+                    </span>
+                    <div>
+                        <h4 class="font-medium text-gray-900">${week.theme || 'Week ' + week.week}</h4>
+                        ${week.milestone ? `<p class="text-sm text-gray-500 mt-1">Milestone: ${week.milestone}</p>` : ''}
+                        ${week.deliverables && week.deliverables.length > 0 ? `
+                            <div class="flex flex-wrap gap-2 mt-2">
+                                ${week.deliverables.map(d => `<span class="text-xs px-2 py-1 bg-gray-100 text-gray-600 rounded">${d}</span>`).join('')}
+                            </div>
+                        ` : ''}
+                    </div>
+                </div>
+            </div>
+        `;
+        weeksContainer.appendChild(div);
+    });
+
+    // Finalize looks the artifacts up by ID, or reads the inline copies
+    setArtifactInputs(artifactIds, {
+        outline: outlineData,
+        objectives: objectivesData,
+        assessment_strategy: assessmentData
+    });
+}
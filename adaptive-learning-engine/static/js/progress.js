@@ -0,0 +1,87 @@
+/* Live pipeline progress over server-sent events (/api/progress/<token>). */
+
+const STAGE_LABELS = {
+    resume_extraction: 'Reading resume',
+    project_extraction: 'Reading project description',
+    gap_analysis: 'Analyzing skill gaps',
+    objectives: 'Writing objectives and assessment',
+    outline: 'Planning the weekly outline',
+    outline_plan: 'Planning course phases',
+    outline_chunk: 'Outlining weeks',
+    week_detail: 'Writing week detail',
+    week_revision: 'Revising week',
+    curriculum: 'Writing curriculum'
+};
+
+function newProgressToken() {
+    if (window.crypto && crypto.randomUUID) {
+        return crypto.randomUUID();
+    }
+    return Date.now().toString(36) + Math.random().toString(36).slice(2, 12);
+}
+
+function stageLabel(event) {
+    const label = STAGE_LABELS[event.stage] || event.stage;
+    return event.week ? `${label} ${event.week}` : label;
+}
+
+/*
+ * Open a progress stream and render stage rows into a container element.
+ * Returns {token, close}; pass the token with the request that does the work.
+ * onEnd, if given, is called once the server ends the stream.
+ */
+function openProgressStream(container, onEnd) {
+    const token = newProgressToken();
+    if (!window.EventSource || !container) {
+        return { token: token, close: function() {} };
+    }
+
+    const rows = {};
+    const source = new EventSource(`/api/progress/${token}`);
+    container.innerHTML = '';
+    container.classList.remove('hidden');
+
+    function row(event) {
+        const key = event.stage + (event.week ? `-${event.week}` : '');
+        if (!rows[key]) {
+            rows[key] = document.createElement('li');
+            rows[key].className = 'flex items-center justify-between text-sm py-1';
+            container.appendChild(rows[key]);
+        }
+        return rows[key];
+    }
+
+    function render(event, status, detail) {
+        const el = row(event);
+        const icon = status === 'running' ? '<span class="inline-block w-3 h-3 mr-2 rounded-full bg-primary animate-pulse"></span>'
+            : status === 'ok' ? '<span class="inline-block w-3 h-3 mr-2 rounded-full bg-green-500"></span>'
+            : '<span class="inline-block w-3 h-3 mr-2 rounded-full bg-red-500"></span>';
+        el.innerHTML = `<span class="flex items-center text-gray-700">${icon}${stageLabel(event)}</span>` +
+            `<span class="text-gray-500">${detail || ''}</span>`;
+    }
+
+    source.addEventListener('stage_started', function(e) {
+        render(JSON.parse(e.data), 'running', 'in progress');
+    });
+    source.addEventListener('stage_escalated', function(e) {
+        render(JSON.parse(e.data), 'running', 'retrying with a larger model');
+    });
+    source.addEventListener('stage_finished', function(e) {
+        const event = JSON.parse(e.data);
+        render(event, event.status, `${(event.elapsed_ms / 1000).toFixed(1)}s`);
+    });
+    source.addEventListener('done', function() {
+        source.close();
+    });
+    source.addEventListener('end', function() {
+        source.close();
+        if (onEnd) {
+            onEnd();
+        }
+    });
+
+    return {
+        token: token,
+        close: function() { source.close(); }
+    };
+}
@@ -0,0 +1,41 @@
+// Toggle download dropdown
+function toggleDropdown() {
+    const menu = document.getElementById('dropdown-menu');
+    menu.classList.toggle('hidden');
+}
+
+// Close dropdown when clicking outside
+document.addEventListener('click', function(e) {
+    const dropdown = document.getElementById('download-dropdown');
+    if (!dropdown.contains(e.target)) {
+        document.getElementById('dropdown-menu').classList.add('hidden');
+    }
+});
+
+// Copy to clipboard
+function copyToClipboard() {
+    const content = document.getElementById('markdown-content').value;
+    navigator.clipboard.writeText(content).then(() => {
+        showToast('Copied to clipboard!');
+    }).catch(() => {
+        // Fallback for older browsers
+        const textarea = document.getElementById('markdown-content');
+        textarea.classList.remove('hidden');
+        textarea.select();
+        document.execCommand('copy');
+        textarea.classList.add('hidden');
+        showToast('Copied to clipboard!');
+    });
+}
+
+// Show toast notification
+function showToast(message) {
+    const toast = document.getElementById('toast');
+    toast.textContent = message;
+    toast.classList.remove('opacity-0');
+    toast.classList.add('opacity-100');
+    setTimeout(() => {
+        toast.classList.remove('opacity-100');
+        toast.classList.add('opacity-0');
+    }, 2000);
+}
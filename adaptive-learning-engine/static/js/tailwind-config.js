@@ -0,0 +1,10 @@
+tailwind.config = {
+    theme: {
+        extend: {
+            colors: {
+                primary: '#4F46E5',
+                secondary: '#7C3AED',
+            }
+        }
+    }
+};
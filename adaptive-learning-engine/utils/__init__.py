@@ -2,12 +2,15 @@
 
 from .file_parser import extract_text_from_file
 from .api_client import ClaudeClient
-from .output_formatter import markdown_to_html, prepare_download, markdown_to_docx
+from .circuit_breaker import CircuitOpenError
+from .output_formatter import markdown_to_html, prepare_download, markdown_to_docx, markdown_to_docx_bytes
 
 __all__ = [
     'extract_text_from_file',
     'ClaudeClient',
+    'CircuitOpenError',
     'markdown_to_html',
     'prepare_download',
-    'markdown_to_docx'
+    'markdown_to_docx',
+    'markdown_to_docx_bytes'
 ]
@@ -1,12 +1,34 @@
 """Claude API client with retry logic for the Adaptive Learning Design Engine."""
 
+import contextlib
+import contextvars
+import functools
 import json
 import time
 import re
-import anthropic
-from anthropic import APIError, RateLimitError
+from concurrent.futures import ThreadPoolExecutor
 
 from config import Config
+from .budget import DEGRADED, charging, current_stage, get_budget
+from .cache import artifact_hash
+from .circuit_breaker import CircuitOpenError, get_circuit_breaker
+from .hedging import hedged_create
+from .lazy import lazy_import
+from .metrics import get_metrics, record_llm_call
+from .outline_chunks import OutlineContinuityError, merge_outline_chunks, validate_plan, week_ranges
+from .model_routing import stage_models, is_acceptable
+from .progress import publish, track_stage
+from .scheduler import get_scheduler
+from .single_flight import fresh_calls, get_single_flight
+from .token_sizing import current_units, get_output_sizer, objectives_units, sizing, term_weeks
+from .week_patch import PatchError, apply_week_patch
+from .skill_matcher import (
+    match_skills,
+    learner_skill_list,
+    project_skill_list,
+    residual_project_extraction,
+    merge_local_matches,
+)
 from prompts import (
     build_resume_extraction_prompt,
     build_project_extraction_prompt,
@@ -16,8 +38,20 @@ from prompts import (
     build_objectives_and_assessment_prompt,
     build_course_outline_prompt,
     build_week_detail_prompt,
+    build_week_revision_prompt,
+    build_outline_plan_prompt,
+    build_outline_chunk_prompt,
 )
 
+anthropic = lazy_import('anthropic')
+
+
+def is_upstream_failure(error) -> bool:
+    """Return whether an API error indicates an unhealthy upstream (5xx, timeout, connection)."""
+    # Connection errors and timeouts carry no status code
+    status_code = getattr(error, 'status_code', None)
+    return status_code is None or status_code >= 500
+
 
 class ClaudeClient:
     """Wrapper for Claude API with retry logic and structured responses."""
@@ -29,40 +63,250 @@ class ClaudeClient:
         self.max_retries = Config.MAX_RETRIES
         self.retry_delay = Config.RETRY_DELAY
 
-    def _call_with_retry(self, messages: list, max_tokens: int) -> str:
+    def warm_up(self) -> dict:
+        """
+        Open a connection to the API so the first real request skips the handshake.
+
+        Sends a lightweight models listing; the underlying HTTP client keeps the
+        connection in its pool for subsequent ``messages.create`` calls.
+
+        Returns:
+            Dict with the warm-up duration in milliseconds and whether the API answered
+        """
+        start = time.perf_counter()
+        try:
+            self.client.models.list(limit=1)
+            connected = True
+        except anthropic.APIStatusError:
+            # Any HTTP response means the connection is open and pooled
+            connected = True
+        except anthropic.APIError as e:
+            print(f"Warm-up request failed: {e}")
+            connected = False
+        return {
+            'connected': connected,
+            'elapsed_ms': round((time.perf_counter() - start) * 1000, 1)
+        }
+
+    def _generate(self, stage: str, prompt: str, max_tokens: int, parse=None, units: float = None, **progress):
+        """
+        Run a pipeline stage on its routed model, escalating when needed.
+
+        The stage starts on the model from Config.STAGE_MODEL_TIERS. If the
+        output cannot be parsed or fails the stage's quality check, the call is
+        repeated on the next larger model. Every attempt is recorded with its
+        latency and outcome. A stage that would overrun a token budget runs
+        on the fast model only, or is refused (see TokenBudget.check).
+
+        When units is given, max_tokens is sized from the expected response
+        length (see OutputSizer) instead of the static limit.
+
+        Args:
+            stage: Pipeline stage name (e.g. 'gap_analysis')
+            prompt: User prompt
+            max_tokens: Maximum tokens in response
+            parse: Optional callable turning response text into the result
+            units: Size of the request in the stage's units (e.g. weeks), for max_tokens sizing
+            **progress: Extra fields for the stage's progress events (e.g. week=3)
+
+        Returns:
+            Parsed result (or response text when parse is None)
+
+        Raises:
+            json.JSONDecodeError: If the largest model's output cannot be parsed
+            BudgetExceededError: If the account's token budget is used up
+        """
+        if units:
+            max_tokens = get_output_sizer().max_tokens(stage, units, max_tokens)
+        models = stage_models(stage)
+        budget = get_budget()
+        if budget and budget.check(prompt, max_tokens) == DEGRADED:
+            print(f"{stage}: over token budget, using {Config.CLAUDE_FAST_MODEL} only")
+            models = [Config.CLAUDE_FAST_MODEL]
+        with track_stage(stage, **progress), charging(stage=stage), sizing(units):
+            return self._generate_routed(stage, prompt, max_tokens, parse, models)
+
+    def _generate_routed(self, stage: str, prompt: str, max_tokens: int, parse=None, models: list = None):
+        """Try each routed model for a stage in turn (see _generate)."""
+        models = models or stage_models(stage)
+        messages = [{"role": "user", "content": prompt}]
+
+        for attempt, model in enumerate(models):
+            last = attempt == len(models) - 1
+            start = time.perf_counter()
+            try:
+                response_text = self._call_with_retry(messages, max_tokens, model=model)
+            except anthropic.APIError:
+                record_llm_call(stage, model, attempt, 'api_error', (time.perf_counter() - start) * 1000)
+                raise
+            except CircuitOpenError:
+                record_llm_call(stage, model, attempt, 'circuit_open', 0.0)
+                raise
+            latency_ms = (time.perf_counter() - start) * 1000
+
+            try:
+                result = parse(response_text) if parse else response_text
+            except json.JSONDecodeError:
+                record_llm_call(stage, model, attempt, 'parse_error', latency_ms)
+                if last:
+                    raise
+                print(f"{stage}: unparseable output from {model}, escalating")
+                publish('stage_escalated', stage=stage, model=model)
+                continue
+
+            if not last and not is_acceptable(stage, result):
+                record_llm_call(stage, model, attempt, 'low_quality', latency_ms)
+                print(f"{stage}: low-quality output from {model}, escalating")
+                publish('stage_escalated', stage=stage, model=model)
+                continue
+
+            record_llm_call(stage, model, attempt, 'ok', latency_ms)
+            return result
+
+    def _parse_json(self, text: str):
+        """Parse the JSON object contained in a response."""
+        return json.loads(self._extract_json_from_response(text))
+
+    def _call_with_retry(self, messages: list, max_tokens: int, model: str = None) -> str:
+        """
+        Call Claude API, coalescing identical concurrent requests.
+
+        Concurrent calls with the same model, messages and token limit (e.g. a
+        double-clicked Generate button) share a single API request. Calls
+        made for an explicit regenerate (see fresh_calls) always make their own.
+
+        Args:
+            messages: List of message dicts for the API
+            max_tokens: Maximum tokens in response
+            model: Model to call (defaults to Config.CLAUDE_MODEL)
+
+        Returns:
+            Response text from Claude
+        """
+        model = model or self.model
+        if not Config.SINGLE_FLIGHT_ENABLED or fresh_calls.get():
+            return self._request_with_retry(messages, max_tokens, model)
+        key = artifact_hash({'model': model, 'messages': messages, 'max_tokens': max_tokens})
+        return get_single_flight().do(key, lambda: self._request_with_retry(messages, max_tokens, model))
+
+    def _request_with_retry(self, messages: list, max_tokens: int, model: str) -> str:
         """
         Call Claude API with exponential backoff retry.
 
         Args:
             messages: List of message dicts for the API
             max_tokens: Maximum tokens in response
+            model: Model to call
 
         Returns:
             Response text from Claude
         """
         for attempt in range(self.max_retries):
             try:
-                response = self.client.messages.create(
-                    model=self.model,
-                    max_tokens=max_tokens,
-                    messages=messages
-                )
-                return response.content[0].text
-
-            except RateLimitError:
+                return self._create(messages, max_tokens, model)
+
+            except anthropic.RateLimitError:
                 if attempt < self.max_retries - 1:
                     wait_time = (2 ** attempt) * self.retry_delay
                     time.sleep(wait_time)
                 else:
                     raise
 
-            except APIError as e:
-                if attempt < self.max_retries - 1 and e.status_code >= 500:
+            except anthropic.APIError as e:
+                if attempt < self.max_retries - 1 and is_upstream_failure(e):
                     wait_time = (2 ** attempt) * self.retry_delay
                     time.sleep(wait_time)
                 else:
                     raise
 
+    def _create(self, messages: list, max_tokens: int, model: str) -> str:
+        """
+        Make one API request, reporting its outcome to the circuit breaker.
+
+        The request waits for a slot from the fair scheduler, so retry
+        backoff does not hold capacity other tenants could use.
+
+        Args:
+            messages: List of message dicts for the API
+            max_tokens: Maximum tokens in response
+            model: Model to call
+
+        Returns:
+            Response text from Claude
+
+        Raises:
+            CircuitOpenError: If the breaker is open; no request is made
+        """
+        breaker = get_circuit_breaker()
+        if breaker:
+            breaker.before_call()
+        scheduler = get_scheduler()
+        with scheduler.slot() if scheduler else contextlib.nullcontext():
+            return self._send(messages, max_tokens, model, breaker)
+
+    def _send(self, messages: list, max_tokens: int, model: str, breaker) -> str:
+        """Send one request and record its health with the circuit breaker (see _create)."""
+        start = time.perf_counter()
+        healthy = True
+        budget = get_budget()
+        try:
+            return self._create_message(messages, max_tokens, model, budget)
+        except anthropic.APIError as e:
+            healthy = not is_upstream_failure(e)
+            raise
+        finally:
+            if breaker:
+                breaker.record(healthy, (time.perf_counter() - start) * 1000)
+
+    def _create_round(self, messages: list, max_tokens: int, model: str, budget) -> tuple:
+        """
+        Send one request (hedged when enabled) and charge its usage to the budget.
+
+        Returns:
+            Tuple of (response text, stop reason, output tokens)
+        """
+        if Config.HEDGING_ENABLED:
+            return hedged_create(self.client, model, max_tokens, messages,
+                                 rate_limit_error=anthropic.RateLimitError,
+                                 record_usage=functools.partial(budget.record, model) if budget else None)
+        response = self.client.messages.create(
+            model=model,
+            max_tokens=max_tokens,
+            messages=messages
+        )
+        if budget:
+            budget.record(model, response.usage.input_tokens, response.usage.output_tokens)
+        text = ''.join(block.text for block in response.content if hasattr(block, 'text'))
+        return text, response.stop_reason, response.usage.output_tokens
+
+    def _create_message(self, messages: list, max_tokens: int, model: str, budget) -> str:
+        """
+        Create a message, continuing it if the response hit max_tokens.
+
+        A truncated response is sent back as a prefilled assistant turn so the
+        model picks up where it stopped, up to Config.CONTINUATION_MAX_ROUNDS
+        times. Complete responses are recorded for max_tokens sizing.
+        """
+        text, stop_reason, output_tokens = self._create_round(messages, max_tokens, model, budget)
+
+        rounds = 0
+        while stop_reason == 'max_tokens' and rounds < Config.CONTINUATION_MAX_ROUNDS and text.strip():
+            rounds += 1
+            get_metrics().increment('continuations')
+            # The API rejects a prefill that ends in whitespace
+            text = text.rstrip()
+            more, stop_reason, more_tokens = self._create_round(
+                messages + [{"role": "assistant", "content": text}], max_tokens, model, budget
+            )
+            text += more
+            output_tokens += more_tokens
+
+        if stop_reason == 'max_tokens':
+            get_metrics().increment('truncated_responses')
+        elif current_units.get():
+            get_output_sizer().record(current_stage.get(), current_units.get(), output_tokens)
+        return text
+
     def _extract_json_from_response(self, text: str) -> str:
         """
         Extract JSON from a response that may have markdown formatting.
@@ -107,14 +351,8 @@ class ClaudeClient:
         """
         prompt = build_resume_extraction_prompt(learner_data)
 
-        response_text = self._call_with_retry(
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=Config.EXTRACTION_MAX_TOKENS
-        )
-
-        json_str = self._extract_json_from_response(response_text)
         try:
-            return json.loads(json_str)
+            return self._generate('resume_extraction', prompt, Config.EXTRACTION_MAX_TOKENS, self._parse_json)
         except json.JSONDecodeError as e:
             # Return a default structure if parsing fails
             return {
@@ -142,14 +380,8 @@ class ClaudeClient:
         """
         prompt = build_project_extraction_prompt(project_data)
 
-        response_text = self._call_with_retry(
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=Config.EXTRACTION_MAX_TOKENS
-        )
-
-        json_str = self._extract_json_from_response(response_text)
         try:
-            return json.loads(json_str)
+            return self._generate('project_extraction', prompt, Config.EXTRACTION_MAX_TOKENS, self._parse_json)
         except json.JSONDecodeError as e:
             # Return a default structure if parsing fails
             return {
@@ -177,25 +409,30 @@ class ClaudeClient:
         Returns:
             Dict with matches, gaps, fit assessment, scaffolding recommendation
         """
-        prompt = build_gap_analysis_prompt(learner_extraction, project_extraction)
-
-        response_text = self._call_with_retry(
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=Config.GAP_ANALYSIS_MAX_TOKENS
-        )
+        # Resolve exact/alias/near-identical skills locally; the residue, with
+        # similar-name hints, goes to Claude
+        local_matches = None
+        if Config.SKILL_PREPASS_ENABLED:
+            local_matches = match_skills(
+                learner_skill_list(learner_extraction),
+                project_skill_list(project_extraction)
+            )
+            project_extraction = residual_project_extraction(
+                project_extraction, local_matches['unresolved_project_skills']
+            )
+
+        prompt = build_gap_analysis_prompt(learner_extraction, project_extraction, local_matches)
 
-        json_str = self._extract_json_from_response(response_text)
         try:
-            return json.loads(json_str)
+            result = self._generate('gap_analysis', prompt, Config.GAP_ANALYSIS_MAX_TOKENS, self._parse_json)
+            return merge_local_matches(result, local_matches) if local_matches else result
         except json.JSONDecodeError as e:
             # Log error details for debugging
             print(f"Gap analysis JSON parse error: {e}")
-            print(f"Raw response length: {len(response_text)}")
-            print(f"Extracted JSON length: {len(json_str)}")
-            print(f"First 500 chars: {json_str[:500] if json_str else 'empty'}")
-            # Return a default structure if parsing fails
+            print(f"First 500 chars: {e.doc[:500] if e.doc else 'empty'}")
+            # Return a default structure if parsing fails, keeping any local matches
             return {
-                "strong_matches": [],
+                "strong_matches": local_matches['strong_matches'] if local_matches else [],
                 "partial_matches": [],
                 "skill_gaps": [],
                 "fit_assessment": {
@@ -219,12 +456,7 @@ class ClaudeClient:
         """
         prompt = build_curriculum_prompt(confirmed_data)
 
-        response_text = self._call_with_retry(
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=Config.CURRICULUM_MAX_TOKENS
-        )
-
-        return response_text
+        return self._generate('curriculum', prompt, Config.CURRICULUM_MAX_TOKENS)
 
     # --- Modular Curriculum Generation Methods ---
 
@@ -240,14 +472,9 @@ class ClaudeClient:
         """
         prompt = build_objectives_and_assessment_prompt(confirmed_data)
 
-        response_text = self._call_with_retry(
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=Config.OBJECTIVES_ASSESSMENT_MAX_TOKENS
-        )
-
-        json_str = self._extract_json_from_response(response_text)
         try:
-            return json.loads(json_str)
+            return self._generate('objectives', prompt, Config.OBJECTIVES_ASSESSMENT_MAX_TOKENS, self._parse_json,
+                                  units=objectives_units(confirmed_data))
         except json.JSONDecodeError as e:
             print(f"Objectives/assessment JSON parse error: {e}")
             return {
@@ -274,19 +501,22 @@ class ClaudeClient:
         Returns:
             Dict with course_header and weeks array
         """
-        prompt = build_course_outline_prompt(confirmed_data, objectives)
+        term_length = term_weeks(confirmed_data)
+        if Config.OUTLINE_CHUNKING_ENABLED and term_length >= Config.OUTLINE_CHUNK_MIN_WEEKS:
+            try:
+                return self.generate_course_outline_chunked(confirmed_data, objectives)
+            except (json.JSONDecodeError, OutlineContinuityError, TypeError, AttributeError, KeyError) as e:
+                # Malformed phases (wrong types, missing keys) fall back too
+                print(f"Chunked outline failed, generating in one call: {e}")
+                get_metrics().increment('outline_chunk_fallback')
 
-        response_text = self._call_with_retry(
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=Config.COURSE_OUTLINE_MAX_TOKENS
-        )
+        prompt = build_course_outline_prompt(confirmed_data, objectives)
 
-        json_str = self._extract_json_from_response(response_text)
         try:
-            return json.loads(json_str)
+            return self._generate('outline', prompt, Config.COURSE_OUTLINE_MAX_TOKENS, self._parse_json,
+                                  units=term_weeks(confirmed_data))
         except json.JSONDecodeError as e:
             print(f"Course outline JSON parse error: {e}")
-            term_length = int(confirmed_data.get('institution', {}).get('term_length_weeks', 14))
             return {
                 "course_header": {
                     "title": "Experiential Learning Course",
@@ -297,6 +527,49 @@ class ClaudeClient:
                 "parse_error": str(e)
             }
 
+    def generate_course_outline_chunked(self, confirmed_data: dict, objectives: dict) -> dict:
+        """
+        Step 2 for long terms: plan phases, then write each phase's weeks in parallel.
+
+        A compact phase plan (course header, plus focus, milestone and
+        deliverables per range of about Config.OUTLINE_CHUNK_WEEKS weeks)
+        is generated first. The weeks of every phase are then generated
+        concurrently and merged, with each phase's milestone and deliverables
+        checked for continuity (see merge_outline_chunks).
+
+        Args:
+            confirmed_data: Dict with learner, project, gaps, and institution data
+            objectives: Finalized objectives from Step 1
+
+        Returns:
+            Dict with course_header, weeks and phases
+
+        Raises:
+            json.JSONDecodeError: If the plan or a phase cannot be parsed
+            OutlineContinuityError: If the phases do not cover every week exactly once
+        """
+        ranges = week_ranges(term_weeks(confirmed_data), Config.OUTLINE_CHUNK_WEEKS)
+        plan = self._generate('outline_plan', build_outline_plan_prompt(confirmed_data, objectives, ranges),
+                              Config.OUTLINE_PLAN_MAX_TOKENS, self._parse_json, units=len(ranges))
+        validate_plan(plan, ranges)
+
+        def generate_phase(index):
+            start, end = ranges[index]
+            prompt = build_outline_chunk_prompt(confirmed_data, objectives, plan, index)
+            return self._generate('outline_chunk', prompt, Config.OUTLINE_CHUNK_MAX_TOKENS, self._parse_json,
+                                  units=end - start + 1, week=f"{start}-{end}")
+
+        # Each phase runs in a copy of this context (progress token, tenant, budget account)
+        with ThreadPoolExecutor(max_workers=len(ranges), thread_name_prefix='outline-chunk') as pool:
+            futures = [pool.submit(contextvars.copy_context().run, generate_phase, i) for i in range(len(ranges))]
+            chunks = [future.result() for future in futures]
+
+        outline, repairs = merge_outline_chunks(plan, chunks)
+        for repair in repairs:
+            print(f"Outline continuity repair: {repair}")
+        get_metrics().increment('outline_chunked')
+        return outline
+
     def generate_week_detail(
         self,
         confirmed_data: dict,
@@ -326,12 +599,7 @@ class ClaudeClient:
             feedback
         )
 
-        response_text = self._call_with_retry(
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=Config.WEEK_DETAIL_MAX_TOKENS
-        )
-
-        return response_text
+        return self._generate('week_detail', prompt, Config.WEEK_DETAIL_MAX_TOKENS, week=week_num)
 
     def regenerate_week(
         self,
@@ -339,12 +607,16 @@ class ClaudeClient:
         objectives: dict,
         outline: dict,
         week_num: int,
-        feedback: str = None
+        feedback: str = None,
+        current_markdown: str = None
     ) -> str:
         """
         Regenerate a specific week with optional user feedback.
 
-        This is a convenience wrapper around generate_week_detail.
+        When both feedback and the week's current Markdown are given, Claude is
+        asked for a targeted patch (see revise_week) instead of a new week;
+        if the patch cannot be applied, the week is regenerated in full via
+        generate_week_detail.
 
         Args:
             confirmed_data: Dict with learner, project, gaps, and institution data
@@ -352,10 +624,20 @@ class ClaudeClient:
             outline: Course outline from Step 2
             week_num: Which week to regenerate (1-indexed)
             feedback: Optional user feedback guiding regeneration
+            current_markdown: Optional current content of the week to revise in place
 
         Returns:
             Markdown string with regenerated Kolb cycle and DEAL reflection
         """
+        if feedback and current_markdown and Config.WEEK_PATCH_ENABLED:
+            try:
+                revised = self.revise_week(current_markdown, feedback, week_num)
+                get_metrics().increment('week_patch_applied')
+                return revised
+            except (json.JSONDecodeError, PatchError) as e:
+                print(f"Week {week_num} patch failed, regenerating in full: {e}")
+                get_metrics().increment('week_patch_fallback')
+
         return self.generate_week_detail(
             confirmed_data,
             objectives,
@@ -363,3 +645,27 @@ class ClaudeClient:
             week_num,
             feedback
         )
+
+    def revise_week(self, week_markdown: str, feedback: str, week_num: int) -> str:
+        """
+        Apply user feedback to a week as a targeted patch.
+
+        Claude returns only the edited sections or passages, which are applied
+        to the existing Markdown and checked to keep the week's structure.
+
+        Args:
+            week_markdown: Current Markdown for the week
+            feedback: User feedback describing the change
+            week_num: Which week is being revised (1-indexed)
+
+        Returns:
+            Revised week Markdown
+
+        Raises:
+            json.JSONDecodeError: If the patch cannot be parsed
+            PatchError: If the patch does not apply cleanly
+        """
+        prompt = build_week_revision_prompt(week_markdown, feedback, week_num)
+        patch = self._generate('week_revision', prompt, Config.WEEK_REVISION_MAX_TOKENS, self._parse_json,
+                               week=week_num)
+        return apply_week_patch(week_markdown, patch)
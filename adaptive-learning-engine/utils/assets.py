@@ -0,0 +1,195 @@
+"""Fingerprinted, precompressed static assets served with long-lived caching."""
+
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import threading
+
+from config import Config
+
+try:
+    import brotli
+except ImportError:  # Optional: assets are still served gzip-compressed
+    brotli = None
+
+
+MANIFEST_NAME = 'manifest.json'
+COMPRESSIBLE_TYPES = ('.css', '.js', '.json', '.svg', '.txt', '.html')
+
+# Content-Encoding to file suffix, in order of preference
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+def fingerprinted_name(name: str, digest: str) -> str:
+    """Insert a content digest before a file's extension (js/app.js -> js/app.<digest>.js)."""
+    base, ext = os.path.splitext(name)
+    return f"{base}.{digest[:12]}{ext}"
+
+
+def _write_atomic(path: str, data: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _source_files(static_dir: str) -> list:
+    names = []
+    for root, _dirs, files in os.walk(static_dir):
+        for filename in files:
+            names.append(os.path.relpath(os.path.join(root, filename), static_dir).replace(os.sep, '/'))
+    return sorted(names)
+
+
+def build_assets(static_dir: str, out_dir: str) -> dict:
+    """
+    Fingerprint and precompress every file under a static directory.
+
+    Each file is copied to ``out_dir`` under a name containing its content
+    digest. Text assets also get ``.gz`` and (when the brotli package is
+    installed) ``.br`` siblings if compression makes them smaller.
+
+    Args:
+        static_dir: Source directory (the Flask static folder)
+        out_dir: Directory for built files and manifest.json
+
+    Returns:
+        Manifest dict mapping each source name to its built file, digest,
+        mimetype, available encodings and source modification time
+    """
+    manifest = {}
+    for name in _source_files(static_dir):
+        source = os.path.join(static_dir, name)
+        with open(source, 'rb') as f:
+            data = f.read()
+        digest = hashlib.sha256(data).hexdigest()
+        built = fingerprinted_name(name, digest)
+        target = os.path.join(out_dir, built)
+
+        encodings = []
+        if not os.path.exists(target):
+            _write_atomic(target, data)
+        if name.endswith(COMPRESSIBLE_TYPES):
+            variants = {'gzip': lambda: gzip.compress(data, compresslevel=9, mtime=0)}
+            if brotli is not None:
+                variants['br'] = lambda: brotli.compress(data, quality=11)
+            for encoding, suffix in ENCODINGS:
+                if encoding not in variants:
+                    continue
+                if not os.path.exists(target + suffix):
+                    compressed = variants[encoding]()
+                    if len(compressed) >= len(data):
+                        continue
+                    _write_atomic(target + suffix, compressed)
+                encodings.append(encoding)
+
+        manifest[name] = {
+            'path': built,
+            'digest': digest,
+            'mimetype': mimetypes.guess_type(name)[0] or 'application/octet-stream',
+            'encodings': encodings,
+            'size': len(data),
+            'mtime': os.path.getmtime(source),
+        }
+
+    _write_atomic(os.path.join(out_dir, MANIFEST_NAME), json.dumps(manifest, indent=2).encode('utf-8'))
+    return manifest
+
+
+class AssetManifest:
+    """
+    Lookup of fingerprinted asset names, built on first use if needed.
+
+    The manifest written by ``flask build-assets`` is loaded when present
+    and current; otherwise the assets are built into the same directory.
+    """
+
+    def __init__(self, static_dir: str, out_dir: str):
+        self.static_dir = static_dir
+        self.out_dir = out_dir
+        self._by_source = None
+        self._by_path = {}
+        self._lock = threading.Lock()
+
+    def _is_stale(self, manifest: dict) -> bool:
+        if set(manifest) != set(_source_files(self.static_dir)):
+            return True
+        for name, entry in manifest.items():
+            source = os.path.join(self.static_dir, name)
+            if os.path.getmtime(source) != entry['mtime'] or os.path.getsize(source) != entry['size']:
+                return True
+        return False
+
+    def load(self, check_sources: bool = False) -> dict:
+        """
+        Return the manifest, building the assets if it is missing or stale.
+
+        Args:
+            check_sources: Re-check source files even if already loaded (for debug mode)
+
+        Returns:
+            Manifest dict (empty if the assets could not be built)
+        """
+        if self._by_source is not None and not check_sources:
+            return self._by_source
+        with self._lock:
+            if self._by_source is not None and not (check_sources and self._is_stale(self._by_source)):
+                return self._by_source
+            manifest = None
+            try:
+                with open(os.path.join(self.out_dir, MANIFEST_NAME), encoding='utf-8') as f:
+                    manifest = json.load(f)
+                if self._is_stale(manifest):
+                    manifest = None
+            except (OSError, ValueError):
+                manifest = None
+            if manifest is None:
+                try:
+                    manifest = build_assets(self.static_dir, self.out_dir)
+                except OSError as e:
+                    print(f"Asset build failed, serving unfingerprinted static files: {e}")
+                    manifest = {}
+            self._by_path = {entry['path']: entry for entry in manifest.values()}
+            self._by_source = manifest
+            return manifest
+
+    def built_path(self, name: str, check_sources: bool = False) -> str:
+        """Return the fingerprinted path for a static file, or None if it is not built."""
+        entry = self.load(check_sources).get(name)
+        return entry['path'] if entry else None
+
+    def entry_for_path(self, path: str) -> dict:
+        """Return the manifest entry for a fingerprinted path, or None."""
+        self.load()
+        return self._by_path.get(path)
+
+
+def negotiate_encoding(entry: dict, accept_encodings) -> tuple:
+    """
+    Choose the best precompressed variant the client accepts.
+
+    Args:
+        entry: Manifest entry for the asset
+        accept_encodings: The request's parsed Accept-Encoding header
+
+    Returns:
+        Tuple of (Content-Encoding or None, file suffix)
+    """
+    for encoding, suffix in ENCODINGS:
+        if encoding in entry['encodings'] and accept_encodings[encoding]:
+            return encoding, suffix
+    return None, ''
+
+
+_manifest = None
+
+
+def get_asset_manifest(static_dir: str = None) -> AssetManifest:
+    """Return the process-wide asset manifest for the app's static folder."""
+    global _manifest
+    if _manifest is None:
+        _manifest = AssetManifest(static_dir, Config.ASSET_BUILD_DIR)
+    return _manifest
@@ -0,0 +1,221 @@
+"""Token budgets per session, user and institution, with usage accounting."""
+
+import contextlib
+import contextvars
+import math
+import sqlite3
+import threading
+import time
+from collections import deque
+
+from config import Config
+from .circuit_breaker import CircuitOpenError
+from .metrics import get_metrics
+from .store import USAGE_SCOPES, get_store
+
+
+OK = 'ok'
+DEGRADED = 'degraded'
+
+# Account (session_id, user, institution) and pipeline stage of the Claude
+# calls made in this context; copied into LLM worker threads by run_llm
+current_account = contextvars.ContextVar('budget_account', default={})
+current_stage = contextvars.ContextVar('budget_stage', default='')
+
+
+class BudgetExceededError(CircuitOpenError):
+    """
+    Raised instead of calling Claude once an account has spent its token budget.
+
+    It is a CircuitOpenError, so callers fall back to session, cached or
+    stored artifacts exactly as they do while the API is unavailable.
+    """
+
+    def __init__(self, scope: str, used: int, limit: int, retry_after: float):
+        self.name = 'Claude'
+        self.scope = scope
+        self.used = used
+        self.limit = limit
+        self.retry_after = max(retry_after, 0.0)
+        Exception.__init__(self, f"The {scope.replace('_id', '')} token budget is used up "
+                                 f"({used:,} of {limit:,} tokens); retry in {int(self.retry_after) + 1} seconds")
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of English text (about four characters per token)."""
+    return math.ceil(len(text) / 4) if text else 0
+
+
+def budget_limits() -> dict:
+    """Configured budgets per account scope; 0 means unlimited."""
+    return {
+        'session_id': Config.SESSION_TOKEN_BUDGET,
+        'user': Config.USER_TOKEN_BUDGET,
+        'institution': Config.INSTITUTION_TOKEN_BUDGET,
+    }
+
+
+class _MemoryLedger:
+    """In-process stand-in for the store's token_usage table."""
+
+    def __init__(self):
+        self._rows = deque()
+        self._lock = threading.Lock()
+
+    def record_token_usage(self, account: dict, stage: str, model: str, input_tokens: int, output_tokens: int):
+        with self._lock:
+            cutoff = time.time() - Config.BUDGET_WINDOW_SECONDS
+            while self._rows and self._rows[0]['created_at'] < cutoff:
+                self._rows.popleft()
+            self._rows.append({
+                'created_at': time.time(),
+                **{scope: account.get(scope, '') for scope in USAGE_SCOPES},
+                'stage': stage,
+                'model': model,
+                'input_tokens': input_tokens,
+                'output_tokens': output_tokens,
+            })
+
+    def token_usage(self, since: float = None, group_by: tuple = (), **filters) -> list:
+        group_by = tuple(c for c in group_by if c in USAGE_SCOPES + ('stage', 'model'))
+        groups = {}
+        with self._lock:
+            rows = list(self._rows)
+        for row in rows:
+            if row['created_at'] < (since or 0):
+                continue
+            if any(value is not None and row[column] != value for column, value in filters.items()):
+                continue
+            key = tuple(row[column] for column in group_by)
+            group = groups.setdefault(key, {
+                **dict(zip(group_by, key)),
+                'calls': 0, 'input_tokens': 0, 'output_tokens': 0, 'first_call': row['created_at']
+            })
+            group['calls'] += 1
+            group['input_tokens'] += row['input_tokens']
+            group['output_tokens'] += row['output_tokens']
+            group['first_call'] = min(group['first_call'], row['created_at'])
+        if not group_by and not groups:
+            return [{'calls': 0, 'input_tokens': 0, 'output_tokens': 0, 'first_call': None}]
+        return [groups[key] for key in sorted(groups)]
+
+
+class TokenBudget:
+    """
+    Enforces token budgets over a sliding window.
+
+    Before each stage, the prompt is estimated and, together with its
+    max_tokens, checked against what the session, user and institution
+    have spent in the last Config.BUDGET_WINDOW_SECONDS. Over budget,
+    stages are degraded according to Config.BUDGET_DEGRADE_MODE: 'fast'
+    runs them on the fast model until the hard limit
+    (BUDGET_HARD_LIMIT_RATIO times the budget), after which, as in 'cache'
+    mode, no Claude call is made and cached or stored artifacts are used.
+    """
+
+    def __init__(self, ledger=None):
+        """
+        Initialize the budget.
+
+        Args:
+            ledger: Object with record_token_usage and token_usage (the
+                curriculum store, or an in-memory ledger when it is disabled)
+        """
+        self.ledger = ledger or _MemoryLedger()
+
+    def record(self, model: str, input_tokens: int, output_tokens: int):
+        """Charge one Claude call to the current account and stage."""
+        try:
+            self.ledger.record_token_usage(current_account.get(), current_stage.get() or 'unknown', model,
+                                           input_tokens, output_tokens)
+        except sqlite3.Error as e:
+            print(f"Failed to record token usage: {e}")
+
+    def usage(self, account: dict = None, limited_only: bool = False) -> dict:
+        """
+        Return tokens spent in the budget window per scope of an account.
+
+        Args:
+            account: Account dict (defaults to the current one)
+            limited_only: Skip scopes without a configured budget
+
+        Returns:
+            Dict of scope -> {'used', 'limit', 'remaining', 'first_call'} for
+            scopes the account has a value for
+        """
+        account = current_account.get() if account is None else account
+        since = time.time() - Config.BUDGET_WINDOW_SECONDS
+        usage = {}
+        for scope, limit in budget_limits().items():
+            if not account.get(scope) or (limited_only and not limit):
+                continue
+            row = self.ledger.token_usage(since=since, **{scope: account[scope]})[0]
+            used = row['input_tokens'] + row['output_tokens']
+            usage[scope] = {
+                'used': used,
+                'limit': limit or None,
+                'remaining': max(limit - used, 0) if limit else None,
+                'first_call': row['first_call'],
+            }
+        return usage
+
+    def check(self, prompt: str, max_tokens: int) -> str:
+        """
+        Check whether a call fits the current account's budgets.
+
+        Args:
+            prompt: Prompt about to be sent
+            max_tokens: Response token limit for the call
+
+        Returns:
+            OK, or DEGRADED when the call should run on the fast model
+
+        Raises:
+            BudgetExceededError: If no Claude call should be made
+        """
+        projected = estimate_tokens(prompt) + max_tokens
+        status = OK
+        for scope, entry in self.usage(limited_only=True).items():
+            limit = entry['limit']
+            if entry['used'] + projected <= limit:
+                continue
+            hard_limit = limit * Config.BUDGET_HARD_LIMIT_RATIO if Config.BUDGET_DEGRADE_MODE == 'fast' else limit
+            if entry['used'] + projected > hard_limit:
+                get_metrics().increment('budget_exceeded')
+                retry_after = (entry['first_call'] or time.time()) + Config.BUDGET_WINDOW_SECONDS - time.time()
+                raise BudgetExceededError(scope, entry['used'], limit, retry_after)
+            status = DEGRADED
+        if status == DEGRADED:
+            get_metrics().increment('budget_degraded')
+        return status
+
+
+@contextlib.contextmanager
+def charging(account: dict = None, stage: str = None):
+    """Charge Claude calls made in this context to an account and/or stage."""
+    tokens = []
+    if account is not None:
+        tokens.append((current_account, current_account.set(account)))
+    if stage is not None:
+        tokens.append((current_stage, current_stage.set(stage)))
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+
+_budget = None
+_budget_lock = threading.Lock()
+
+
+def get_budget() -> TokenBudget:
+    """Return the process-wide token budget, or None when budgets are disabled."""
+    global _budget
+    if not Config.BUDGETS_ENABLED:
+        return None
+    if _budget is None:
+        with _budget_lock:
+            if _budget is None:
+                _budget = TokenBudget(get_store())
+    return _budget
@@ -0,0 +1,245 @@
+"""Bulk export of many curricula into a streamed ZIP archive."""
+
+import html
+import multiprocessing
+import os
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+from config import Config
+from .output_formatter import markdown_to_html, markdown_to_docx_bytes, prepare_download
+
+
+EXPORT_FORMATS = ('md', 'docx', 'html')
+
+HTML_DOCUMENT_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8">
+<title>{title}</title>
+</head>
+<body>
+{body}
+</body>
+</html>
+"""
+
+
+class _StreamSink:
+    """
+    Write-only, unseekable file object that buffers ZIP output between yields.
+
+    zipfile falls back to data descriptors when the target cannot seek, so
+    each entry can be flushed to the client as soon as it is written.
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        """Return and clear everything written since the last drain."""
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def render_export_entry(index: int, curriculum: dict, formats: tuple) -> list:
+    """
+    Render one curriculum into every requested format.
+
+    Runs in a worker process, so it only takes and returns plain data.
+
+    Args:
+        index: Position of the curriculum in the export (used to keep names unique)
+        curriculum: Dict with 'markdown' and optional 'confirmed_data'
+        formats: Formats to render ('md', 'docx', 'html')
+
+    Returns:
+        List of (archive name, bytes) tuples
+    """
+    md_content = curriculum.get('markdown', '')
+    base = prepare_download(curriculum.get('confirmed_data') or {})
+    base = f"{index + 1:03d}_{base[:-len('.md')]}"
+
+    entries = []
+    if 'md' in formats:
+        entries.append((f"{base}.md", md_content.encode('utf-8')))
+    if 'docx' in formats:
+        entries.append((f"{base}.docx", markdown_to_docx_bytes(md_content)))
+    if 'html' in formats:
+        document = HTML_DOCUMENT_TEMPLATE.format(
+            title=html.escape(base),
+            body=markdown_to_html(md_content)
+        )
+        entries.append((f"{base}.html", document.encode('utf-8')))
+    return entries
+
+
+def validate_export_entry(curriculum) -> dict:
+    """
+    Check that a curriculum has the fields the export workers read.
+
+    Entries are checked before the response starts, because an error inside a
+    worker would only truncate an archive that is already streaming.
+
+    Args:
+        curriculum: Dict with 'markdown' and optional 'confirmed_data'
+
+    Returns:
+        The curriculum, unchanged
+
+    Raises:
+        ValueError: If a field is missing or has the wrong type
+    """
+    if not isinstance(curriculum, dict) or not isinstance(curriculum.get('markdown'), str):
+        raise ValueError('Each curriculum needs a markdown string')
+    confirmed_data = curriculum.get('confirmed_data')
+    if confirmed_data is None:
+        return curriculum
+    if not isinstance(confirmed_data, dict):
+        raise ValueError('confirmed_data must be an object')
+    for section, field in (('project', 'project_title'), ('learner', 'learner_name')):
+        value = confirmed_data.get(section, {})
+        if not isinstance(value, dict):
+            raise ValueError(f'confirmed_data.{section} must be an object')
+        if not isinstance(value.get(field, ''), str):
+            raise ValueError(f'confirmed_data.{section}.{field} must be a string')
+    return curriculum
+
+
+def _make_executor(workers: int):
+    """
+    Create a process pool, falling back to threads where processes are unavailable.
+
+    Workers are started with forkserver (or spawn) rather than forked from the
+    multithreaded server process, which could copy a lock held by another thread.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+    try:
+        return ProcessPoolExecutor(max_workers=workers, mp_context=context)
+    except (OSError, NotImplementedError):
+        # Some serverless runtimes lack the shared memory process pools need
+        return ThreadPoolExecutor(max_workers=workers)
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_export_executor():
+    """Return the process-wide export pool (BULK_EXPORT_WORKERS workers, started on first submit)."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = _make_executor(Config.BULK_EXPORT_WORKERS)
+    return _executor
+
+
+def normalize_formats(formats) -> tuple:
+    """
+    Validate a list of requested export formats.
+
+    Args:
+        formats: Iterable of format names, or None for all formats
+
+    Returns:
+        Tuple of valid format names
+
+    Raises:
+        ValueError: If a format is not supported
+    """
+    if not formats:
+        return EXPORT_FORMATS
+    if isinstance(formats, str):
+        formats = formats.split(',')
+    if not all(isinstance(f, str) for f in formats):
+        raise ValueError('Export formats must be strings')
+    formats = tuple(f.strip().lower() for f in formats if f.strip())
+    unknown = [f for f in formats if f not in EXPORT_FORMATS]
+    if unknown:
+        raise ValueError(f"Unsupported export format(s): {', '.join(unknown)}")
+    return formats
+
+
+def stream_bulk_export(curricula: list, formats=None, workers: int = None):
+    """
+    Render curricula in parallel and stream them as a ZIP archive.
+
+    Entries are added to the archive as workers finish, and the archive bytes
+    are yielded incrementally so the whole ZIP is never held in memory.
+
+    Args:
+        curricula: List of dicts with 'markdown' and optional 'confirmed_data'
+            (already checked with validate_export_entry)
+        formats: Formats to include per curriculum (defaults to all)
+        workers: Worker process count for a dedicated pool (defaults to the
+            shared pool from get_export_executor)
+
+    Yields:
+        Chunks of the ZIP archive
+    """
+    formats = normalize_formats(formats)
+    sink = _StreamSink()
+    executor = _make_executor(workers) if workers else get_export_executor()
+    futures = []
+
+    try:
+        futures = [
+            executor.submit(render_export_entry, i, curriculum, formats)
+            for i, curriculum in enumerate(curricula)
+        ]
+        with zipfile.ZipFile(sink, mode='w', compression=zipfile.ZIP_DEFLATED) as archive:
+            for future in as_completed(futures):
+                for name, data in future.result():
+                    archive.writestr(name, data)
+                chunk = sink.drain()
+                if chunk:
+                    yield chunk
+        # Central directory is written on close
+        chunk = sink.drain()
+        if chunk:
+            yield chunk
+    finally:
+        # Drop queued entries if the client went away mid-stream
+        for future in futures:
+            future.cancel()
+        if workers:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def write_bulk_export(curricula: list, output_path: str, formats=None, workers: int = None) -> int:
+    """
+    Write a bulk export ZIP archive to disk.
+
+    Args:
+        curricula: List of dicts with 'markdown' and optional 'confirmed_data'
+        output_path: Destination path for the ZIP file
+        formats: Formats to include per curriculum (defaults to all)
+        workers: Worker process count (defaults to Config.BULK_EXPORT_WORKERS)
+
+    Returns:
+        Number of bytes written
+
+    Raises:
+        ValueError: If a curriculum is malformed
+    """
+    for curriculum in curricula:
+        validate_export_entry(curriculum)
+    written = 0
+    directory = os.path.dirname(os.path.abspath(output_path))
+    os.makedirs(directory, exist_ok=True)
+    with open(output_path, 'wb') as f:
+        for chunk in stream_bulk_export(curricula, formats, workers):
+            f.write(chunk)
+            written += len(chunk)
+    return written
@@ -0,0 +1,91 @@
+"""In-process caching helpers shared by rendering and export code."""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+
+def artifact_hash(value) -> str:
+    """
+    Compute a stable content hash for a session artifact.
+
+    Args:
+        value: Any JSON-serializable value (dict, list, str, ...)
+
+    Returns:
+        Hex SHA-256 digest of the canonical JSON encoding
+    """
+    if isinstance(value, str):
+        payload = value
+    else:
+        payload = json.dumps(value, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class LRUCache:
+    """Small thread-safe least-recently-used cache."""
+
+    def __init__(self, maxsize: int = 128):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries kept before evicting the oldest
+        """
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        """Return the cached value for key, marking it recently used."""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        """Store value under key, evicting the least recently used entry if full."""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        """Remove key and return its value (default if absent)."""
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def get_or_set(self, key, factory):
+        """
+        Return the cached value for key, computing it with factory on a miss.
+
+        Args:
+            key: Cache key
+            factory: Zero-argument callable producing the value
+
+        Returns:
+            Cached or freshly computed value
+        """
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = factory()
+            self.set(key, value)
+        return value
+
+    def clear(self):
+        """Drop all cached entries."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
@@ -0,0 +1,229 @@
+"""Circuit breaker shared by all workers for calls to the Claude API."""
+
+import os
+import sqlite3
+import threading
+import time
+
+from config import Config
+
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS breaker_calls (
+    name TEXT NOT NULL,
+    ts REAL NOT NULL,
+    ok INTEGER NOT NULL,
+    latency_ms REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_breaker_calls_name_ts ON breaker_calls(name, ts);
+
+CREATE TABLE IF NOT EXISTS breaker_state (
+    name TEXT PRIMARY KEY,
+    state TEXT NOT NULL,
+    changed_at REAL NOT NULL,
+    trial_calls INTEGER NOT NULL DEFAULT 0,
+    trial_started_at REAL NOT NULL DEFAULT 0
+);
+"""
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream that the breaker considers unhealthy."""
+
+    def __init__(self, name: str, retry_after: float):
+        self.name = name
+        self.retry_after = max(retry_after, 0.0)
+        super().__init__(
+            f"{name} is currently unavailable; retry in {int(self.retry_after) + 1} seconds"
+        )
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open circuit breaker with state kept in SQLite.
+
+    Call outcomes are written to a shared database so every worker process
+    sees the same error rate. The breaker opens when, within the rolling
+    window, enough calls have been made and either the failure rate or the
+    slow-call rate crosses its threshold. While open, calls fail immediately
+    with CircuitOpenError. After the open period a limited number of trial
+    calls are let through (half-open): a success closes the breaker and a
+    failure opens it again. A trial slot is leased for CIRCUIT_OPEN_SECONDS;
+    if its worker dies without recording a result, the slot goes to the next
+    caller once the lease runs out.
+    """
+
+    def __init__(self, name: str, path: str = None):
+        """
+        Initialize the breaker.
+
+        Args:
+            name: Upstream name (one row of state per name)
+            path: SQLite database path; empty keeps state in this process only
+        """
+        self.name = name
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._target, self._uri = path, False
+        else:
+            self._target, self._uri = f'file:breaker_{id(self)}?mode=memory&cache=shared', True
+        self._local = threading.local()
+        # Keeps an in-memory database alive for the life of the breaker
+        self._keeper = self._connect()
+        self._keeper.executescript(SCHEMA)
+        columns = {row['name'] for row in self._keeper.execute('PRAGMA table_info(breaker_state)')}
+        if 'trial_started_at' not in columns:
+            self._keeper.execute('ALTER TABLE breaker_state ADD COLUMN trial_started_at REAL NOT NULL DEFAULT 0')
+        self._last_prune = 0.0
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection (autocommit, explicit transactions)."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self._target, timeout=10, uri=self._uri, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            if not self._uri:
+                conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+        return conn
+
+    def _read_state(self, conn) -> sqlite3.Row:
+        row = conn.execute('SELECT * FROM breaker_state WHERE name = ?', (self.name,)).fetchone()
+        if row is None:
+            conn.execute('INSERT OR IGNORE INTO breaker_state (name, state, changed_at) VALUES (?, ?, ?)',
+                         (self.name, CLOSED, time.time()))
+            row = conn.execute('SELECT * FROM breaker_state WHERE name = ?', (self.name,)).fetchone()
+        return row
+
+    def _set_state(self, conn, state: str, now: float):
+        conn.execute('UPDATE breaker_state SET state = ?, changed_at = ?, trial_calls = 0, trial_started_at = 0 '
+                     'WHERE name = ?',
+                     (state, now, self.name))
+        print(f"Circuit breaker '{self.name}' is now {state}")
+
+    def before_call(self):
+        """
+        Reserve permission to call the upstream.
+
+        Raises:
+            CircuitOpenError: If the breaker is open, or half-open with its trial calls in use
+        """
+        conn = self._connect()
+        now = time.time()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = self._read_state(conn)
+            state = row['state']
+            if state == OPEN:
+                remaining = row['changed_at'] + Config.CIRCUIT_OPEN_SECONDS - now
+                if remaining > 0:
+                    raise CircuitOpenError(self.name, remaining)
+                self._set_state(conn, HALF_OPEN, now)
+                row = self._read_state(conn)
+                state = HALF_OPEN
+            if state == HALF_OPEN:
+                if row['trial_calls'] >= Config.CIRCUIT_HALF_OPEN_CALLS:
+                    lease_left = row['trial_started_at'] + Config.CIRCUIT_OPEN_SECONDS - now
+                    if lease_left > 0:
+                        raise CircuitOpenError(self.name, lease_left)
+                    # A trial never reported back (its worker was killed or
+                    # redeployed); hand its slot to this call
+                    print(f"Circuit breaker '{self.name}' trial call expired; starting a new one")
+                    conn.execute('UPDATE breaker_state SET trial_started_at = ? WHERE name = ?',
+                                 (now, self.name))
+                else:
+                    conn.execute('UPDATE breaker_state SET trial_calls = trial_calls + 1, trial_started_at = ? '
+                                 'WHERE name = ?', (now, self.name))
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+    def record(self, ok: bool, latency_ms: float):
+        """
+        Record the outcome of a call made after before_call().
+
+        Args:
+            ok: False if the upstream failed (5xx, overloaded, timeout, connection error)
+            latency_ms: Wall-clock latency of the call
+        """
+        conn = self._connect()
+        now = time.time()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute('INSERT INTO breaker_calls (name, ts, ok, latency_ms) VALUES (?, ?, ?, ?)',
+                         (self.name, now, int(ok), latency_ms))
+            row = self._read_state(conn)
+            if row['state'] == HALF_OPEN:
+                self._set_state(conn, CLOSED if ok else OPEN, now)
+            elif row['state'] == CLOSED and self._should_open(conn, row, now):
+                self._set_state(conn, OPEN, now)
+            if now - self._last_prune > Config.CIRCUIT_WINDOW_SECONDS:
+                self._last_prune = now
+                conn.execute('DELETE FROM breaker_calls WHERE name = ? AND ts < ?',
+                             (self.name, now - Config.CIRCUIT_WINDOW_SECONDS))
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+    def _window_stats(self, conn, since: float) -> sqlite3.Row:
+        return conn.execute(
+            'SELECT COUNT(*) AS calls, COALESCE(SUM(ok = 0), 0) AS failures, '
+            'COALESCE(SUM(latency_ms >= ?), 0) AS slow, AVG(latency_ms) AS avg_latency_ms '
+            'FROM breaker_calls WHERE name = ? AND ts >= ?',
+            (Config.CIRCUIT_SLOW_CALL_SECONDS * 1000, self.name, since)
+        ).fetchone()
+
+    def _should_open(self, conn, row, now: float) -> bool:
+        # Only count calls made since the breaker last closed
+        stats = self._window_stats(conn, max(now - Config.CIRCUIT_WINDOW_SECONDS, row['changed_at']))
+        if stats['calls'] < Config.CIRCUIT_MIN_CALLS:
+            return False
+        return (stats['failures'] / stats['calls'] >= Config.CIRCUIT_FAILURE_RATE
+                or stats['slow'] / stats['calls'] >= Config.CIRCUIT_SLOW_CALL_RATE)
+
+    def status(self) -> dict:
+        """
+        Return the breaker state and the rolling-window statistics.
+
+        Returns:
+            Dict with state, seconds until a trial call is allowed, and window stats
+        """
+        conn = self._connect()
+        now = time.time()
+        row = conn.execute('SELECT * FROM breaker_state WHERE name = ?', (self.name,)).fetchone()
+        state = row['state'] if row else CLOSED
+        changed_at = row['changed_at'] if row else now
+        stats = self._window_stats(conn, now - Config.CIRCUIT_WINDOW_SECONDS)
+        retry_after = changed_at + Config.CIRCUIT_OPEN_SECONDS - now if state == OPEN else 0
+        return {
+            'name': self.name,
+            'state': state,
+            'since': changed_at,
+            'retry_after': round(max(retry_after, 0), 1),
+            'window_seconds': Config.CIRCUIT_WINDOW_SECONDS,
+            'calls': stats['calls'],
+            'failures': stats['failures'],
+            'slow_calls': stats['slow'],
+            'avg_latency_ms': round(stats['avg_latency_ms'] or 0, 1),
+        }
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(name: str = 'anthropic') -> CircuitBreaker:
+    """Return the process-wide breaker for an upstream, or None when disabled."""
+    if not Config.CIRCUIT_BREAKER_ENABLED:
+        return None
+    if name not in _breakers:
+        with _breakers_lock:
+            if name not in _breakers:
+                _breakers[name] = CircuitBreaker(name, Config.CIRCUIT_BREAKER_PATH)
+    return _breakers[name]
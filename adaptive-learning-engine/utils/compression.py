@@ -0,0 +1,91 @@
+"""Compression of dynamic responses, negotiated by content type and Accept-Encoding."""
+
+import gzip
+
+from flask import request
+
+from config import Config
+
+try:
+    import brotli
+except ImportError:  # Optional: responses are gzip-compressed without it
+    brotli = None
+
+
+COMPRESSIBLE_MIMETYPES = {
+    'text/html',
+    'text/plain',
+    'text/markdown',
+    'text/css',
+    'text/javascript',
+    'application/javascript',
+    'application/json',
+    'image/svg+xml',
+}
+
+
+def choose_encoding(accept_encodings) -> str:
+    """Return 'br', 'gzip' or None for a request's parsed Accept-Encoding."""
+    if brotli is not None and accept_encodings['br']:
+        return 'br'
+    if accept_encodings['gzip']:
+        return 'gzip'
+    return None
+
+
+def compress_response(response, accept_encodings):
+    """
+    Compress a buffered response body in place when worthwhile.
+
+    Streamed responses (server-sent events, file downloads), responses that
+    support byte ranges, already encoded bodies, small bodies and
+    non-text content types are left unchanged. A strong ETag becomes weak,
+    since the compressed bytes differ from the identity representation.
+
+    Args:
+        response: Flask response
+        accept_encodings: The request's parsed Accept-Encoding header
+
+    Returns:
+        The same response object
+    """
+    if (response.status_code < 200 or response.status_code in (204, 206, 304)
+            or response.direct_passthrough or response.is_streamed
+            or 'Content-Encoding' in response.headers or response.accept_ranges
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+
+    data = response.get_data()
+    if len(data) < Config.COMPRESSION_MIN_SIZE:
+        return response
+
+    response.vary.add('Accept-Encoding')
+    encoding = choose_encoding(accept_encodings)
+    if encoding is None:
+        return response
+
+    if encoding == 'br':
+        compressed = brotli.compress(data, quality=Config.BROTLI_QUALITY)
+    else:
+        compressed = gzip.compress(data, compresslevel=Config.GZIP_LEVEL)
+    response.set_data(compressed)
+    response.headers['Content-Encoding'] = encoding
+
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def configure_compression(app):
+    """
+    Compress eligible responses of a Flask app after each request.
+
+    Args:
+        app: Flask application instance
+    """
+    @app.after_request
+    def _compress(response):
+        if Config.COMPRESSION_ENABLED:
+            compress_response(response, request.accept_encodings)
+        return response
@@ -0,0 +1,183 @@
+"""Section-by-section assembly of the final curriculum markdown."""
+
+import re
+
+from config import Config
+from .cache import LRUCache, artifact_hash
+
+
+CODE_FENCE_PATTERN = re.compile(r'^```(?:markdown|md)?[ \t]*\n(.*?)\n```[ \t]*$', re.DOTALL)
+
+
+def _objective_text(obj) -> str:
+    return obj.get('text', obj) if isinstance(obj, dict) else obj
+
+
+def render_header(header: dict) -> str:
+    """Render the course title, credits and description."""
+    return '\n'.join([
+        f"# {header.get('title', 'Experiential Learning Course')}",
+        f"\n**Credits:** {header.get('credits', '3')}",
+        f"\n## Course Description\n{header.get('description', '')}",
+    ])
+
+
+def render_grading(grading: dict) -> str:
+    """Render the grading breakdown, or '' if there is none."""
+    if not grading:
+        return ''
+    lines = ["\n## Grading Breakdown"]
+    for key, value in grading.items():
+        label = key.replace('_', ' ').title()
+        if isinstance(value, dict):
+            lines.append(f"- **{label}**: {value.get('weight', 0)}% - {value.get('description', '')}")
+        else:
+            lines.append(f"- **{label}**: {value}")
+    return '\n'.join(lines)
+
+
+def render_objectives(objectives: dict) -> str:
+    """Render the professional-skills and project-specific objectives."""
+    lines = ["\n## Learning Objectives", "\n### Professional Skills Objectives"]
+    for obj in objectives.get('fixed_objectives', []):
+        lines.append(f"- {_objective_text(obj)}")
+
+    lines.append("\n### Project-Specific Objectives")
+    for obj in objectives.get('variable_objectives', []):
+        bloom = obj.get('bloom_level', '') if isinstance(obj, dict) else ''
+        bloom_str = f" ({bloom})" if bloom else ""
+        lines.append(f"- {_objective_text(obj)}{bloom_str}")
+    return '\n'.join(lines)
+
+
+def render_week_summary(week: dict) -> str:
+    """Render one week of the high-level schedule."""
+    week_num = week.get('week', '?')
+    lines = [f"\n### Week {week_num}: {week.get('theme', f'Week {week_num}')}"]
+    milestone = week.get('milestone', '')
+    if milestone:
+        lines.append(f"**Milestone:** {milestone}")
+    deliverables = week.get('deliverables', [])
+    if deliverables:
+        lines.append("**Deliverables:**")
+        lines.extend(f"- {d}" for d in deliverables)
+    return '\n'.join(lines)
+
+
+def render_week_detail(markdown: str) -> str:
+    """Render a generated week (Kolb cycle and DEAL reflection) in place of its summary."""
+    markdown = markdown.strip()
+    fenced = CODE_FENCE_PATTERN.match(markdown)
+    if fenced:
+        markdown = fenced.group(1).strip()
+    return f"\n{markdown}"
+
+
+def render_final_deliverable(final_deliverable: dict) -> str:
+    """Render the final deliverable, or '' if there is none."""
+    if not final_deliverable:
+        return ''
+    lines = [
+        "\n## Final Deliverable",
+        f"\n### {final_deliverable.get('title', 'Project Deliverable')}",
+        f"\n{final_deliverable.get('description', '')}",
+    ]
+    components = final_deliverable.get('components', [])
+    if components:
+        lines.append("\n**Components:**")
+        lines.extend(f"- {comp}" for comp in components)
+    return '\n'.join(lines)
+
+
+class CurriculumAssembler:
+    """
+    Builds the curriculum document from independently cached sections.
+
+    Each section is rendered from only the part of an artifact it depends
+    on and cached under the hash of that input, so re-finalizing after an
+    edit re-renders just the sections whose inputs changed. The weekly
+    schedule is cached week by week, and a week with generated detail is
+    rendered from that content instead of its outline entry.
+    """
+
+    def __init__(self, cache_size: int = None):
+        """
+        Initialize the assembler.
+
+        Args:
+            cache_size: Number of rendered sections kept in the LRU
+        """
+        self.cache = LRUCache(cache_size or Config.ASSEMBLER_CACHE_SIZE)
+
+    def section(self, kind: str, value, render) -> str:
+        """
+        Return a rendered section, rendering it only if its input is new.
+
+        Args:
+            kind: Section name, part of the cache key
+            value: JSON-compatible input the section is rendered from
+            render: Callable taking value and returning markdown
+
+        Returns:
+            Markdown for the section ('' for an empty section)
+        """
+        key = f"{kind}:{artifact_hash(value)}"
+        return self.cache.get_or_set(key, lambda: render(value))
+
+    def sections(self, outline: dict, objectives: dict, assessment: dict, week_details: dict = None) -> list:
+        """
+        Render every section of the curriculum, in document order.
+
+        Args:
+            outline: Course outline (course_header and weeks)
+            objectives: Learning objectives
+            assessment: Assessment strategy (grading_breakdown and final_deliverable)
+            week_details: Optional dict of week number -> generated week Markdown
+
+        Returns:
+            List of non-empty markdown sections
+        """
+        parts = [
+            self.section('header', outline.get('course_header', {}), render_header),
+            self.section('grading', assessment.get('grading_breakdown', {}), render_grading),
+            self.section('objectives', {
+                'fixed_objectives': objectives.get('fixed_objectives', []),
+                'variable_objectives': objectives.get('variable_objectives', []),
+            }, render_objectives),
+            "\n## Weekly Schedule",
+        ]
+        week_details = week_details or {}
+        for week in outline.get('weeks', []):
+            detail = week_details.get(week.get('week'))
+            if detail:
+                parts.append(self.section('week_detail', detail, render_week_detail))
+            else:
+                parts.append(self.section('week', week, render_week_summary))
+        parts.append(self.section('final_deliverable', assessment.get('final_deliverable', {}), render_final_deliverable))
+        return [part for part in parts if part]
+
+    def assemble(self, outline: dict, objectives: dict, assessment: dict, week_details: dict = None) -> str:
+        """
+        Build the final curriculum markdown.
+
+        Args:
+            outline: Course outline
+            objectives: Learning objectives
+            assessment: Assessment strategy
+            week_details: Optional dict of week number -> generated week Markdown
+
+        Returns:
+            Curriculum markdown document
+        """
+        return '\n'.join(self.sections(outline, objectives, assessment, week_details))
+
+
+_default_assembler = None
+
+
+def get_curriculum_assembler() -> CurriculumAssembler:
+    """Return the process-wide curriculum assembler."""
+    global _default_assembler
+    if _default_assembler is None:
+        _default_assembler = CurriculumAssembler()
+    return _default_assembler
@@ -1,8 +1,11 @@
 """File parsing utilities for extracting text from resume files."""
 
 import io
-from pypdf import PdfReader
-from docx import Document as DocxDocument
+
+from .lazy import lazy_import
+
+pypdf = lazy_import('pypdf')
+docx = lazy_import('docx')
 
 
 def extract_text_from_file(file_storage) -> str:
@@ -41,7 +44,7 @@ def extract_from_pdf(file_storage) -> str:
     try:
         # Read file into bytes buffer
         file_bytes = io.BytesIO(file_storage.read())
-        pdf_reader = PdfReader(file_bytes)
+        pdf_reader = pypdf.PdfReader(file_bytes)
 
         text_parts = []
         for page in pdf_reader.pages:
@@ -67,7 +70,7 @@ def extract_from_docx(file_storage) -> str:
     try:
         # Read file into bytes buffer
         file_bytes = io.BytesIO(file_storage.read())
-        doc = DocxDocument(file_bytes)
+        doc = docx.Document(file_bytes)
 
         text_parts = []
         for paragraph in doc.paragraphs:
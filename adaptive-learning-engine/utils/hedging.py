@@ -0,0 +1,226 @@
+"""Hedged Claude requests: duplicate a call that is slow to start responding."""
+
+import contextvars
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from config import Config
+from .budget import estimate_tokens
+
+
+class HedgePolicy:
+    """
+    Decides when to hedge and tracks whether hedging pays off.
+
+    The hedge delay is a percentile of recently observed time-to-first-byte
+    for the model. Hedges are limited to Config.HEDGE_BUDGET_RATIO of calls,
+    and suspended for a cooldown after the API reports a rate limit, so
+    hedging never adds load when the account is already throttled.
+    """
+
+    def __init__(self, window: int = 200):
+        """
+        Initialize the policy.
+
+        Args:
+            window: Time-to-first-byte samples kept per model
+        """
+        self._ttfb = {}
+        self.window = window
+        self._lock = threading.Lock()
+        self._rate_limited_until = 0.0
+        self.calls = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.skipped_budget = 0
+
+    def record_first_byte(self, model: str, seconds: float):
+        """Record how long a request took to produce its first token."""
+        with self._lock:
+            self._ttfb.setdefault(model, deque(maxlen=self.window)).append(seconds)
+
+    def delay(self, model: str) -> float:
+        """Return how long to wait for a first byte before hedging."""
+        with self._lock:
+            samples = sorted(self._ttfb.get(model, ()))
+        if len(samples) < Config.HEDGE_MIN_SAMPLES:
+            return Config.HEDGE_DEFAULT_DELAY
+        threshold = samples[min(len(samples) - 1, int(len(samples) * Config.HEDGE_PERCENTILE))]
+        return max(threshold, Config.HEDGE_MIN_DELAY)
+
+    def record_call(self):
+        with self._lock:
+            self.calls += 1
+
+    def try_acquire(self) -> bool:
+        """Reserve budget for one hedge; False when over budget or rate limited."""
+        with self._lock:
+            # Budget accrues with calls, plus one hedge of burst allowance
+            if time.time() < self._rate_limited_until or \
+                    self.hedges >= Config.HEDGE_BUDGET_RATIO * self.calls + 1:
+                self.skipped_budget += 1
+                return False
+            self.hedges += 1
+            return True
+
+    def record_result(self, hedge_won: bool):
+        """Record which request of a hedged pair finished first."""
+        if hedge_won:
+            with self._lock:
+                self.hedge_wins += 1
+
+    def note_rate_limited(self):
+        """Suspend hedging after a rate-limit response."""
+        with self._lock:
+            self._rate_limited_until = time.time() + Config.HEDGE_RATE_LIMIT_COOLDOWN
+
+    def stats(self) -> dict:
+        """Return hedge counts and the hedge win rate."""
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'hedges': self.hedges,
+                'hedge_wins': self.hedge_wins,
+                'hedge_win_rate': round(self.hedge_wins / self.hedges, 3) if self.hedges else None,
+                'hedge_rate': round(self.hedges / self.calls, 3) if self.calls else None,
+                'skipped_budget': self.skipped_budget,
+            }
+
+
+class _Attempt:
+    """One streamed request that can be cancelled from another thread."""
+
+    def __init__(self):
+        self.responded = threading.Event()
+        self.cancelled = False
+        self.stream = None
+
+    def cancel(self):
+        self.cancelled = True
+        stream = self.stream
+        if stream is not None:
+            try:
+                stream.close()
+            except Exception:
+                pass
+
+
+_executor = None
+_policy = HedgePolicy()
+_executor_lock = threading.Lock()
+
+
+def get_hedge_policy() -> HedgePolicy:
+    """Return the process-wide hedge policy."""
+    return _policy
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=Config.LLM_MAX_CONCURRENCY * 2,
+                                               thread_name_prefix='hedge')
+    return _executor
+
+
+def _stream_usage(stream, text: str) -> tuple:
+    """
+    Return (input tokens, output tokens, stop reason) of a finished or closed stream.
+
+    The final message_delta carries the output token count, so for a stream
+    closed early the output is estimated from the text received so far.
+    """
+    try:
+        snapshot = stream.current_message_snapshot
+    except AssertionError:
+        # Closed before message_start: nothing was billed
+        return 0, 0, None
+    usage = snapshot.usage
+    output_tokens = max(usage.output_tokens or 0, estimate_tokens(text))
+    return usage.input_tokens or 0, output_tokens, snapshot.stop_reason
+
+
+def hedged_create(client, model: str, max_tokens: int, messages: list, rate_limit_error=None,
+                  record_usage=None) -> tuple:
+    """
+    Stream a message, firing a duplicate request if the first byte is late.
+
+    Both requests of a hedged pair are billed, so each reports its usage to
+    record_usage, including the one that is closed when the other wins.
+
+    Args:
+        client: anthropic.Anthropic client
+        model: Model name
+        max_tokens: Maximum tokens in response
+        messages: List of message dicts for the API
+        rate_limit_error: Exception class that signals rate limiting
+        record_usage: Called with (input tokens, output tokens) for every request
+            sent, in the caller's context
+
+    Returns:
+        Tuple of (response text, stop reason, output tokens) from whichever
+        request finished first
+    """
+    policy = _policy
+    policy.record_call()
+
+    def run(attempt: _Attempt) -> tuple:
+        start = time.perf_counter()
+        parts = []
+        stream = None
+        try:
+            with client.messages.stream(model=model, max_tokens=max_tokens, messages=messages) as stream:
+                attempt.stream = stream
+                for text in stream.text_stream:
+                    if attempt.cancelled:
+                        break
+                    if not attempt.responded.is_set():
+                        policy.record_first_byte(model, time.perf_counter() - start)
+                        attempt.responded.set()
+                    parts.append(text)
+            text = ''.join(parts)
+            _, output_tokens, stop_reason = _stream_usage(stream, text)
+            return text, stop_reason, output_tokens
+        except Exception as e:
+            if rate_limit_error is not None and isinstance(e, rate_limit_error):
+                policy.note_rate_limited()
+            raise
+        finally:
+            attempt.responded.set()
+            if record_usage is not None and stream is not None:
+                input_tokens, output_tokens, _ = _stream_usage(stream, ''.join(parts))
+                if input_tokens or output_tokens:
+                    record_usage(input_tokens, output_tokens)
+
+    def submit(attempt: _Attempt):
+        # Each request charges the caller's account from its own copy of the context
+        return executor.submit(contextvars.copy_context().run, run, attempt)
+
+    executor = _get_executor()
+    primary = _Attempt()
+    primary_future = submit(primary)
+
+    if primary.responded.wait(policy.delay(model)) or not policy.try_acquire():
+        return primary_future.result()
+
+    hedge = _Attempt()
+    hedge_future = submit(hedge)
+    futures = {primary_future: primary, hedge_future: hedge}
+    pending = set(futures)
+    error = None
+
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                for other in pending:
+                    futures[other].cancel()
+                policy.record_result(hedge_won=future is hedge_future)
+                return future.result()
+            error = error or future.exception()
+
+    raise error
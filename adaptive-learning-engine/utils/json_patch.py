@@ -0,0 +1,224 @@
+"""JSON Patch (RFC 6902) edits to pipeline artifacts, with per-kind validation."""
+
+import copy
+
+
+MAX_OPERATIONS = 200
+
+
+class JsonPatchError(ValueError):
+    """Raised when a patch is malformed, does not apply, or leaves an invalid artifact."""
+
+
+def parse_pointer(pointer: str) -> list:
+    """
+    Split a JSON Pointer (RFC 6901) into unescaped reference tokens.
+
+    Args:
+        pointer: Pointer such as "/weeks/3/theme" ("" is the whole document)
+
+    Returns:
+        List of tokens
+    """
+    if pointer == '':
+        return []
+    if not isinstance(pointer, str) or not pointer.startswith('/'):
+        raise JsonPatchError(f"Invalid JSON pointer: {pointer!r}")
+    return [token.replace('~1', '/').replace('~0', '~') for token in pointer[1:].split('/')]
+
+
+def _index(container: list, token: str, allow_end: bool = False) -> int:
+    if token == '-' and allow_end:
+        return len(container)
+    if not token.isdigit() or (len(token) > 1 and token.startswith('0')):
+        raise JsonPatchError(f"Invalid array index: {token!r}")
+    index = int(token)
+    if index > len(container) or (index == len(container) and not allow_end):
+        raise JsonPatchError(f"Array index out of range: {index}")
+    return index
+
+
+def _resolve(document, tokens: list):
+    """Return the value a list of tokens points to."""
+    value = document
+    for token in tokens:
+        if isinstance(value, dict):
+            if token not in value:
+                raise JsonPatchError(f"Path not found: /{'/'.join(tokens)}")
+            value = value[token]
+        elif isinstance(value, list):
+            value = value[_index(value, token)]
+        else:
+            raise JsonPatchError(f"Path not found: /{'/'.join(tokens)}")
+    return value
+
+
+def _add(document, tokens: list, value):
+    if not tokens:
+        return value
+    parent = _resolve(document, tokens[:-1])
+    if isinstance(parent, dict):
+        parent[tokens[-1]] = value
+    elif isinstance(parent, list):
+        parent.insert(_index(parent, tokens[-1], allow_end=True), value)
+    else:
+        raise JsonPatchError(f"Cannot add to a scalar at /{'/'.join(tokens[:-1])}")
+    return document
+
+
+def _remove(document, tokens: list):
+    if not tokens:
+        raise JsonPatchError("Cannot remove the whole document")
+    parent = _resolve(document, tokens[:-1])
+    if isinstance(parent, dict):
+        if tokens[-1] not in parent:
+            raise JsonPatchError(f"Path not found: /{'/'.join(tokens)}")
+        return parent.pop(tokens[-1])
+    if isinstance(parent, list):
+        return parent.pop(_index(parent, tokens[-1]))
+    raise JsonPatchError(f"Path not found: /{'/'.join(tokens)}")
+
+
+def apply_patch(document, operations: list) -> tuple:
+    """
+    Apply JSON Patch operations to a copy of a document.
+
+    Either every operation applies or the document is left unchanged.
+
+    Args:
+        document: JSON-compatible document
+        operations: List of RFC 6902 operations (add, remove, replace, move, copy, test)
+
+    Returns:
+        Tuple of (patched document, list of changed JSON pointers)
+
+    Raises:
+        JsonPatchError: If the patch is malformed or an operation fails
+    """
+    if not isinstance(operations, list) or not operations:
+        raise JsonPatchError("Patch must be a non-empty list of operations")
+    if len(operations) > MAX_OPERATIONS:
+        raise JsonPatchError(f"Patch has more than {MAX_OPERATIONS} operations")
+
+    result = copy.deepcopy(document)
+    changed = []
+    for operation in operations:
+        if not isinstance(operation, dict) or 'op' not in operation or 'path' not in operation:
+            raise JsonPatchError(f"Malformed operation: {operation!r}")
+        op = operation['op']
+        path = operation['path']
+        tokens = parse_pointer(path)
+
+        if op in ('add', 'replace', 'test') and 'value' not in operation:
+            raise JsonPatchError(f"'{op}' operation needs a value")
+
+        if op == 'add':
+            result = _add(result, tokens, copy.deepcopy(operation['value']))
+        elif op == 'remove':
+            _remove(result, tokens)
+        elif op == 'replace':
+            _resolve(result, tokens)
+            if tokens:
+                _remove(result, tokens)
+            result = _add(result, tokens, copy.deepcopy(operation['value']))
+        elif op in ('move', 'copy'):
+            source = parse_pointer(operation.get('from', ''))
+            if op == 'move' and tokens[:len(source)] == source and tokens != source:
+                raise JsonPatchError("Cannot move a value into itself")
+            value = copy.deepcopy(_resolve(result, source))
+            if op == 'move':
+                _remove(result, source)
+                changed.append(operation['from'])
+            result = _add(result, tokens, value)
+        elif op == 'test':
+            if _resolve(result, tokens) != operation['value']:
+                raise JsonPatchError(f"Test failed at {path}")
+            continue
+        else:
+            raise JsonPatchError(f"Unknown operation: {op!r}")
+        changed.append(path)
+
+    return result, changed
+
+
+def _text_items(value) -> bool:
+    return isinstance(value, list) and all(
+        isinstance(item, str) or (isinstance(item, dict) and isinstance(item.get('text', ''), str))
+        for item in value
+    )
+
+
+def _validate_objectives(doc):
+    if not isinstance(doc, dict):
+        return "objectives must be an object"
+    for field in ('fixed_objectives', 'variable_objectives'):
+        if field in doc and not _text_items(doc[field]):
+            return f"{field} must be a list of objectives with text"
+    return None
+
+
+def _validate_assessment(doc):
+    if not isinstance(doc, dict):
+        return "assessment_strategy must be an object"
+    grading = doc.get('grading_breakdown', {})
+    if not isinstance(grading, dict):
+        return "grading_breakdown must be an object"
+    for key, entry in grading.items():
+        weight = entry.get('weight', 0) if isinstance(entry, dict) else entry
+        if isinstance(weight, str):
+            weight = weight.rstrip('%').strip()
+            try:
+                weight = float(weight)
+            except ValueError:
+                return f"grading_breakdown.{key} weight must be a number"
+        if isinstance(weight, bool) or not isinstance(weight, (int, float)) or not 0 <= weight <= 100:
+            return f"grading_breakdown.{key} weight must be between 0 and 100"
+    deliverable = doc.get('final_deliverable', {})
+    if not isinstance(deliverable, dict):
+        return "final_deliverable must be an object"
+    return None
+
+
+def _validate_outline(doc):
+    if not isinstance(doc, dict):
+        return "outline must be an object"
+    if not isinstance(doc.get('course_header', {}), dict):
+        return "course_header must be an object"
+    weeks = doc.get('weeks', [])
+    if not isinstance(weeks, list):
+        return "weeks must be a list"
+    numbers = []
+    for week in weeks:
+        if not isinstance(week, dict) or isinstance(week.get('week'), bool) or not isinstance(week.get('week'), int):
+            return "every week needs an integer 'week' number"
+        if not isinstance(week.get('theme', ''), str):
+            return f"week {week['week']} theme must be text"
+        if not isinstance(week.get('deliverables', []), list):
+            return f"week {week['week']} deliverables must be a list"
+        numbers.append(week['week'])
+    if len(set(numbers)) != len(numbers):
+        return "week numbers must be unique"
+    return None
+
+
+# Artifacts that may be edited through JSON Patch, with their validators
+VALIDATORS = {
+    'objectives': _validate_objectives,
+    'assessment_strategy': _validate_assessment,
+    'outline': _validate_outline,
+}
+
+
+def validate_artifact(name: str, document):
+    """
+    Check that an edited artifact still has the shape the pipeline expects.
+
+    Raises:
+        JsonPatchError: If the artifact kind is not editable or the document is invalid
+    """
+    validator = VALIDATORS.get(name)
+    if validator is None:
+        raise JsonPatchError(f"Artifact '{name}' cannot be edited")
+    problem = validator(document)
+    if problem:
+        raise JsonPatchError(problem)
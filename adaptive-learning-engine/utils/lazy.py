@@ -0,0 +1,36 @@
+"""Deferred imports for heavy third-party dependencies."""
+
+import importlib.util
+import sys
+
+
+def lazy_import(name: str):
+    """
+    Return a module whose code only runs on first attribute access.
+
+    Cold starts only pay for the dependencies a route actually touches:
+    importing a module that holds a lazy reference to ``anthropic`` or
+    ``docx`` costs nothing until a client or document is created.
+
+    Args:
+        name: Fully qualified module name
+
+    Returns:
+        The module (already loaded, or a lazily loading placeholder)
+
+    Raises:
+        ImportError: If the module cannot be found
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ImportError(f"No module named '{name}'", name=name)
+
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
@@ -0,0 +1,162 @@
+"""Pooled, cached markdown-to-HTML rendering for result pages."""
+
+import queue
+import re
+
+from config import Config
+from .cache import LRUCache, artifact_hash
+from .lazy import lazy_import
+
+markdown = lazy_import('markdown')
+
+
+MARKDOWN_EXTENSIONS = [
+    'markdown.extensions.tables',
+    'markdown.extensions.fenced_code',
+    'markdown.extensions.toc',
+    'markdown.extensions.nl2br'
+]
+
+SECTION_HEADING_PATTERN = re.compile(r'^#{1,3}\s')
+FENCE_PATTERN = re.compile(r'^(```|~~~)')
+HEADING_ID_PATTERN = re.compile(r'(<h[1-6][^>]*\sid=")([^"]*)(")')
+ID_COUNT_PATTERN = re.compile(r'^(.*)_([0-9]+)$')
+
+
+class MarkdownRenderer:
+    """
+    Renders markdown using a pool of reusable Markdown instances.
+
+    Building a ``markdown.Markdown`` object loads every extension, so instances
+    are kept in a pool and reset between uses. Rendered HTML is cached by
+    content hash, and documents can be rendered section by section so that
+    editing one week only re-renders that week. Heading ids are made unique
+    across sections afterwards, numbered as the toc extension numbers them
+    within one document (``reflection``, ``reflection_1``, ...).
+    """
+
+    def __init__(self, pool_size: int = None, cache_size: int = None):
+        """
+        Initialize the renderer.
+
+        Args:
+            pool_size: Maximum number of idle Markdown instances kept for reuse
+            cache_size: Number of rendered fragments kept in the LRU
+        """
+        self._pool = queue.LifoQueue(maxsize=pool_size or Config.MARKDOWN_POOL_SIZE)
+        self.cache = LRUCache(cache_size or Config.MARKDOWN_CACHE_SIZE)
+
+    def _acquire(self) -> 'markdown.Markdown':
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            return markdown.Markdown(extensions=MARKDOWN_EXTENSIONS)
+
+    def _release(self, md: 'markdown.Markdown'):
+        md.reset()
+        try:
+            self._pool.put_nowait(md)
+        except queue.Full:
+            pass
+
+    def _convert(self, md_content: str) -> str:
+        md = self._acquire()
+        try:
+            return md.convert(md_content)
+        finally:
+            self._release(md)
+
+    def render(self, md_content: str) -> str:
+        """
+        Render a markdown fragment, using the cache when possible.
+
+        Args:
+            md_content: Markdown string
+
+        Returns:
+            HTML string
+        """
+        key = artifact_hash(md_content)
+        return self.cache.get_or_set(key, lambda: self._convert(md_content))
+
+    def render_sections(self, md_content: str) -> str:
+        """
+        Render a document one heading-delimited section at a time.
+
+        Args:
+            md_content: Markdown string
+
+        Returns:
+            HTML string for the whole document
+        """
+        html = '\n'.join(self.render(section) for section in split_sections(md_content))
+        return unique_heading_ids(html)
+
+
+def _unique_id(heading_id: str, seen: set) -> str:
+    # Same numbering as markdown.extensions.toc.unique
+    while heading_id in seen or not heading_id:
+        match = ID_COUNT_PATTERN.match(heading_id)
+        if match:
+            heading_id = f"{match.group(1)}_{int(match.group(2)) + 1}"
+        else:
+            heading_id = f"{heading_id}_1"
+    seen.add(heading_id)
+    return heading_id
+
+
+def unique_heading_ids(html: str) -> str:
+    """
+    Renumber repeated heading ids in HTML joined from separately rendered sections.
+
+    Args:
+        html: HTML string
+
+    Returns:
+        HTML string in which every heading id occurs once
+    """
+    seen = set()
+    return HEADING_ID_PATTERN.sub(
+        lambda m: m.group(1) + _unique_id(m.group(2), seen) + m.group(3), html
+    )
+
+
+def split_sections(md_content: str) -> list:
+    """
+    Split markdown into sections that each start at a level 1-3 heading.
+
+    Headings inside fenced code blocks are not treated as boundaries.
+
+    Args:
+        md_content: Markdown string
+
+    Returns:
+        List of markdown strings that concatenate back to the original lines
+    """
+    sections = []
+    current = []
+    in_fence = False
+
+    for line in md_content.split('\n'):
+        if FENCE_PATTERN.match(line):
+            in_fence = not in_fence
+        elif not in_fence and SECTION_HEADING_PATTERN.match(line) and current:
+            sections.append('\n'.join(current))
+            current = []
+        current.append(line)
+
+    if current:
+        sections.append('\n'.join(current))
+
+    return sections
+
+
+_default_renderer = None
+
+
+def get_renderer() -> MarkdownRenderer:
+    """Return the process-wide markdown renderer."""
+    global _default_renderer
+    if _default_renderer is None:
+        _default_renderer = MarkdownRenderer()
+    return _default_renderer
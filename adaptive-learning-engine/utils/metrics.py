@@ -0,0 +1,102 @@
+"""In-process metrics for Claude calls, optionally persisted to the store."""
+
+import sqlite3
+import threading
+from collections import deque
+
+from .store import get_store
+
+
+def _percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class MetricsRegistry:
+    """
+    Counts and latency samples for Claude calls, grouped by stage and model.
+
+    Latencies are kept in a bounded window per (stage, model) so percentiles
+    reflect recent traffic.
+    """
+
+    def __init__(self, window: int = 500):
+        """
+        Initialize an empty registry.
+
+        Args:
+            window: Latency samples kept per stage and model
+        """
+        self.window = window
+        self._outcomes = {}
+        self._latencies = {}
+        self._counters = {}
+        self._stages = {}
+        self._lock = threading.Lock()
+
+    def record_llm_call(self, stage: str, model: str, attempt: int, outcome: str, latency_ms: float):
+        """Record one Claude call (see CurriculumStore.record_llm_call for fields)."""
+        key = (stage, model)
+        with self._lock:
+            outcomes = self._outcomes.setdefault(key, {})
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+            if attempt > 0:
+                outcomes['escalated'] = outcomes.get('escalated', 0) + 1
+            self._latencies.setdefault(key, deque(maxlen=self.window)).append(latency_ms)
+
+    def record_stage(self, stage: str, status: str, elapsed_ms: float):
+        """Record the duration of a pipeline stage, including escalations and retries."""
+        with self._lock:
+            entry = self._stages.setdefault(stage, {'statuses': {}, 'latencies': deque(maxlen=self.window)})
+            entry['statuses'][status] = entry['statuses'].get(status, 0) + 1
+            entry['latencies'].append(elapsed_ms)
+
+    def increment(self, name: str, amount: int = 1):
+        """Increment a named counter."""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def snapshot(self) -> dict:
+        """
+        Return current metrics.
+
+        Returns:
+            Dict with per stage/model call outcomes, stage durations and counters
+        """
+        with self._lock:
+            calls = []
+            for (stage, model), outcomes in sorted(self._outcomes.items()):
+                latencies = list(self._latencies[(stage, model)])
+                calls.append({
+                    'stage': stage,
+                    'model': model,
+                    'outcomes': dict(outcomes),
+                    'p50_ms': round(_percentile(latencies, 0.5), 1),
+                    'p95_ms': round(_percentile(latencies, 0.95), 1),
+                })
+            stages = [{
+                'stage': stage,
+                'statuses': dict(entry['statuses']),
+                'p50_ms': round(_percentile(list(entry['latencies']), 0.5), 1),
+                'p95_ms': round(_percentile(list(entry['latencies']), 0.95), 1),
+            } for stage, entry in sorted(self._stages.items())]
+            return {'llm_calls': calls, 'stages': stages, 'counters': dict(self._counters)}
+
+
+_registry = MetricsRegistry()
+
+
+def get_metrics() -> MetricsRegistry:
+    """Return the process-wide metrics registry."""
+    return _registry
+
+
+def record_llm_call(stage: str, model: str, attempt: int, outcome: str, latency_ms: float):
+    """Record a Claude call in memory and, when enabled, in the curriculum store."""
+    _registry.record_llm_call(stage, model, attempt, outcome, latency_ms)
+    store = get_store()
+    if store is not None:
+        try:
+            store.record_llm_call(stage, model, attempt, outcome, latency_ms)
+        except sqlite3.Error as e:
+            print(f"Failed to record LLM call: {e}")
@@ -0,0 +1,61 @@
+"""Per-stage model selection with escalation to larger models."""
+
+from config import Config
+
+
+# Smallest first; a stage escalates through every tier above its own
+TIER_ORDER = ('fast', 'large')
+
+
+def model_for_tier(tier: str) -> str:
+    """Return the model name configured for a tier."""
+    return Config.CLAUDE_FAST_MODEL if tier == 'fast' else Config.CLAUDE_MODEL
+
+
+def stage_models(stage: str) -> list:
+    """
+    Return the models to try for a stage, in escalation order.
+
+    Args:
+        stage: Pipeline stage (a key of Config.STAGE_MODEL_TIERS)
+
+    Returns:
+        List of distinct model names, starting with the stage's routed model
+    """
+    if not Config.MODEL_ROUTING_ENABLED:
+        return [Config.CLAUDE_MODEL]
+
+    tier = Config.STAGE_MODEL_TIERS.get(stage, 'large')
+    start = TIER_ORDER.index(tier) if tier in TIER_ORDER else len(TIER_ORDER) - 1
+    models = []
+    for name in TIER_ORDER[start:]:
+        model = model_for_tier(name)
+        if model not in models:
+            models.append(model)
+    return models
+
+
+def _has_any(result: dict, *fields) -> bool:
+    return isinstance(result, dict) and any(result.get(field) for field in fields)
+
+
+# Minimal checks that a stage's parsed output is usable; failing output is
+# retried on the next larger model
+QUALITY_CHECKS = {
+    'resume_extraction': lambda r: _has_any(r, 'technical_skills', 'professional_skills', 'relevant_coursework'),
+    'project_extraction': lambda r: _has_any(r, 'deliverables', 'technical_skills_required', 'project_summary'),
+    'gap_analysis': lambda r: _has_any(r, 'fit_assessment'),
+    'objectives': lambda r: _has_any(r, 'variable_objectives') and _has_any(r, 'assessment_strategy'),
+    'outline': lambda r: _has_any(r, 'weeks'),
+    'outline_plan': lambda r: _has_any(r, 'phases'),
+    'outline_chunk': lambda r: _has_any(r, 'weeks'),
+    'week_detail': lambda r: isinstance(r, str) and len(r.strip()) >= 200,
+    'week_revision': lambda r: _has_any(r, 'edits'),
+    'curriculum': lambda r: isinstance(r, str) and len(r.strip()) >= 1000,
+}
+
+
+def is_acceptable(stage: str, result) -> bool:
+    """Return whether a stage's output passes its quality check."""
+    check = QUALITY_CHECKS.get(stage)
+    return check(result) if check else True
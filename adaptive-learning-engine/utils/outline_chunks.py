@@ -0,0 +1,124 @@
+"""Splitting long course outlines into phases and merging the generated weeks."""
+
+import math
+import re
+
+
+class OutlineContinuityError(ValueError):
+    """Raised when chunked outline results do not cover every week exactly once."""
+
+
+def week_ranges(term_length: int, chunk_weeks: int) -> list:
+    """
+    Split a term into contiguous, near-equal week ranges.
+
+    Args:
+        term_length: Number of weeks in the term
+        chunk_weeks: Target weeks per range
+
+    Returns:
+        List of (first week, last week) tuples, e.g. [(1, 6), (7, 11), (12, 16)]
+    """
+    count = max(1, math.ceil(term_length / max(chunk_weeks, 1)))
+    size, extra = divmod(term_length, count)
+    ranges = []
+    start = 1
+    for i in range(count):
+        end = start + size + (1 if i < extra else 0) - 1
+        ranges.append((start, end))
+        start = end + 1
+    return ranges
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r'[^a-z0-9]+', ' ', str(text).lower()).strip()
+
+
+def _mentions(week: dict, deliverable: str) -> bool:
+    # A single character would match inside almost any deliverable
+    wanted = _normalize(deliverable)
+    if len(wanted) <= 1:
+        return False
+    names = [_normalize(d) for d in week['deliverables']]
+    return any(wanted in name or name in wanted for name in names if len(name) > 1)
+
+
+def merge_outline_chunks(plan: dict, chunks: list) -> tuple:
+    """
+    Merge per-phase weeks into one outline and check continuity.
+
+    Every week of every phase must be present exactly once. Each phase's
+    milestone is kept on its last week, and each planned deliverable must be
+    due in some week of its phase; missing ones are repaired in place.
+
+    Args:
+        plan: Phase plan with course_header and phases (start, end, milestone, deliverables)
+        chunks: Generated {"weeks": [...]} result for each phase, in plan order
+
+    Returns:
+        Tuple of (outline dict with course_header, weeks and phases, list of repairs made)
+
+    Raises:
+        OutlineContinuityError: If a phase is missing weeks or has duplicates
+    """
+    weeks = []
+    repairs = []
+    for phase, chunk in zip(plan['phases'], chunks):
+        start, end = phase['start'], phase['end']
+        phase_weeks = {}
+        for week in (chunk or {}).get('weeks', []):
+            if not isinstance(week, dict):
+                continue
+            try:
+                number = int(week.get('week'))
+            except (TypeError, ValueError):
+                continue
+            if start <= number <= end:
+                if number in phase_weeks:
+                    raise OutlineContinuityError(f"Week {number} was generated twice")
+                week['week'] = number
+                deliverables = week.get('deliverables') or []
+                if not isinstance(deliverables, list):
+                    deliverables = [str(deliverables)]
+                week['deliverables'] = deliverables
+                phase_weeks[number] = week
+        missing = [n for n in range(start, end + 1) if n not in phase_weeks]
+        if missing:
+            raise OutlineContinuityError(f"Weeks {missing} are missing from phase {start}-{end}")
+
+        ordered = [phase_weeks[n] for n in range(start, end + 1)]
+        milestone = phase.get('milestone')
+        if milestone and not ordered[-1].get('milestone'):
+            ordered[-1]['milestone'] = milestone
+            repairs.append(f"week {end}: added phase milestone")
+        for deliverable in phase.get('deliverables', []):
+            if not any(_mentions(week, deliverable) for week in ordered):
+                ordered[-1]['deliverables'].append(deliverable)
+                repairs.append(f"week {end}: added missing deliverable {deliverable!r}")
+        weeks.extend(ordered)
+
+    outline = {
+        'course_header': plan.get('course_header', {}),
+        'weeks': weeks,
+        'phases': [{k: phase.get(k) for k in ('start', 'end', 'focus', 'milestone')} for phase in plan['phases']],
+    }
+    return outline, repairs
+
+
+def validate_plan(plan: dict, ranges: list):
+    """
+    Check that a phase plan has one phase per requested week range.
+
+    Raises:
+        OutlineContinuityError: If phases are missing or their ranges differ
+    """
+    phases = plan.get('phases') if isinstance(plan, dict) else None
+    if not isinstance(phases, list) or len(phases) != len(ranges):
+        raise OutlineContinuityError("Phase plan does not match the requested week ranges")
+    for phase, (start, end) in zip(phases, ranges):
+        if not isinstance(phase, dict):
+            raise OutlineContinuityError("Malformed phase in plan")
+        # The model is told the ranges; hold it to them
+        phase['start'], phase['end'] = start, end
+        if not isinstance(phase.get('deliverables', []), list):
+            phase['deliverables'] = [str(phase['deliverables'])]
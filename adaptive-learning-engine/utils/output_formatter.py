@@ -1,35 +1,30 @@
 """Output formatting utilities for display and download."""
 
-import markdown
 import re
 import io
-from docx import Document
-from docx.shared import Inches, Pt
-from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
+
+from config import Config
+from .cache import LRUCache, artifact_hash
+from .lazy import lazy_import
+from .markdown_renderer import get_renderer
+
+docx = lazy_import('docx')
 
 
 def markdown_to_html(md_content: str) -> str:
     """
     Convert markdown content to HTML for display.
 
+    Rendering is delegated to the shared pooled renderer, which renders each
+    heading section separately and caches the result by content hash.
+
     Args:
         md_content: Markdown string
 
     Returns:
         HTML string with proper formatting
     """
-    # Configure markdown extensions for tables and code blocks
-    extensions = [
-        'markdown.extensions.tables',
-        'markdown.extensions.fenced_code',
-        'markdown.extensions.toc',
-        'markdown.extensions.nl2br'
-    ]
-
-    md = markdown.Markdown(extensions=extensions)
-    html = md.convert(md_content)
-
-    return html
+    return get_renderer().render_sections(md_content)
 
 
 def prepare_download(data: dict) -> str:
@@ -110,82 +105,131 @@ def extract_toc_from_curriculum(md_content: str) -> list:
     return toc
 
 
-def markdown_to_docx(md_content: str) -> io.BytesIO:
+# Block-level line classifier: heading, bullet item, numbered item, or paragraph
+DOCX_LINE_PATTERN = re.compile(
+    r'^(?:(?P<heading>#{1,4})\s+(?P<heading_text>.*)'
+    r'|[-*]\s+(?P<bullet>.*)'
+    r'|\d+\.\s+(?P<number>.*))$'
+)
+
+# Inline tokenizer: **bold**, *italic*, _italic_ (underscores only at word boundaries)
+INLINE_PATTERN = re.compile(
+    r'\*\*(?P<bold>.+?)\*\*'
+    r'|\*(?P<italic>[^*]+?)\*'
+    r'|(?<!\w)_(?P<underscore>[^_]+?)_(?!\w)'
+)
+
+_docx_cache = LRUCache(Config.DOCX_CACHE_SIZE)
+
+
+def tokenize_inline(text: str) -> list:
     """
-    Convert markdown content to a Word document.
+    Split text into formatted runs in a single pass.
 
     Args:
-        md_content: Markdown string
+        text: Text with inline markdown formatting
 
     Returns:
-        BytesIO buffer containing the Word document
+        List of (text, bold, italic) tuples
     """
-    doc = Document()
+    runs = []
+    pos = 0
+    for match in INLINE_PATTERN.finditer(text):
+        if match.start() > pos:
+            runs.append((text[pos:match.start()], False, False))
+        if match.group('bold') is not None:
+            runs.append((match.group('bold'), True, False))
+        else:
+            runs.append((match.group('italic') or match.group('underscore'), False, True))
+        pos = match.end()
+    if pos < len(text):
+        runs.append((text[pos:], False, False))
+    return runs
 
-    # Process markdown line by line
-    lines = md_content.split('\n')
-    current_list = None
 
-    for line in lines:
+def _add_runs(paragraph, text: str):
+    """Append formatted runs for text to a python-docx paragraph."""
+    for run_text, bold, italic in tokenize_inline(text):
+        run = paragraph.add_run(run_text)
+        if bold:
+            run.bold = True
+        if italic:
+            run.italic = True
+
+
+def build_docx(md_content: str) -> 'docx.document.Document':
+    """
+    Build a python-docx Document from markdown content.
+
+    Args:
+        md_content: Markdown string
+
+    Returns:
+        python-docx Document
+    """
+    doc = docx.Document()
+    # Resolve list styles once rather than by name on every paragraph
+    bullet_style = doc.styles['List Bullet']
+    number_style = doc.styles['List Number']
+
+    for line in md_content.split('\n'):
         line = line.rstrip()
 
         # Skip empty lines
         if not line:
-            current_list = None
             continue
 
-        # Handle headers
-        if line.startswith('# '):
-            p = doc.add_heading(line[2:], level=1)
-            current_list = None
-        elif line.startswith('## '):
-            p = doc.add_heading(line[3:], level=2)
-            current_list = None
-        elif line.startswith('### '):
-            p = doc.add_heading(line[4:], level=3)
-            current_list = None
-        # Handle list items
-        elif line.startswith('- '):
-            text = line[2:]
-            # Handle bold text in list items
-            text = process_inline_formatting(text)
-            p = doc.add_paragraph(text, style='List Bullet')
-        elif line.startswith('* '):
-            text = line[2:]
-            text = process_inline_formatting(text)
-            p = doc.add_paragraph(text, style='List Bullet')
-        elif re.match(r'^\d+\.\s', line):
-            text = re.sub(r'^\d+\.\s', '', line)
-            text = process_inline_formatting(text)
-            p = doc.add_paragraph(text, style='List Number')
-        # Handle bold lines (like **Credits:** 3)
-        elif line.startswith('**') and ':**' in line:
+        match = DOCX_LINE_PATTERN.match(line)
+        if match is None:
             p = doc.add_paragraph()
-            # Extract the bold part and the value
-            match = re.match(r'\*\*(.+?):\*\*\s*(.*)', line)
-            if match:
-                run = p.add_run(match.group(1) + ': ')
-                run.bold = True
-                p.add_run(match.group(2))
-            else:
-                p.add_run(process_inline_formatting(line))
-        # Regular paragraph
+            _add_runs(p, line)
+        elif match.group('heading'):
+            p = doc.add_heading('', level=len(match.group('heading')))
+            _add_runs(p, match.group('heading_text'))
+        elif match.group('bullet') is not None:
+            p = doc.add_paragraph(style=bullet_style)
+            _add_runs(p, match.group('bullet'))
         else:
-            text = process_inline_formatting(line)
-            p = doc.add_paragraph(text)
+            p = doc.add_paragraph(style=number_style)
+            _add_runs(p, match.group('number'))
+
+    return doc
+
+
+def markdown_to_docx_bytes(md_content: str) -> bytes:
+    """
+    Convert markdown content to Word document bytes, cached by content hash.
+
+    Args:
+        md_content: Markdown string
+
+    Returns:
+        Bytes of the .docx file
+    """
+    def render():
+        buffer = io.BytesIO()
+        build_docx(md_content).save(buffer)
+        return buffer.getvalue()
 
-    # Save to BytesIO buffer
-    buffer = io.BytesIO()
-    doc.save(buffer)
-    buffer.seek(0)
+    return _docx_cache.get_or_set(artifact_hash(md_content), render)
 
-    return buffer
+
+def markdown_to_docx(md_content: str) -> io.BytesIO:
+    """
+    Convert markdown content to a Word document.
+
+    Args:
+        md_content: Markdown string
+
+    Returns:
+        BytesIO buffer containing the Word document
+    """
+    return io.BytesIO(markdown_to_docx_bytes(md_content))
 
 
 def process_inline_formatting(text: str) -> str:
     """
     Process inline markdown formatting (bold, italic) for plain text output.
-    Note: For docx, we just strip the markers since python-docx handles runs differently.
 
     Args:
         text: Text with markdown formatting
@@ -193,9 +237,4 @@ def process_inline_formatting(text: str) -> str:
     Returns:
         Clean text without markdown markers
     """
-    # Remove bold markers
-    text = re.sub(r'\*\*(.+?)\*\*', r'\1', text)
-    # Remove italic markers
-    text = re.sub(r'\*(.+?)\*', r'\1', text)
-    text = re.sub(r'_(.+?)_', r'\1', text)
-    return text
+    return ''.join(run_text for run_text, _, _ in tokenize_inline(text))
@@ -0,0 +1,160 @@
+"""Pipeline progress events, published per browser request for SSE streaming."""
+
+import contextlib
+import contextvars
+import re
+import threading
+import time
+
+from config import Config
+from .metrics import get_metrics
+
+
+TOKEN_PATTERN = re.compile(r'^[A-Za-z0-9_-]{8,64}$')
+
+# Progress token of the request being served; copied into LLM worker threads
+current_token = contextvars.ContextVar('progress_token', default=None)
+
+
+class _Channel:
+    def __init__(self):
+        self.events = []
+        self.closed = False
+        self.updated_at = time.time()
+        self.condition = threading.Condition()
+
+
+class ProgressBroker:
+    """
+    In-process publish/subscribe of progress events keyed by a client token.
+
+    Events are kept per token until it has been idle for
+    Config.PROGRESS_TTL_SECONDS, so a subscriber that connects late (or
+    reconnects with Last-Event-ID) still receives every event.
+    """
+
+    def __init__(self):
+        self._channels = {}
+        self._lock = threading.Lock()
+
+    def _channel(self, token: str) -> _Channel:
+        with self._lock:
+            channel = self._channels.get(token)
+            if channel is None:
+                self._prune()
+                channel = self._channels[token] = _Channel()
+            return channel
+
+    def _prune(self):
+        cutoff = time.time() - Config.PROGRESS_TTL_SECONDS
+        for token in [t for t, c in self._channels.items() if c.updated_at < cutoff]:
+            del self._channels[token]
+
+    def publish(self, token: str, event: dict):
+        """Append an event to a token's channel and wake its subscribers."""
+        channel = self._channel(token)
+        with channel.condition:
+            channel.events.append({'id': len(channel.events) + 1, 'time': time.time(), **event})
+            channel.updated_at = time.time()
+            channel.condition.notify_all()
+
+    def close(self, token: str):
+        """Mark a token's channel finished; subscribers stop after draining it."""
+        channel = self._channel(token)
+        with channel.condition:
+            channel.closed = True
+            channel.updated_at = time.time()
+            channel.condition.notify_all()
+
+    def subscribe(self, token: str, last_id: int = 0, heartbeat: float = 15.0):
+        """
+        Yield a token's events as they are published.
+
+        Args:
+            token: Client progress token
+            last_id: Id of the last event the client already has
+            heartbeat: Seconds between None keep-alive yields while idle
+
+        Yields:
+            Event dicts, or None as a keep-alive
+        """
+        channel = self._channel(token)
+        start = time.time()
+        deadline = start + Config.PROGRESS_STREAM_TIMEOUT
+        while time.time() < deadline:
+            # Give up on tokens nobody publishes to (e.g. work served by another worker)
+            if not channel.events and time.time() - start > Config.PROGRESS_FIRST_EVENT_TIMEOUT:
+                return
+            with channel.condition:
+                if len(channel.events) <= last_id and not channel.closed:
+                    channel.condition.wait(min(heartbeat, Config.PROGRESS_FIRST_EVENT_TIMEOUT))
+                pending = channel.events[last_id:]
+                closed = channel.closed
+            for event in pending:
+                last_id = event['id']
+                yield event
+            if closed and not pending:
+                return
+            if not pending:
+                yield None
+
+
+_broker = ProgressBroker()
+
+
+def get_progress_broker() -> ProgressBroker:
+    """Return the process-wide progress broker."""
+    return _broker
+
+
+def valid_token(token) -> bool:
+    """Return whether a client-supplied progress token is well formed."""
+    return bool(token) and bool(TOKEN_PATTERN.match(token))
+
+
+def publish(event_type: str, **fields):
+    """Publish an event to the current request's progress channel, if any."""
+    token = current_token.get()
+    if token:
+        _broker.publish(token, {'type': event_type, **fields})
+
+
+@contextlib.contextmanager
+def progress_scope(token: str):
+    """
+    Route progress events in this context to a client token.
+
+    The channel is closed when the scope exits, ending the client's stream.
+    """
+    if not valid_token(token):
+        yield
+        return
+    reset = current_token.set(token)
+    try:
+        yield
+    finally:
+        current_token.reset(reset)
+        _broker.close(token)
+
+
+@contextlib.contextmanager
+def track_stage(stage: str, **fields):
+    """
+    Publish start and finish events for a pipeline stage and time it.
+
+    Finished stages are also recorded in the metrics registry.
+
+    Args:
+        stage: Stage name (e.g. 'gap_analysis', 'week_detail')
+        **fields: Extra event fields (e.g. week=3)
+    """
+    publish('stage_started', stage=stage, **fields)
+    start = time.perf_counter()
+    status = 'error'
+    try:
+        yield
+        status = 'ok'
+    finally:
+        elapsed_ms = round((time.perf_counter() - start) * 1000, 1)
+        get_metrics().record_stage(stage, status, elapsed_ms)
+        publish('stage_finished', stage=stage, status=status, elapsed_ms=elapsed_ms, **fields)
@@ -0,0 +1,195 @@
+"""Priority and per-tenant fair scheduling of outbound Claude requests."""
+
+import contextlib
+import contextvars
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+
+from config import Config
+
+
+INTERACTIVE = 'interactive'
+BATCH = 'batch'
+PRIORITIES = (INTERACTIVE, BATCH)
+
+# Tenant (institution) and priority class of the request being served;
+# copied into LLM worker threads along with the rest of the context
+current_tenant = contextvars.ContextVar('scheduler_tenant', default='')
+current_priority = contextvars.ContextVar('scheduler_priority', default=INTERACTIVE)
+
+
+def _percentile(values: list, fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class _Waiter:
+    __slots__ = ('granted',)
+
+    def __init__(self):
+        self.granted = False
+
+
+class FairScheduler:
+    """
+    Admission control for Claude requests sharing one API quota.
+
+    At most ``slots`` requests are in flight. Interactive requests always go
+    before batch requests, and batch requests may never hold the slots
+    reserved for interactive traffic, so a bulk job only uses spare
+    capacity. Within a priority class, tenants share capacity by weighted
+    fair queuing: each request gets a virtual finish time of
+    ``max(virtual clock, tenant's last finish) + 1 / weight`` and the
+    earliest finish time runs next.
+    """
+
+    def __init__(self, slots: int = None, reserved: int = None, weights: dict = None, window: int = 500):
+        """
+        Initialize the scheduler.
+
+        Args:
+            slots: Maximum concurrent Claude requests
+            reserved: Slots batch requests may not use
+            weights: Dict of tenant -> share weight (default 1.0)
+            window: Wait-time samples kept per priority class
+        """
+        self.slots = max(1, slots or Config.SCHEDULER_SLOTS)
+        reserved = Config.SCHEDULER_INTERACTIVE_RESERVED if reserved is None else reserved
+        self.batch_slots = max(1, self.slots - reserved)
+        self.weights = Config.TENANT_WEIGHTS if weights is None else weights
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self._queues = {priority: [] for priority in PRIORITIES}
+        self._in_flight = {priority: 0 for priority in PRIORITIES}
+        self._virtual_time = {priority: 0.0 for priority in PRIORITIES}
+        self._last_finish = {}
+        self._waits = {priority: deque(maxlen=window) for priority in PRIORITIES}
+        self._served = {}
+
+    def _weight(self, tenant: str) -> float:
+        weight = float(self.weights.get(tenant, 1.0))
+        return weight if weight > 0 else 1.0
+
+    def _can_start(self, priority: str) -> bool:
+        if sum(self._in_flight.values()) >= self.slots:
+            return False
+        if priority == BATCH:
+            return not self._queues[INTERACTIVE] and self._in_flight[BATCH] < self.batch_slots
+        return True
+
+    def _dispatch(self):
+        """Grant free slots to queued requests (caller holds the lock)."""
+        for priority in PRIORITIES:
+            queue = self._queues[priority]
+            while queue and self._can_start(priority):
+                finish, _, _, waiter = heapq.heappop(queue)
+                self._virtual_time[priority] = finish
+                self._in_flight[priority] += 1
+                waiter.granted = True
+        self._cond.notify_all()
+
+    def _prune(self):
+        """Forget tenants whose last finish time the virtual clock has passed."""
+        stale = [key for key, finish in self._last_finish.items()
+                 if finish <= self._virtual_time[key[0]]]
+        for key in stale:
+            del self._last_finish[key]
+
+    @contextlib.contextmanager
+    def slot(self, tenant: str = None, priority: str = None):
+        """
+        Hold one request slot, waiting for a turn if none is free.
+
+        Args:
+            tenant: Tenant to charge (defaults to the current request's institution)
+            priority: 'interactive' or 'batch' (defaults to the current request's class)
+        """
+        tenant = current_tenant.get() if tenant is None else tenant
+        priority = priority or current_priority.get()
+        if priority not in PRIORITIES:
+            priority = INTERACTIVE
+
+        start = time.perf_counter()
+        with self._cond:
+            key = (priority, tenant)
+            finish = max(self._virtual_time[priority], self._last_finish.get(key, 0.0)) + 1.0 / self._weight(tenant)
+            self._last_finish[key] = finish
+            waiter = _Waiter()
+            heapq.heappush(self._queues[priority], (finish, next(self._seq), tenant, waiter))
+            self._dispatch()
+            while not waiter.granted:
+                self._cond.wait()
+            self._waits[priority].append((time.perf_counter() - start) * 1000)
+            self._served[key] = self._served.get(key, 0) + 1
+
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._in_flight[priority] -= 1
+                if len(self._last_finish) > 256:
+                    self._prune()
+                self._dispatch()
+
+    def snapshot(self) -> dict:
+        """
+        Return queue depth, in-flight requests and wait times.
+
+        Returns:
+            Dict with slot limits and, per priority class, queued and in-flight
+            counts, p50/p95 wait in milliseconds and per-tenant queue/served counts
+        """
+        with self._cond:
+            classes = {}
+            for priority in PRIORITIES:
+                waits = list(self._waits[priority])
+                tenants = {}
+                for _, _, tenant, _ in self._queues[priority]:
+                    tenants.setdefault(tenant, {'queued': 0, 'served': 0})['queued'] += 1
+                for (served_priority, tenant), count in self._served.items():
+                    if served_priority == priority:
+                        tenants.setdefault(tenant, {'queued': 0, 'served': 0})['served'] = count
+                classes[priority] = {
+                    'queued': len(self._queues[priority]),
+                    'in_flight': self._in_flight[priority],
+                    'wait_p50_ms': round(_percentile(waits, 0.5), 1),
+                    'wait_p95_ms': round(_percentile(waits, 0.95), 1),
+                    'tenants': tenants,
+                }
+            return {'slots': self.slots, 'batch_slots': self.batch_slots, 'classes': classes}
+
+
+@contextlib.contextmanager
+def scheduling_scope(tenant: str = None, priority: str = None):
+    """Charge Claude requests made in this context to a tenant and priority class."""
+    tokens = []
+    if tenant is not None:
+        tokens.append((current_tenant, current_tenant.set(tenant)))
+    if priority is not None:
+        tokens.append((current_priority, current_priority.set(priority)))
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> FairScheduler:
+    """Return the process-wide scheduler, or None when scheduling is disabled."""
+    global _scheduler
+    if not Config.SCHEDULER_ENABLED:
+        return None
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = FairScheduler()
+    return _scheduler
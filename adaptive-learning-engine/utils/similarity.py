@@ -0,0 +1,348 @@
+"""Near-duplicate lookup of prior placements using hashed TF-IDF vectors."""
+
+import math
+import os
+import re
+import threading
+import zlib
+
+from config import Config
+from .cache import artifact_hash
+from .lazy import lazy_import
+
+np = lazy_import('numpy')
+
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9+#.]+')
+
+# Bumped whenever saved rows or groups change meaning; older files are rebuilt
+INDEX_VERSION = 2
+
+
+def _skill_text(items) -> str:
+    """Flatten a list of skill strings or {'skill': ...} dicts into text."""
+    names = []
+    for item in items or []:
+        if isinstance(item, dict):
+            item = item.get('skill') or item.get('deliverable') or item.get('project_need') or ''
+        names.append(str(item))
+    return ' '.join(names)
+
+
+def placement_text(confirmed_data: dict, project_extraction: dict = None) -> str:
+    """
+    Build the text that describes a placement for similarity matching.
+
+    Args:
+        confirmed_data: Confirmed learner, project, gaps and institution data
+        project_extraction: Optional raw project extraction for extra context
+
+    Returns:
+        Text combining company, role, skills and term details
+    """
+    learner = confirmed_data.get('learner', {})
+    project = confirmed_data.get('project', {})
+    gaps = confirmed_data.get('gaps', {})
+    institution = confirmed_data.get('institution', {})
+
+    parts = [
+        project.get('company_name', ''),
+        project.get('industry', ''),
+        project.get('project_title', ''),
+        project.get('confirmed_summary', ''),
+        _skill_text(project.get('confirmed_deliverables')),
+        _skill_text(project.get('confirmed_technical_skills')),
+        _skill_text(learner.get('confirmed_skills')),
+        learner.get('academic_level', ''),
+        learner.get('major_or_program', ''),
+        _skill_text(gaps.get('skill_gaps')),
+        f"term{institution.get('term_length_weeks', '')}weeks",
+    ]
+    if project_extraction:
+        parts.append(project_extraction.get('project_summary', ''))
+    return ' '.join(p for p in parts if p)
+
+
+def placement_group(confirmed_data: dict, owner: str = '') -> str:
+    """
+    Identify the owner and institution settings a placement's artifacts depend on.
+
+    Objectives and outlines are only reused between placements in the same
+    group: same owner (see the curriculum store's project owners), and same
+    institution, term length, credit hours, grading scale, fixed objectives
+    and so on. Text similarity alone cannot tell a 16-week term from a
+    10-week one.
+
+    Args:
+        confirmed_data: Confirmed learner, project, gaps and institution data
+        owner: Owner of the placement's stored project
+
+    Returns:
+        Hash of the owner and the normalized institution settings
+    """
+    institution = confirmed_data.get('institution') if isinstance(confirmed_data, dict) else None
+    normalized = {}
+    for key, value in (institution if isinstance(institution, dict) else {}).items():
+        if isinstance(value, list):
+            normalized[key] = sorted(str(v).strip().lower() for v in value)
+        else:
+            normalized[key] = str(value).strip().lower()
+    return artifact_hash({'owner': owner or '', 'institution': normalized})
+
+
+def term_counts(text: str, dimensions: int) -> dict:
+    """
+    Hash unigrams and bigrams of text into a fixed number of buckets.
+
+    Args:
+        text: Input text
+        dimensions: Number of hash buckets
+
+    Returns:
+        Dict of bucket index -> raw term count
+    """
+    tokens = TOKEN_PATTERN.findall(text.lower())
+    features = tokens + [f'{a} {b}' for a, b in zip(tokens, tokens[1:])]
+    counts = {}
+    for feature in features:
+        bucket = zlib.crc32(feature.encode('utf-8')) % dimensions
+        counts[bucket] = counts.get(bucket, 0) + 1
+    return counts
+
+
+class SimilarityIndex:
+    """
+    In-memory top-k cosine similarity index over hashed TF-IDF vectors.
+
+    Log-scaled term frequencies live in a preallocated float32 NumPy matrix.
+    IDF weights are applied when querying, so every row is scored with the
+    current document frequencies no matter when it was added. The query is
+    weighted by IDF twice instead, so scoring is a single matrix-vector
+    product that never copies the matrix; the IDF-weighted row norms are
+    cached until the next insert changes the document frequencies. Each row
+    also carries a group (see placement_group), and a query only scores rows
+    of its own group.
+    """
+
+    def __init__(self, dimensions: int = None):
+        """
+        Initialize an empty index.
+
+        Args:
+            dimensions: Number of hash buckets per vector
+        """
+        self.dimensions = dimensions or Config.SIMILARITY_DIMENSIONS
+        self._matrix = np.zeros((64, self.dimensions), dtype=np.float32)
+        self._counts = []
+        self._groups = []
+        self._doc_freq = np.zeros(self.dimensions, dtype=np.float32)
+        self.keys = []
+        self._positions = {}
+        self._group_rows = {}
+        self._row_norms = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, key):
+        return key in self._positions
+
+    def _idf(self) -> 'np.ndarray':
+        n = max(len(self.keys), 1)
+        return np.log((1 + n) / (1 + self._doc_freq)) + 1.0
+
+    def _term_frequencies(self, counts: dict) -> 'np.ndarray':
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for bucket, count in counts.items():
+            vector[bucket] = 1.0 + math.log(count)
+        return vector
+
+    def add(self, key: str, text: str, group: str = ''):
+        """
+        Add or replace the vector for a key.
+
+        Args:
+            key: Identifier returned by queries (e.g. a stored project id)
+            text: Placement text to index
+            group: Placement group (see placement_group); queries only match their own group
+        """
+        counts = term_counts(text, self.dimensions)
+        with self._lock:
+            self._insert(key, counts, group)
+
+    def _insert(self, key: str, counts: dict, group: str):
+        """Add or replace a row; the caller holds the lock."""
+        if key in self._positions:
+            position = self._positions[key]
+            for bucket in self._counts[position]:
+                self._doc_freq[bucket] -= 1
+            self._counts[position] = counts
+            if self._groups[position] != group:
+                self._group_rows.pop(self._groups[position], None)
+                self._group_rows.pop(group, None)
+            self._groups[position] = group
+        else:
+            position = len(self.keys)
+            if position == self._matrix.shape[0]:
+                grown = np.zeros((position * 2, self.dimensions), dtype=np.float32)
+                grown[:position] = self._matrix
+                self._matrix = grown
+            self.keys.append(key)
+            self._counts.append(counts)
+            self._groups.append(group)
+            self._positions[key] = position
+            self._group_rows.pop(group, None)
+
+        for bucket in counts:
+            self._doc_freq[bucket] += 1
+        self._matrix[position] = self._term_frequencies(counts)
+        # The document frequencies changed, so every row's weighted norm did
+        self._row_norms = None
+
+    def _rows_of(self, group: str) -> 'np.ndarray':
+        """Positions of a group's rows, cached until a row joins or leaves it."""
+        rows = self._group_rows.get(group)
+        if rows is None:
+            rows = np.array([i for i, g in enumerate(self._groups) if g == group], dtype=np.int64)
+            self._group_rows[group] = rows
+        return rows
+
+    def _weighted_norms(self, idf: 'np.ndarray') -> 'np.ndarray':
+        """IDF-weighted norm of every row, cached until the next insert."""
+        if self._row_norms is None:
+            n = len(self.keys)
+            matrix = self._matrix[:n]
+            self._row_norms = np.sqrt(np.einsum('ij,ij,j->i', matrix, matrix, idf * idf))
+        return self._row_norms
+
+    def query(self, text: str, k: int = 5, exclude: str = None, group: str = None) -> list:
+        """
+        Find the stored placements most similar to text.
+
+        Args:
+            text: Placement text to look up
+            k: Number of neighbors to return
+            exclude: Key to leave out of the results (e.g. the current project)
+            group: Only match placements of this group (None for any group)
+
+        Returns:
+            List of (key, cosine similarity) tuples, best first
+        """
+        query_tf = self._term_frequencies(term_counts(text, self.dimensions))
+        with self._lock:
+            n = len(self.keys)
+            if n == 0:
+                return []
+            idf = self._idf()
+            row_norms = self._weighted_norms(idf)
+            query_norm = np.linalg.norm(query_tf * idf)
+            rows = self._rows_of(group) if group is not None else np.arange(n)
+            if len(rows) == 0:
+                return []
+            # (tf * idf) . (q * idf) == tf . (q * idf^2): no weighted copy of the matrix
+            weights = idf * idf * query_tf
+            if 2 * len(rows) < n:
+                # Gathering a small group's rows is cheaper than scoring every row
+                dots = self._matrix[rows] @ weights
+            else:
+                dots = (self._matrix[:n] @ weights)[rows]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                scores = np.nan_to_num(dots / (row_norms[rows] * query_norm))
+            if exclude in self._positions:
+                scores[rows == self._positions[exclude]] = -1.0
+
+            k = min(k, len(scores))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [(self.keys[rows[i]], float(scores[i])) for i in top if scores[i] > 0]
+
+    def save(self, path: str):
+        """Persist the index to a .npz file."""
+        with self._lock:
+            buckets = [np.array(list(c.keys()), dtype=np.int32) for c in self._counts]
+            values = [np.array(list(c.values()), dtype=np.int32) for c in self._counts]
+            offsets = np.cumsum([0] + [len(b) for b in buckets])
+            np.savez_compressed(
+                path,
+                version=np.array(INDEX_VERSION),
+                keys=np.array(self.keys, dtype=str),
+                groups=np.array(self._groups, dtype=str),
+                dimensions=np.array(self.dimensions),
+                buckets=np.concatenate(buckets) if buckets else np.zeros(0, dtype=np.int32),
+                values=np.concatenate(values) if values else np.zeros(0, dtype=np.int32),
+                offsets=offsets,
+            )
+
+    @classmethod
+    def load(cls, path: str) -> 'SimilarityIndex':
+        """Load an index previously written with save()."""
+        data = np.load(path)
+        if 'version' not in data or int(data['version']) != INDEX_VERSION:
+            raise ValueError(f"{path} was saved by an older index format")
+        index = cls(dimensions=int(data['dimensions']))
+        keys = [str(k) for k in data['keys']]
+        groups = [str(g) for g in data['groups']]
+
+        offsets = data['offsets']
+        buckets, values = data['buckets'], data['values']
+        for i, (key, group) in enumerate(zip(keys, groups)):
+            counts = dict(zip(buckets[offsets[i]:offsets[i + 1]].tolist(),
+                              values[offsets[i]:offsets[i + 1]].tolist()))
+            index._insert(key, counts, group)
+        return index
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_similarity_index(store=None) -> SimilarityIndex:
+    """
+    Return the process-wide similarity index, building it on first use.
+
+    The index is loaded from Config.SIMILARITY_INDEX_PATH when present (an
+    index saved in an older format is rebuilt), and any stored
+    projects with objectives that it does not cover are added.
+
+    Args:
+        store: CurriculumStore to backfill from, if any
+
+    Returns:
+        SimilarityIndex
+    """
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                index = None
+                path = Config.SIMILARITY_INDEX_PATH
+                if path and os.path.exists(path):
+                    try:
+                        index = SimilarityIndex.load(path)
+                    except (OSError, ValueError, KeyError) as e:
+                        print(f"Similarity index load failed, rebuilding: {e}")
+                if index is None or index.dimensions != Config.SIMILARITY_DIMENSIONS:
+                    index = SimilarityIndex()
+
+                if store is not None:
+                    for project_id in store.list_projects_with('objectives'):
+                        if project_id in index:
+                            continue
+                        confirmed = store.get_artifact(project_id, 'confirmed_data')
+                        if confirmed:
+                            extraction = store.get_artifact(project_id, 'project_extraction')
+                            owner = (store.get_project(project_id) or {}).get('owner')
+                            index.add(project_id, placement_text(confirmed, extraction),
+                                      placement_group(confirmed, owner))
+                _index = index
+    return _index
+
+
+def save_similarity_index():
+    """Write the process-wide index to Config.SIMILARITY_INDEX_PATH."""
+    if _index is not None and Config.SIMILARITY_INDEX_PATH:
+        try:
+            _index.save(Config.SIMILARITY_INDEX_PATH)
+        except OSError as e:
+            print(f"Similarity index save failed: {e}")
@@ -0,0 +1,158 @@
+"""Coalescing of identical concurrent calls (single-flight)."""
+
+import contextvars
+import json
+import os
+import threading
+import time
+
+from config import Config
+
+try:
+    import fcntl
+except ImportError:  # Windows: cross-process coalescing is unavailable
+    fcntl = None
+
+
+# Set while serving an explicit regenerate: the user wants a new sample, so
+# these calls neither join nor reuse another caller's result
+fresh_calls = contextvars.ContextVar('single_flight_fresh', default=False)
+
+
+class _Call:
+    """An in-flight call that followers can wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time and shares its result.
+
+    Within a process, callers that arrive while a call for the same key is
+    running wait for it and receive its result (or its exception). When
+    ``shared_dir`` is set, processes also coordinate through a per-key lock
+    file: the first holder makes the call and writes the result next to the
+    lock, and processes that were queued on the lock while it ran read it
+    instead of calling again. A result is never reused by a caller that
+    arrives after the call finished, so a repeat request gets a new sample.
+    """
+
+    def __init__(self, shared_dir: str = None):
+        """
+        Initialize the coalescer.
+
+        Args:
+            shared_dir: Directory for cross-process lock and result files (None to disable)
+        """
+        self.shared_dir = shared_dir if fcntl else None
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._last_sweep = 0.0
+        self.calls = 0
+        self.coalesced = 0
+        if self.shared_dir:
+            os.makedirs(self.shared_dir, exist_ok=True)
+
+    def do(self, key: str, fn):
+        """
+        Return fn()'s result, sharing one execution among concurrent callers.
+
+        Args:
+            key: Identity of the call (e.g. a hash of the prompt)
+            fn: Zero-argument callable making the real call; must return JSON-serializable data
+
+        Returns:
+            The result of the single shared call
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = self._do_shared(key, fn) if self.shared_dir else self._run(fn)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def _run(self, fn):
+        self.calls += 1
+        return fn()
+
+    def _do_shared(self, key: str, fn):
+        """Coordinate with other processes through a lock file for key."""
+        lock_path = os.path.join(self.shared_dir, f'{key}.lock')
+        result_path = os.path.join(self.shared_dir, f'{key}.json')
+
+        with open(lock_path, 'a') as lock_file:
+            # Only a result written while this process waited for the lock is shared
+            queued_at = time.time()
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                shared = self._read_result(result_path, queued_at)
+                if shared is not None:
+                    self.coalesced += 1
+                    return shared['result']
+
+                result = self._run(fn)
+                tmp_path = f'{result_path}.{os.getpid()}.tmp'
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump({'result': result}, f)
+                os.replace(tmp_path, result_path)
+                self._sweep()
+                return result
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read_result(self, path: str, queued_at: float):
+        try:
+            if os.path.getmtime(path) < queued_at:
+                return None
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _sweep(self):
+        """Remove result and lock files that are long past their TTL."""
+        now = time.time()
+        if now - self._last_sweep < 60:
+            return
+        self._last_sweep = now
+        cutoff = now - 60
+        try:
+            for name in os.listdir(self.shared_dir):
+                path = os.path.join(self.shared_dir, name)
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+        except OSError:
+            pass
+
+
+_default_single_flight = None
+
+
+def get_single_flight() -> SingleFlight:
+    """Return the process-wide single-flight coalescer."""
+    global _default_single_flight
+    if _default_single_flight is None:
+        _default_single_flight = SingleFlight(shared_dir=Config.SINGLE_FLIGHT_SHARED_DIR or None)
+    return _default_single_flight
@@ -0,0 +1,242 @@
+"""Deterministic local skill matching used before LLM gap analysis."""
+
+import re
+import zlib
+
+from config import Config
+from .lazy import lazy_import
+
+np = lazy_import('numpy')
+
+
+# Canonical skill name -> common aliases and spellings
+SKILL_TAXONOMY = {
+    'python': ['py', 'python3', 'python 3', 'python programming'],
+    'javascript': ['js', 'ecmascript', 'es6', 'java script'],
+    'typescript': ['ts'],
+    'sql': ['structured query language', 'sql queries', 'sql querying'],
+    'r': ['r programming', 'r language', 'rstudio'],
+    'excel': ['microsoft excel', 'ms excel', 'spreadsheets', 'spreadsheet'],
+    'powerpoint': ['microsoft powerpoint', 'ms powerpoint', 'slide decks'],
+    'tableau': ['tableau desktop'],
+    'power bi': ['powerbi', 'microsoft power bi'],
+    'machine learning': ['ml'],
+    'artificial intelligence': ['ai'],
+    'data analysis': ['data analytics', 'analyzing data', 'data analyst'],
+    'data visualization': ['data viz', 'dataviz', 'visualization', 'data visualisation'],
+    'statistics': ['statistical analysis', 'stats'],
+    'html': ['html5'],
+    'css': ['css3'],
+    'react': ['react.js', 'reactjs'],
+    'node.js': ['node', 'nodejs'],
+    'git': ['github', 'version control', 'git/github'],
+    'user experience design': ['ux', 'ux design', 'user experience'],
+    'user interface design': ['ui', 'ui design'],
+    'search engine optimization': ['seo'],
+    'customer relationship management': ['crm', 'salesforce'],
+    'project management': ['pm', 'project planning', 'managing projects'],
+    'communication': ['communication skills', 'written communication', 'verbal communication',
+                      'professional communication'],
+    'public speaking': ['presentation skills', 'presenting', 'presentations'],
+    'teamwork': ['collaboration', 'team collaboration', 'working in teams'],
+    'leadership': ['team leadership', 'leading teams'],
+    'problem solving': ['analytical problem solving', 'troubleshooting'],
+    'critical thinking': ['analytical thinking'],
+    'time management': ['prioritization', 'managing time'],
+    'research': ['research skills', 'market research', 'user research'],
+    'social media marketing': ['social media', 'smm'],
+    'digital marketing': ['online marketing'],
+    'financial modeling': ['financial modelling', 'financial models'],
+    'agile': ['scrum', 'agile methodology', 'agile/scrum'],
+}
+
+NORMALIZE_PATTERN = re.compile(r'[^a-z0-9+#./ ]+')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+
+def _build_alias_table() -> dict:
+    table = {}
+    for canonical, aliases in SKILL_TAXONOMY.items():
+        table[canonical] = canonical
+        for alias in aliases:
+            table[alias] = canonical
+    return table
+
+
+ALIAS_TABLE = _build_alias_table()
+
+
+def normalize_skill(skill) -> str:
+    """
+    Normalize a skill to its canonical taxonomy name when known.
+
+    Args:
+        skill: Skill string or a {'skill': ...} / {'project_need': ...} dict
+
+    Returns:
+        Lower-cased canonical skill name ('' for empty input)
+    """
+    if isinstance(skill, dict):
+        skill = skill.get('skill') or skill.get('project_need') or ''
+    text = WHITESPACE_PATTERN.sub(' ', NORMALIZE_PATTERN.sub(' ', str(skill).lower())).strip()
+    if text in ALIAS_TABLE:
+        return ALIAS_TABLE[text]
+    # Tolerate simple plurals ("presentations", "databases")
+    if text.endswith('s') and text[:-1] in ALIAS_TABLE:
+        return ALIAS_TABLE[text[:-1]]
+    return text
+
+
+def _display_name(skill) -> str:
+    if isinstance(skill, dict):
+        skill = skill.get('skill') or skill.get('project_need') or ''
+    return str(skill).strip()
+
+
+def _char_ngram_matrix(names: list, dimensions: int) -> 'np.ndarray':
+    """Build L2-normalized hashed character trigram vectors, one row per name."""
+    matrix = np.zeros((len(names), dimensions), dtype=np.float32)
+    for row, name in enumerate(names):
+        padded = f'  {name} '
+        for i in range(len(padded) - 2):
+            bucket = zlib.crc32(padded[i:i + 3].encode('utf-8')) % dimensions
+            matrix[row, bucket] += 1.0
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def match_skills(learner_skills: list, project_skills: list) -> dict:
+    """
+    Match learner skills to project requirements without calling the LLM.
+
+    Exact and alias matches (after taxonomy normalization) are strong matches.
+    Remaining pairs are scored with cosine similarity of character trigram
+    vectors in one matrix product, and only near-identical spellings count
+    as strong. Trigrams cannot tell "Project Management" from "Product
+    Management", so moderately close pairs are only candidate matches: they
+    stay unresolved and are passed to the LLM as hints for it to judge.
+
+    Args:
+        learner_skills: Learner skill strings or {'skill': ...} dicts
+        project_skills: Project requirement strings or {'skill': ...} dicts
+
+    Returns:
+        Dict with strong_matches, candidate_matches and unresolved_project_skills
+        (which includes every candidate's project skill)
+    """
+    learner = [(s, normalize_skill(s)) for s in learner_skills or [] if normalize_skill(s)]
+    project = [(s, normalize_skill(s)) for s in project_skills or [] if normalize_skill(s)]
+
+    learner_by_name = {}
+    for original, name in learner:
+        learner_by_name.setdefault(name, original)
+
+    strong, candidates, unresolved = [], [], []
+    remaining = []
+    seen = set()
+
+    for original, name in project:
+        if name in seen:
+            continue
+        seen.add(name)
+        if name in learner_by_name:
+            learner_original = learner_by_name[name]
+            strong.append({
+                'learner_skill': _display_name(learner_original),
+                'project_need': _display_name(original),
+                'match_quality': 'direct'
+            })
+        else:
+            remaining.append((original, name))
+
+    if remaining and learner:
+        learner_names = list(learner_by_name)
+        dimensions = Config.SKILL_MATCH_DIMENSIONS
+        scores = _char_ngram_matrix([n for _, n in remaining], dimensions) @ \
+            _char_ngram_matrix(learner_names, dimensions).T
+        best = scores.argmax(axis=1)
+
+        for row, (original, name) in enumerate(remaining):
+            score = float(scores[row, best[row]])
+            learner_original = learner_by_name[learner_names[best[row]]]
+            if score >= Config.SKILL_MATCH_STRONG_THRESHOLD:
+                strong.append({
+                    'learner_skill': _display_name(learner_original),
+                    'project_need': _display_name(original),
+                    'match_quality': 'direct'
+                })
+            else:
+                if score >= Config.SKILL_MATCH_CANDIDATE_THRESHOLD:
+                    candidates.append({
+                        'learner_skill': _display_name(learner_original),
+                        'project_need': _display_name(original),
+                        'similarity': round(score, 2)
+                    })
+                unresolved.append(original)
+    else:
+        unresolved.extend(original for original, _ in remaining)
+
+    return {
+        'strong_matches': strong,
+        'candidate_matches': candidates,
+        'unresolved_project_skills': unresolved
+    }
+
+
+def learner_skill_list(learner_extraction: dict) -> list:
+    """Collect every skill-like entry from a learner extraction."""
+    return (list(learner_extraction.get('technical_skills') or [])
+            + list(learner_extraction.get('professional_skills') or [])
+            + list(learner_extraction.get('tools_and_platforms') or []))
+
+
+def project_skill_list(project_extraction: dict) -> list:
+    """Collect every required skill from a project extraction."""
+    return (list(project_extraction.get('technical_skills_required') or [])
+            + list(project_extraction.get('professional_skills_required') or []))
+
+
+def residual_project_extraction(project_extraction: dict, unresolved: list) -> dict:
+    """
+    Copy a project extraction keeping only skills the local pass could not resolve.
+
+    Args:
+        project_extraction: Extracted project data
+        unresolved: Project skills returned as unresolved by match_skills
+
+    Returns:
+        Project extraction with trimmed skill requirement lists
+    """
+    keep = {normalize_skill(s) for s in unresolved}
+    residual = dict(project_extraction)
+    for field in ('technical_skills_required', 'professional_skills_required'):
+        if field in residual:
+            residual[field] = [s for s in residual[field] or [] if normalize_skill(s) in keep]
+    return residual
+
+
+def merge_local_matches(gap_analysis: dict, local_matches: dict) -> dict:
+    """
+    Combine locally resolved strong matches with the LLM's analysis of the residue.
+
+    Only strong matches were resolved locally. Candidate matches were judged
+    by the LLM, so its partial matches and gaps for them are kept as given.
+
+    Args:
+        gap_analysis: Gap analysis returned by the LLM for unresolved skills
+        local_matches: Result of match_skills
+
+    Returns:
+        Gap analysis including the local strong matches
+    """
+    merged = dict(gap_analysis)
+    resolved = {normalize_skill(m['project_need']) for m in local_matches['strong_matches']}
+
+    def llm_only(items):
+        return [m for m in items or [] if normalize_skill(m.get('project_need', '')) not in resolved]
+
+    merged['strong_matches'] = local_matches['strong_matches'] + llm_only(gap_analysis.get('strong_matches'))
+    merged['partial_matches'] = llm_only(gap_analysis.get('partial_matches'))
+    merged['skill_gaps'] = llm_only(gap_analysis.get('skill_gaps'))
+    return merged
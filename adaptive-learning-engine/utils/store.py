@@ -0,0 +1,604 @@
+"""Persistent SQLite store for pipeline artifacts with indexed search."""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+from config import Config
+from .cache import artifact_hash
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    id TEXT PRIMARY KEY,
+    parent_id TEXT,
+    owner TEXT NOT NULL DEFAULT '',
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    learner_name TEXT NOT NULL DEFAULT '',
+    institution_name TEXT NOT NULL DEFAULT '',
+    project_title TEXT NOT NULL DEFAULT '',
+    company_name TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_projects_learner ON projects(learner_name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_projects_institution ON projects(institution_name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_projects_title ON projects(project_title COLLATE NOCASE);
+
+CREATE TABLE IF NOT EXISTS artifacts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    project_id TEXT NOT NULL REFERENCES projects(id),
+    kind TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    data TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_artifacts_project_kind ON artifacts(project_id, kind, id);
+CREATE INDEX IF NOT EXISTS idx_artifacts_hash ON artifacts(content_hash);
+
+CREATE TABLE IF NOT EXISTS project_skills (
+    project_id TEXT NOT NULL REFERENCES projects(id),
+    skill TEXT NOT NULL,
+    PRIMARY KEY (project_id, skill)
+);
+CREATE INDEX IF NOT EXISTS idx_project_skills_skill ON project_skills(skill);
+
+CREATE TABLE IF NOT EXISTS llm_calls (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at REAL NOT NULL,
+    stage TEXT NOT NULL,
+    model TEXT NOT NULL,
+    attempt INTEGER NOT NULL,
+    outcome TEXT NOT NULL,
+    latency_ms REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_llm_calls_stage ON llm_calls(stage, model, created_at);
+
+CREATE TABLE IF NOT EXISTS token_usage (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at REAL NOT NULL,
+    session_id TEXT NOT NULL DEFAULT '',
+    user TEXT NOT NULL DEFAULT '',
+    institution TEXT NOT NULL DEFAULT '',
+    stage TEXT NOT NULL,
+    model TEXT NOT NULL,
+    input_tokens INTEGER NOT NULL,
+    output_tokens INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_token_usage_session ON token_usage(session_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_token_usage_user ON token_usage(user, created_at);
+CREATE INDEX IF NOT EXISTS idx_token_usage_institution ON token_usage(institution, created_at);
+
+CREATE TABLE IF NOT EXISTS output_sizes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at REAL NOT NULL,
+    stage TEXT NOT NULL,
+    units REAL NOT NULL,
+    output_tokens INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_output_sizes_stage ON output_sizes(stage, id);
+
+CREATE TABLE IF NOT EXISTS week_details (
+    cache_key TEXT PRIMARY KEY,
+    week INTEGER NOT NULL,
+    markdown TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS projects_fts USING fts5(
+    project_id UNINDEXED,
+    learner_name,
+    institution_name,
+    project_title,
+    company_name,
+    skills,
+    content
+);
+"""
+
+# Artifacts that carry learner, institution and project metadata
+METADATA_KINDS = ('confirmed_data', 'raw_inputs')
+
+# Accounts token usage is tracked against (token_usage columns)
+USAGE_SCOPES = ('session_id', 'user', 'institution')
+
+# Artifact kinds whose text is worth full-text indexing
+CONTENT_KINDS = ('curriculum', 'project_extraction')
+
+
+def _skill_name(item) -> str:
+    """Return a skill name from a string or a {'skill': ...} dict."""
+    if isinstance(item, dict):
+        item = item.get('skill') or item.get('project_need') or ''
+    return str(item).strip().lower()
+
+
+def extract_skills(kind: str, data) -> set:
+    """
+    Collect normalized skill names mentioned in an artifact.
+
+    Args:
+        kind: Artifact kind (e.g. 'learner_extraction', 'confirmed_data')
+        data: Artifact data
+
+    Returns:
+        Set of lower-cased skill names
+    """
+    if not isinstance(data, dict):
+        return set()
+
+    items = []
+    if kind == 'learner_extraction':
+        items = list(data.get('technical_skills') or []) + list(data.get('professional_skills') or [])
+    elif kind == 'project_extraction':
+        items = list(data.get('technical_skills_required') or []) + list(data.get('professional_skills_required') or [])
+    elif kind == 'confirmed_data':
+        items = (list(data.get('learner', {}).get('confirmed_skills') or [])
+                 + list(data.get('project', {}).get('confirmed_technical_skills') or []))
+
+    return {name for name in (_skill_name(i) for i in items if i) if name}
+
+
+def extract_metadata(kind: str, data) -> dict:
+    """
+    Pull indexable project metadata out of an intake artifact.
+
+    Args:
+        kind: Artifact kind
+        data: Artifact data
+
+    Returns:
+        Dict of project column values found in the artifact
+    """
+    if kind not in METADATA_KINDS or not isinstance(data, dict):
+        return {}
+    learner = data.get('learner', {})
+    project = data.get('project', {})
+    institution = data.get('institution', {})
+    metadata = {
+        'learner_name': learner.get('learner_name', ''),
+        'institution_name': institution.get('institution_name', ''),
+        'project_title': project.get('project_title', ''),
+        'company_name': project.get('company_name', ''),
+    }
+    return {k: v for k, v in metadata.items() if v}
+
+
+def _fts_query(text: str) -> str:
+    """Turn free text into an FTS5 prefix query with every term quoted."""
+    terms = [t.replace('"', '""') for t in text.split() if t.strip()]
+    return ' '.join(f'"{t}"*' for t in terms)
+
+
+class CurriculumStore:
+    """
+    SQLite-backed store for every artifact the pipeline produces.
+
+    Artifacts are append-only per project, so earlier versions stay available;
+    readers get the latest version of each kind. Projects are indexed by
+    learner, institution, title and skill, with an FTS5 index for free text.
+    """
+
+    def __init__(self, path: str = None):
+        """
+        Open (and if needed create) the store.
+
+        Args:
+            path: SQLite database path (defaults to Config.STORE_PATH)
+        """
+        self.path = path or Config.STORE_PATH
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+            self._migrate(conn)
+
+    def _migrate(self, conn: sqlite3.Connection):
+        """Add columns introduced after a database was created."""
+        columns = {row['name'] for row in conn.execute('PRAGMA table_info(projects)')}
+        if 'owner' not in columns:
+            # Projects saved before ownership have no owner and are not served
+            conn.execute("ALTER TABLE projects ADD COLUMN owner TEXT NOT NULL DEFAULT ''")
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_projects_owner ON projects(owner, updated_at)')
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    # --- Writes ---
+
+    def create_project(self, parent_id: str = None, owner: str = '') -> str:
+        """
+        Create an empty project.
+
+        Args:
+            parent_id: Project this one was forked from, if any
+            owner: Session or user the project belongs to
+
+        Returns:
+            New project id
+        """
+        project_id = uuid.uuid4().hex
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT INTO projects (id, parent_id, owner, created_at, updated_at) VALUES (?, ?, ?, ?, ?)',
+                (project_id, parent_id, owner, now, now)
+            )
+            conn.execute('INSERT INTO projects_fts (project_id) VALUES (?)', (project_id,))
+        return project_id
+
+    def save_artifact(self, project_id: str, kind: str, data) -> str:
+        """
+        Append a new version of an artifact to a project.
+
+        Saving identical content as the latest version is a no-op.
+
+        Args:
+            project_id: Project to save into
+            kind: Artifact kind (e.g. 'objectives', 'outline', 'curriculum')
+            data: JSON-serializable artifact data
+
+        Returns:
+            Content hash of the artifact
+        """
+        content_hash = artifact_hash(data)
+        now = time.time()
+
+        with self._connect() as conn:
+            latest = conn.execute(
+                'SELECT content_hash FROM artifacts WHERE project_id = ? AND kind = ? ORDER BY id DESC LIMIT 1',
+                (project_id, kind)
+            ).fetchone()
+            if latest and latest['content_hash'] == content_hash:
+                return content_hash
+
+            conn.execute(
+                'INSERT INTO artifacts (project_id, kind, content_hash, data, created_at) VALUES (?, ?, ?, ?, ?)',
+                (project_id, kind, content_hash, json.dumps(data), now)
+            )
+
+            metadata = extract_metadata(kind, data)
+            assignments = ', '.join(f'{column} = ?' for column in metadata)
+            conn.execute(
+                f"UPDATE projects SET updated_at = ?{', ' + assignments if assignments else ''} WHERE id = ?",
+                (now, *metadata.values(), project_id)
+            )
+
+            skills = extract_skills(kind, data)
+            conn.executemany(
+                'INSERT OR IGNORE INTO project_skills (project_id, skill) VALUES (?, ?)',
+                [(project_id, skill) for skill in skills]
+            )
+
+            if metadata or skills or kind in CONTENT_KINDS:
+                self._reindex(conn, project_id)
+
+        return content_hash
+
+    def _reindex(self, conn: sqlite3.Connection, project_id: str):
+        """Rebuild the full-text row for a project."""
+        project = conn.execute('SELECT * FROM projects WHERE id = ?', (project_id,)).fetchone()
+        skills = [r['skill'] for r in conn.execute(
+            'SELECT skill FROM project_skills WHERE project_id = ?', (project_id,)
+        )]
+        content = []
+        for kind in CONTENT_KINDS:
+            row = conn.execute(
+                'SELECT data FROM artifacts WHERE project_id = ? AND kind = ? ORDER BY id DESC LIMIT 1',
+                (project_id, kind)
+            ).fetchone()
+            if row:
+                value = json.loads(row['data'])
+                content.append(value if isinstance(value, str) else json.dumps(value))
+
+        conn.execute('DELETE FROM projects_fts WHERE project_id = ?', (project_id,))
+        conn.execute(
+            'INSERT INTO projects_fts (project_id, learner_name, institution_name, project_title, '
+            'company_name, skills, content) VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (project_id, project['learner_name'], project['institution_name'], project['project_title'],
+             project['company_name'], ' '.join(skills), '\n'.join(content))
+        )
+
+    def fork(self, project_id: str, owner: str = None) -> str:
+        """
+        Copy the latest version of every artifact into a new project.
+
+        Args:
+            project_id: Project to fork
+            owner: Owner the project must belong to; the fork belongs to them too
+                (None skips the check and keeps the original owner)
+
+        Returns:
+            Id of the new project
+
+        Raises:
+            KeyError: If the project does not exist or belongs to someone else
+        """
+        project = self.get_project(project_id, owner=owner)
+        if project is None:
+            raise KeyError(project_id)
+        artifacts = self.get_artifacts(project_id)
+
+        new_id = self.create_project(parent_id=project_id, owner=project['owner'])
+        for kind, data in artifacts.items():
+            self.save_artifact(new_id, kind, data)
+        return new_id
+
+    def record_llm_call(self, stage: str, model: str, attempt: int, outcome: str, latency_ms: float):
+        """
+        Record one Claude call for routing analysis.
+
+        Args:
+            stage: Pipeline stage (e.g. 'gap_analysis')
+            model: Model that served the call
+            attempt: 0 for the routed model, 1+ for escalations
+            outcome: 'ok', 'parse_error', 'low_quality', 'api_error' or 'circuit_open'
+            latency_ms: Wall-clock latency of the call
+        """
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT INTO llm_calls (created_at, stage, model, attempt, outcome, latency_ms) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (time.time(), stage, model, attempt, outcome, latency_ms)
+            )
+
+    def record_token_usage(self, account: dict, stage: str, model: str, input_tokens: int, output_tokens: int):
+        """
+        Record the tokens one Claude call consumed.
+
+        Args:
+            account: Dict with session_id, user and institution the call is charged to
+            stage: Pipeline stage
+            model: Model that served the call
+            input_tokens: Prompt tokens
+            output_tokens: Response tokens
+        """
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT INTO token_usage (created_at, session_id, user, institution, stage, model, '
+                'input_tokens, output_tokens) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (time.time(), *(account.get(scope, '') for scope in USAGE_SCOPES), stage, model,
+                 input_tokens, output_tokens)
+            )
+
+    def record_output_size(self, stage: str, units: float, output_tokens: int):
+        """
+        Record how many tokens a stage's complete response took, for max_tokens sizing.
+
+        Args:
+            stage: Pipeline stage
+            units: Size of the request in the stage's units (e.g. weeks for the outline)
+            output_tokens: Response tokens, summed over continuations
+        """
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT INTO output_sizes (created_at, stage, units, output_tokens) VALUES (?, ?, ?, ?)',
+                (time.time(), stage, units, output_tokens)
+            )
+
+    def save_week_detail(self, cache_key: str, week: int, markdown: str):
+        """
+        Cache generated content for one week.
+
+        Args:
+            cache_key: Key from week_detail_key (inputs the week was generated from)
+            week: Week number
+            markdown: Generated week Markdown
+        """
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO week_details (cache_key, week, markdown, created_at) VALUES (?, ?, ?, ?)',
+                (cache_key, week, markdown, time.time())
+            )
+
+    # --- Reads ---
+
+    def get_project(self, project_id: str, owner: str = None) -> dict:
+        """
+        Return project metadata.
+
+        Args:
+            project_id: Project id
+            owner: Only return the project if it belongs to this owner (None for any owner)
+
+        Returns:
+            Project metadata dict, or None if it does not exist or belongs to someone else
+        """
+        row = self._connect().execute('SELECT * FROM projects WHERE id = ?', (project_id,)).fetchone()
+        if row is None or (owner is not None and (not owner or row['owner'] != owner)):
+            return None
+        return dict(row)
+
+    def get_artifacts(self, project_id: str, owner: str = None) -> dict:
+        """
+        Return the latest version of every artifact in a project.
+
+        Args:
+            project_id: Project id
+            owner: Only return artifacts if the project belongs to this owner (None for any owner)
+
+        Returns:
+            Dict of kind -> data, or None if the project does not exist or belongs to someone else
+        """
+        if self.get_project(project_id, owner=owner) is None:
+            return None
+        rows = self._connect().execute(
+            'SELECT kind, data FROM artifacts WHERE id IN ('
+            '  SELECT MAX(id) FROM artifacts WHERE project_id = ? GROUP BY kind'
+            ')',
+            (project_id,)
+        ).fetchall()
+        return {row['kind']: json.loads(row['data']) for row in rows}
+
+    def get_artifact(self, project_id: str, kind: str, default=None):
+        """Return the latest version of one artifact kind in a project."""
+        row = self._connect().execute(
+            'SELECT data FROM artifacts WHERE project_id = ? AND kind = ? ORDER BY id DESC LIMIT 1',
+            (project_id, kind)
+        ).fetchone()
+        return json.loads(row['data']) if row else default
+
+    def find_artifact(self, kind: str, content_hash: str, default=None):
+        """Return any stored artifact of a kind with the given content hash."""
+        row = self._connect().execute(
+            'SELECT data FROM artifacts WHERE content_hash = ? AND kind = ? LIMIT 1',
+            (content_hash, kind)
+        ).fetchone()
+        return json.loads(row['data']) if row else default
+
+    def token_usage(self, since: float = None, group_by: tuple = (), **filters) -> list:
+        """
+        Sum recorded token usage.
+
+        Args:
+            since: Only include calls recorded after this Unix timestamp
+            group_by: Columns to group by (any of session_id, user, institution, stage, model)
+            **filters: Exact matches on session_id, user or institution
+
+        Returns:
+            List of dicts with the group columns, calls, input_tokens,
+            output_tokens and the earliest call time in each group
+        """
+        columns = [c for c in group_by if c in USAGE_SCOPES + ('stage', 'model')]
+        clauses = ['created_at >= ?']
+        params = [since or 0]
+        for column, value in filters.items():
+            if column in USAGE_SCOPES and value is not None:
+                clauses.append(f'{column} = ?')
+                params.append(value)
+        select = ''.join(f'{c}, ' for c in columns)
+        group = f"GROUP BY {', '.join(columns)} ORDER BY {', '.join(columns)}" if columns else ''
+        rows = self._connect().execute(
+            f'SELECT {select}COUNT(*) AS calls, COALESCE(SUM(input_tokens), 0) AS input_tokens, '
+            f'COALESCE(SUM(output_tokens), 0) AS output_tokens, MIN(created_at) AS first_call '
+            f"FROM token_usage WHERE {' AND '.join(clauses)} {group}",
+            params
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def recent_output_sizes(self, stage: str, limit: int) -> list:
+        """Return (units, output_tokens) for a stage's most recent responses."""
+        rows = self._connect().execute(
+            'SELECT units, output_tokens FROM output_sizes WHERE stage = ? ORDER BY id DESC LIMIT ?',
+            (stage, limit)
+        ).fetchall()
+        return [(row['units'], row['output_tokens']) for row in rows]
+
+    def get_week_details(self, cache_keys: list) -> dict:
+        """Return cached week Markdown for whichever of the given keys are stored."""
+        if not cache_keys:
+            return {}
+        placeholders = ', '.join('?' for _ in cache_keys)
+        rows = self._connect().execute(
+            f'SELECT cache_key, markdown FROM week_details WHERE cache_key IN ({placeholders})',
+            list(cache_keys)
+        ).fetchall()
+        return {row['cache_key']: row['markdown'] for row in rows}
+
+    def list_projects_with(self, kind: str) -> list:
+        """Return ids of every project that has at least one artifact of a kind."""
+        rows = self._connect().execute(
+            'SELECT DISTINCT project_id FROM artifacts WHERE kind = ?', (kind,)
+        ).fetchall()
+        return [row['project_id'] for row in rows]
+
+    def search(
+        self,
+        query: str = None,
+        learner: str = None,
+        institution: str = None,
+        project: str = None,
+        skill: str = None,
+        owner: str = None,
+        limit: int = 20
+    ) -> list:
+        """
+        Find projects by free text and/or exact field filters.
+
+        Args:
+            query: Free-text query matched against names, skills and content
+            learner: Learner name (case-insensitive exact match)
+            institution: Institution name (case-insensitive exact match)
+            project: Project title (case-insensitive exact match)
+            skill: Skill name (case-insensitive exact match)
+            owner: Only return projects belonging to this owner (None for any owner)
+            limit: Maximum number of results
+
+        Returns:
+            List of project metadata dicts, most recently updated first
+        """
+        clauses = []
+        params = []
+
+        if owner is not None:
+            clauses.append("p.owner = ? AND p.owner != ''")
+            params.append(owner)
+        if query and _fts_query(query):
+            clauses.append('p.id IN (SELECT project_id FROM projects_fts WHERE projects_fts MATCH ?)')
+            params.append(_fts_query(query))
+        if learner:
+            clauses.append('p.learner_name = ? COLLATE NOCASE')
+            params.append(learner)
+        if institution:
+            clauses.append('p.institution_name = ? COLLATE NOCASE')
+            params.append(institution)
+        if project:
+            clauses.append('p.project_title = ? COLLATE NOCASE')
+            params.append(project)
+        if skill:
+            clauses.append('p.id IN (SELECT project_id FROM project_skills WHERE skill = ?)')
+            params.append(skill.strip().lower())
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        rows = self._connect().execute(
+            f'SELECT p.* FROM projects p {where} ORDER BY p.updated_at DESC LIMIT ?',
+            (*params, limit)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+
+    def llm_call_stats(self, since: float = None) -> list:
+        """
+        Summarize recorded Claude calls per stage, model and outcome.
+
+        Args:
+            since: Only include calls recorded after this Unix timestamp
+
+        Returns:
+            List of dicts with stage, model, outcome, calls, escalations and latency figures
+        """
+        rows = self._connect().execute(
+            'SELECT stage, model, outcome, COUNT(*) AS calls, SUM(attempt > 0) AS escalations, '
+            'AVG(latency_ms) AS avg_latency_ms, MAX(latency_ms) AS max_latency_ms '
+            'FROM llm_calls WHERE created_at >= ? GROUP BY stage, model, outcome '
+            'ORDER BY stage, model, outcome',
+            (since or 0,)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> CurriculumStore:
+    """Return the process-wide curriculum store, or None when disabled."""
+    global _store
+    if not Config.STORE_ENABLED:
+        return None
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = CurriculumStore()
+    return _store
@@ -0,0 +1,104 @@
+"""Jinja bytecode caching and fragment caching for rendered pages."""
+
+import os
+
+from jinja2 import FileSystemBytecodeCache, Undefined, nodes
+from jinja2.ext import Extension
+
+from config import Config
+from .cache import LRUCache, artifact_hash
+
+
+class SafeFileSystemBytecodeCache(FileSystemBytecodeCache):
+    """
+    Bytecode cache that tolerates read-only deployments.
+
+    Serverless bundles may ship a precompiled cache directory that cannot be
+    written at runtime; in that case compiled templates are simply not saved.
+    """
+
+    def dump_bytecode(self, bucket):
+        try:
+            super().dump_bytecode(bucket)
+        except OSError:
+            pass
+
+
+class FragmentCacheExtension(Extension):
+    """
+    Adds a ``{% cache key %}...{% endcache %}`` tag to templates.
+
+    The rendered body is stored in an in-process LRU keyed on the tag's
+    arguments. The first argument should name the fragment and the rest
+    should be the hashes of every artifact the fragment depends on.
+    """
+
+    tags = {'cache'}
+
+    def __init__(self, environment):
+        super().__init__(environment)
+        environment.extend(fragment_cache=LRUCache(Config.FRAGMENT_CACHE_SIZE))
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+
+        # Everything up to the block end is the cache key
+        args = [parser.parse_expression()]
+        while parser.stream.skip_if('comma'):
+            args.append(parser.parse_expression())
+
+        body = parser.parse_statements(['name:endcache'], drop_needle=True)
+        key = nodes.List(args, lineno=lineno)
+
+        return nodes.CallBlock(
+            self.call_method('_cache_support', [key]), [], [], body
+        ).set_lineno(lineno)
+
+    def _cache_support(self, key_parts, caller):
+        """Render the fragment once per distinct key."""
+        # A missing hash would make unrelated sessions share a key
+        if any(part is None or isinstance(part, Undefined) for part in key_parts):
+            return caller()
+        return self.environment.fragment_cache.get_or_set(artifact_hash(key_parts), caller)
+
+
+def configure_template_caching(app):
+    """
+    Configure bytecode and fragment caching on a Flask app.
+
+    Must be called before the app's Jinja environment is first used.
+
+    Args:
+        app: Flask application instance
+    """
+    options = dict(app.jinja_options)
+    options['extensions'] = [*options.get('extensions', []), FragmentCacheExtension]
+
+    cache_dir = Config.TEMPLATE_CACHE_DIR
+    if cache_dir:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+        except OSError:
+            pass
+        if os.path.isdir(cache_dir):
+            options['bytecode_cache'] = SafeFileSystemBytecodeCache(cache_dir)
+
+    app.jinja_options = options
+    app.add_template_filter(artifact_hash, 'artifact_hash')
+
+
+def precompile_templates(app) -> int:
+    """
+    Compile every template so the bytecode cache is warm.
+
+    Args:
+        app: Flask application instance
+
+    Returns:
+        Number of templates compiled
+    """
+    env = app.jinja_env
+    names = env.list_templates(extensions=['html'])
+    for name in names:
+        env.get_template(name)
+    return len(names)
@@ -0,0 +1,144 @@
+"""Per-stage max_tokens sizing from the expected length of the response."""
+
+import contextlib
+import contextvars
+import math
+import sqlite3
+import threading
+from collections import deque
+
+from config import Config
+from .store import get_store
+
+
+# Size of the request being generated, in its stage's units; recorded with
+# the response's output tokens to calibrate later estimates
+current_units = contextvars.ContextVar('sizing_units', default=None)
+
+
+def _percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class OutputSizer:
+    """
+    Estimates how many tokens a stage's response needs.
+
+    A stage's output grows with its size in units (weeks for the outline;
+    objectives and deliverables for objectives and assessment). Each stage
+    has a prior in Config.STAGE_OUTPUT_PRIORS of (base tokens, tokens per
+    unit). Once SIZING_MIN_SAMPLES responses have been recorded, the per-unit
+    figure becomes the SIZING_PERCENTILE of what recent responses used. The
+    estimate gets SIZING_MARGIN headroom and is kept within
+    SIZING_MIN_TOKENS..SIZING_MAX_TOKENS.
+    """
+
+    def __init__(self, store=None, window: int = 200):
+        """
+        Initialize the sizer.
+
+        Args:
+            store: CurriculumStore holding recorded sizes (None for in-memory only)
+            window: Recent responses used per stage
+        """
+        self.store = store
+        self.window = window
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def _stage_samples(self, stage: str) -> deque:
+        with self._lock:
+            samples = self._samples.get(stage)
+            if samples is None:
+                samples = self._samples[stage] = deque(maxlen=self.window)
+                if self.store is not None:
+                    try:
+                        samples.extend(reversed(self.store.recent_output_sizes(stage, self.window)))
+                    except sqlite3.Error as e:
+                        print(f"Failed to load output sizes: {e}")
+            return samples
+
+    def record(self, stage: str, units: float, output_tokens: int):
+        """Record the output tokens of a complete (not truncated) response."""
+        if stage not in Config.STAGE_OUTPUT_PRIORS or not units:
+            return
+        self._stage_samples(stage).append((units, output_tokens))
+        if self.store is not None:
+            try:
+                self.store.record_output_size(stage, units, output_tokens)
+            except sqlite3.Error as e:
+                print(f"Failed to record output size: {e}")
+
+    def estimate(self, stage: str, units: float) -> int:
+        """
+        Estimate the output tokens of a stage for a request of a given size.
+
+        Args:
+            stage: Pipeline stage (a key of Config.STAGE_OUTPUT_PRIORS)
+            units: Size of the request in the stage's units
+
+        Returns:
+            Estimated output tokens, before headroom
+        """
+        base, per_unit = Config.STAGE_OUTPUT_PRIORS[stage]
+        samples = list(self._stage_samples(stage))
+        if len(samples) >= Config.SIZING_MIN_SAMPLES:
+            per_unit = _percentile([max(tokens - base, 0) / units for units, tokens in samples],
+                                   Config.SIZING_PERCENTILE)
+        return base + per_unit * units
+
+    def max_tokens(self, stage: str, units: float, default: int) -> int:
+        """
+        Return the max_tokens to request for a stage.
+
+        Args:
+            stage: Pipeline stage
+            units: Size of the request in the stage's units
+            default: Static limit used when sizing is disabled or the stage has no prior
+
+        Returns:
+            Token limit for the call
+        """
+        if not Config.SIZING_ENABLED or stage not in Config.STAGE_OUTPUT_PRIORS or not units:
+            return default
+        sized = math.ceil(self.estimate(stage, units) * (1 + Config.SIZING_MARGIN))
+        return min(max(sized, Config.SIZING_MIN_TOKENS), Config.SIZING_MAX_TOKENS)
+
+
+def term_weeks(confirmed_data: dict) -> int:
+    """Return the placement's term length in weeks (14 if missing or invalid)."""
+    try:
+        return max(int(confirmed_data.get('institution', {}).get('term_length_weeks', 14)), 1)
+    except (TypeError, ValueError):
+        return 14
+
+
+def objectives_units(confirmed_data: dict) -> int:
+    """Size of an objectives request: fixed objectives, up to 5 variable ones, and deliverables."""
+    institution = confirmed_data.get('institution', {})
+    project = confirmed_data.get('project', {})
+    fixed = institution.get('fixed_objectives')
+    fixed_count = len(fixed) if isinstance(fixed, list) else 6
+    return fixed_count + 5 + len(project.get('confirmed_deliverables') or [])
+
+
+@contextlib.contextmanager
+def sizing(units: float):
+    """Mark the size of the request generated in this context."""
+    token = current_units.set(units)
+    try:
+        yield
+    finally:
+        current_units.reset(token)
+
+
+_sizer = None
+
+
+def get_output_sizer() -> OutputSizer:
+    """Return the process-wide output sizer."""
+    global _sizer
+    if _sizer is None:
+        _sizer = OutputSizer(get_store())
+    return _sizer
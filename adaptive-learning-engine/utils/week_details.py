@@ -0,0 +1,79 @@
+"""Persistent cache of generated week content, keyed by the inputs it was written from."""
+
+from config import Config
+from .cache import LRUCache, artifact_hash
+from .store import get_store
+
+
+def week_detail_key(confirmed_data: dict, objectives: dict, week: dict, feedback: str = None) -> str:
+    """
+    Build the cache key for one week's generated content.
+
+    The key covers the placement, the objectives, this week's outline entry
+    and any regeneration feedback. Other weeks in the outline only give
+    context to the prompt, so editing one week leaves the rest cached.
+
+    Args:
+        confirmed_data: Confirmed learner, project, gaps and institution data
+        objectives: Finalized objectives
+        week: The week's entry from the outline
+        feedback: User feedback the week was regenerated with, if any
+
+    Returns:
+        Hex digest identifying the week's inputs
+    """
+    return artifact_hash({
+        'confirmed_data': artifact_hash(confirmed_data),
+        'objectives': artifact_hash(objectives),
+        'week': week,
+        'feedback': feedback or '',
+    })
+
+
+class WeekDetailCache:
+    """
+    Generated week Markdown shared across requests.
+
+    Weeks are kept in the curriculum store so they survive restarts and are
+    shared by workers; with the store disabled, an in-process LRU is used.
+    """
+
+    def __init__(self, store=None, cache_size: int = None):
+        """
+        Initialize the cache.
+
+        Args:
+            store: CurriculumStore to persist to (None for in-memory only)
+            cache_size: Entries kept in memory when there is no store
+        """
+        self.store = store
+        self.memory = LRUCache(cache_size or Config.WEEK_DETAIL_CACHE_SIZE)
+
+    def get_many(self, keys: list) -> dict:
+        """Return cached Markdown for whichever keys are present."""
+        if self.store is not None:
+            return self.store.get_week_details(keys)
+        found = {}
+        for key in keys:
+            markdown = self.memory.get(key)
+            if markdown is not None:
+                found[key] = markdown
+        return found
+
+    def put(self, key: str, week: int, markdown: str):
+        """Cache one generated week."""
+        if self.store is not None:
+            self.store.save_week_detail(key, week, markdown)
+        else:
+            self.memory.set(key, markdown)
+
+
+_default_cache = None
+
+
+def get_week_detail_cache() -> WeekDetailCache:
+    """Return the process-wide week detail cache."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = WeekDetailCache(get_store())
+    return _default_cache
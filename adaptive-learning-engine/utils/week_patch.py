@@ -0,0 +1,113 @@
+"""Apply and validate targeted edits to generated week Markdown."""
+
+import re
+
+
+SECTION_PATTERN = re.compile(r'^####[ \t]+(.+?)[ \t]*$', re.MULTILINE)
+
+
+class PatchError(ValueError):
+    """Raised when a week patch cannot be applied or leaves the week invalid."""
+
+
+def split_sections(markdown: str) -> tuple:
+    """
+    Split week Markdown on its "####" section headings.
+
+    Args:
+        markdown: Week content as generated by generate_week_detail
+
+    Returns:
+        Tuple of (text before the first section, list of [heading, body] pairs)
+    """
+    matches = list(SECTION_PATTERN.finditer(markdown))
+    if not matches:
+        return markdown, []
+    preamble = markdown[:matches[0].start()]
+    sections = []
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(markdown)
+        sections.append([match.group(1), markdown[match.end():end]])
+    return preamble, sections
+
+
+def join_sections(preamble: str, sections: list) -> str:
+    """Reassemble Markdown produced by split_sections."""
+    return preamble + ''.join(f"#### {heading}{body}" for heading, body in sections)
+
+
+def _normalize_heading(heading: str) -> str:
+    return re.sub(r'[^a-z0-9]+', ' ', heading.lower()).strip()
+
+
+def _replace_section(preamble: str, sections: list, heading: str, content: str):
+    wanted = _normalize_heading(heading)
+    for section in sections:
+        if _normalize_heading(section[0]) == wanted:
+            # Keep the blank-line layout around the original section body
+            trailing = section[1][len(section[1].rstrip()):] or '\n\n'
+            section[1] = '\n' + content.strip() + trailing
+            return
+    raise PatchError(f"Section not found: {heading}")
+
+
+def apply_week_patch(markdown: str, patch: dict) -> str:
+    """
+    Apply a revision patch to week Markdown.
+
+    Args:
+        markdown: Current week Markdown
+        patch: Dict with an "edits" list; each edit is either
+            {"section": heading, "content": text} or {"find": text, "replace": text}
+
+    Returns:
+        Revised week Markdown
+
+    Raises:
+        PatchError: If an edit does not match the week, or the result drops
+            the week title or any of its sections
+    """
+    edits = patch.get('edits') if isinstance(patch, dict) else None
+    if not isinstance(edits, list) or not edits:
+        raise PatchError("Patch contains no edits")
+
+    revised = markdown
+    for edit in edits:
+        if not isinstance(edit, dict):
+            raise PatchError(f"Malformed edit: {edit!r}")
+        if 'section' in edit:
+            preamble, sections = split_sections(revised)
+            _replace_section(preamble, sections, str(edit['section']), str(edit.get('content', '')))
+            revised = join_sections(preamble, sections)
+        elif 'find' in edit:
+            find = str(edit['find'])
+            count = revised.count(find) if find else 0
+            if count != 1:
+                raise PatchError(f"Edit target found {count} times: {find[:60]!r}")
+            revised = revised.replace(find, str(edit.get('replace', '')))
+        else:
+            raise PatchError(f"Malformed edit: {edit!r}")
+
+    validate_week_revision(markdown, revised)
+    return revised
+
+
+def validate_week_revision(original: str, revised: str):
+    """
+    Check that a revision kept the week's title and section structure.
+
+    Raises:
+        PatchError: If the title line changed, a section was dropped, or a section is empty
+    """
+    original_preamble, original_sections = split_sections(original)
+    revised_preamble, revised_sections = split_sections(revised)
+
+    if original_preamble.strip() != revised_preamble.strip():
+        raise PatchError("Revision changed the week title")
+    original_headings = [_normalize_heading(h) for h, _ in original_sections]
+    revised_headings = [_normalize_heading(h) for h, _ in revised_sections]
+    if original_headings != revised_headings:
+        raise PatchError("Revision changed the week's sections")
+    for heading, body in revised_sections:
+        if not body.strip():
+            raise PatchError(f"Revision emptied section: {heading}")